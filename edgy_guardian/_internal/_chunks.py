@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+async def iterate(iterable: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    """
+    Iterates over a sync or an async iterable alike.
+    """
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+async def chunked(iterable: Iterable[T] | AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """
+    Yields the items of a sync or an async iterable in lists of at most `size` items,
+    holding a single chunk in memory at a time.
+    """
+    chunk: list[Any] = []
+    async for item in iterate(iterable):
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import inspect
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+_pending: ContextVar[list[Callable[[], Any]] | None] = ContextVar(
+    "edgy_guardian_after_commit", default=None
+)
+
+
+def replay_after_commit(callback: Callable[[], Any]) -> None:
+    """
+    Registers a cache invalidation to be run again once the guardian write transaction
+    of the current context is over. Outside of one, nothing is registered.
+
+    A read running while the transaction is open still sees the old rows and can put
+    them back in a cache invalidated by the write. Replaying the invalidation after
+    the commit drops them again.
+    """
+    pending = _pending.get()
+    if pending is not None:
+        pending.append(callback)
+
+
+@asynccontextmanager
+async def replaying_after_commit() -> AsyncIterator[None]:
+    """
+    Collects the invalidations registered with `replay_after_commit` and runs them
+    when the context exits. Nested contexts defer to the outermost one.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+
+    pending: list[Callable[[], Any]] = []
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        for callback in pending:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+
+def in_transaction(database: Any) -> bool:
+    """
+    Returns True if the connection of the current task to the given database is
+    inside a transaction.
+    """
+    if not database.is_connected:
+        return False
+    return bool(database.connection()._transaction_stack)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+def to_key(obj: Any) -> str:
+    """
+    Returns the id of a model instance (or a raw id) as a string, as stored by the
+    generation and changelog tables.
+    """
+    return str(getattr(obj, "id", obj))
+
+
+def from_key(model: Any, key: str | None) -> Any:
+    """
+    Converts a key back to the type of the id of `model`. Keys that cannot be
+    converted are returned as they are.
+    """
+    if key is None:
+        return None
+    try:
+        return model.meta.fields["id"].field_type(key)
+    except (TypeError, ValueError):
+        return key
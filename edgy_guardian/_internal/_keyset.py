@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+import sqlalchemy
+from edgy import QuerySet
+
+
+async def iter_keyset(queryset: QuerySet, batch_size: int) -> AsyncIterator[list[Any]]:
+    """
+    Yields the objects of `queryset` in batches of `batch_size`, ordered by primary key.
+
+    Each batch is a query starting after the primary key of the last object of the
+    previous batch, so the cost of a batch does not grow with its position as with
+    `OFFSET`, and only one batch is held in memory at a time.
+
+    Args:
+        queryset (QuerySet): The queryset, without ordering nor slicing.
+        batch_size (int): The maximum number of objects per batch.
+
+    Yields:
+        list[Any]: The batches of objects.
+    """
+    model = queryset.model_class
+    columns = [model.table.c[name] for name in model.pkcolumns]
+    queryset = queryset.order_by(*model.pknames)
+
+    last: list[Any] | None = None
+    while True:
+        page = queryset
+        if last is not None:
+            after: sqlalchemy.ColumnElement[bool]
+            if len(columns) == 1:
+                after = columns[0] > last[0]
+            else:
+                after = sqlalchemy.tuple_(*columns) > sqlalchemy.tuple_(*last)
+            # `QuerySet.filter` is annotated for binary expressions only
+            page = page.filter(cast(sqlalchemy.BinaryExpression, after))
+
+        batch = await page.limit(batch_size)
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last = [getattr(batch[-1], name) for name in model.pkcolumns]
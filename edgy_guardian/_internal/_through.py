@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+import edgy
+import sqlalchemy
+from sqlalchemy.exc import IntegrityError
+
+from edgy_guardian._internal._upsert import get_conflict_insert
+
+
+class ThroughTable(NamedTuple):
+    """
+    The table behind a many to many field and the columns pointing to both sides.
+
+    Attributes:
+        model (type[edgy.Model]): The through model.
+        table (sqlalchemy.Table): The through table.
+        source (sqlalchemy.Column): The column referencing the model owning the field.
+        target (sqlalchemy.Column): The column referencing the related model.
+    """
+
+    model: type[edgy.Model]
+    table: sqlalchemy.Table
+    source: sqlalchemy.Column
+    target: sqlalchemy.Column
+
+
+def get_through_table(model: type[edgy.Model] | edgy.Model, field_name: str) -> ThroughTable:
+    """
+    Returns the through table of the many to many field `field_name` of `model`.
+
+    Args:
+        model (type[edgy.Model] | edgy.Model): The model declaring the many to many
+            field. The models returned by `get_permission_model()` and
+            `get_groups_model()` are accepted as they are annotated.
+        field_name (str): The name of the many to many field.
+
+    Returns:
+        ThroughTable: The through model, its table and the columns of both sides.
+    """
+    field = model.meta.fields[field_name]
+    through = field.through
+    table = through.table
+    column_names = through.meta.field_to_column_names
+
+    (source,) = column_names[field.from_foreign_key]
+    (target,) = column_names[field.to_foreign_key]
+    return ThroughTable(through, table, table.c[source], table.c[target])
+
+
+async def add_pairs(
+    through: ThroughTable, pairs: Iterable[tuple[Any, Any]], chunk_size: int = 1000
+) -> list[tuple[Any, Any]]:
+    """
+    Inserts the `(source id, target id)` pairs missing from the through table.
+
+    The pairs are written in chunks, each with a single multi-row `INSERT`, all in
+    one transaction. On PostgreSQL and SQLite the insert is an `INSERT ... ON CONFLICT
+    DO NOTHING RETURNING`, so the pairs already present, or inserted concurrently, are
+    skipped instead of raising an `IntegrityError`. On the other databases, the pairs
+    already present are read first and the others are inserted in a savepoint. On an
+    `IntegrityError`, the pairs are read again once: the ones inserted concurrently are
+    skipped and the others inserted, and when none was, the error is raised.
+
+    Args:
+        through (ThroughTable): The through table.
+        pairs (Iterable[tuple[Any, Any]]): The `(source id, target id)` pairs.
+        chunk_size (int): The maximum number of pairs per query.
+
+    Returns:
+        list[tuple[Any, Any]]: The pairs that were inserted.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    database = through.model.database
+    columns = sqlalchemy.tuple_(through.source, through.target)
+    insert = get_conflict_insert(database.engine.dialect)
+    added: list[tuple[Any, Any]] = []
+
+    def values(chunk: list[tuple[Any, Any]]) -> list[dict[str, Any]]:
+        return [{through.source.key: source, through.target.key: target} for source, target in chunk]
+
+    async def read_missing(chunk: list[tuple[Any, Any]]) -> list[tuple[Any, Any]]:
+        expression = sqlalchemy.select(through.source, through.target).where(columns.in_(chunk))
+        existing = {tuple(row) for row in await database.fetch_all(expression)}
+        return [pair for pair in chunk if pair not in existing]
+
+    async with database.transaction():
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start : start + chunk_size]
+
+            if insert is not None:
+                statement = (
+                    insert(through.table)
+                    .values(values(chunk))
+                    .on_conflict_do_nothing(index_elements=[through.source, through.target])
+                    .returning(through.source, through.target)
+                )
+                added.extend(tuple(row) for row in await database.fetch_all(statement))
+                continue
+
+            missing = await read_missing(chunk)
+            if not missing:
+                continue
+
+            try:
+                async with database.transaction():
+                    await database.execute(through.table.insert().values(values(missing)))
+            except IntegrityError:
+                # Only a pair inserted concurrently is skipped, the others are inserted
+                # again once and any other error is raised
+                still_missing = await read_missing(missing)
+                if still_missing == missing:
+                    raise
+                missing = still_missing
+                if missing:
+                    await database.execute(through.table.insert().values(values(missing)))
+            added.extend(missing)
+    return added
+
+
+async def remove_pairs(
+    through: ThroughTable, sources: Iterable[Any], targets: Iterable[Any], chunk_size: int = 1000
+) -> list[tuple[Any, Any]]:
+    """
+    Deletes the rows of the through table linking any of `sources` to any of `targets`.
+
+    The targets are processed in chunks, each with a single set-based `DELETE`, all
+    in one transaction. The deleted pairs are read with `RETURNING` where the
+    database supports it, otherwise with a `SELECT` before the `DELETE`.
+
+    Args:
+        through (ThroughTable): The through table.
+        sources (Iterable[Any]): The source ids.
+        targets (Iterable[Any]): The target ids.
+        chunk_size (int): The maximum number of targets per query.
+
+    Returns:
+        list[tuple[Any, Any]]: The `(source id, target id)` pairs that were deleted.
+    """
+    sources = list(dict.fromkeys(sources))
+    targets = list(dict.fromkeys(targets))
+    database = through.model.database
+    removed: list[tuple[Any, Any]] = []
+    if not sources:
+        return removed
+
+    async with database.transaction():
+        returning = database.engine.dialect.delete_returning
+        for start in range(0, len(targets), chunk_size):
+            condition = sqlalchemy.and_(
+                through.source.in_(sources), through.target.in_(targets[start : start + chunk_size])
+            )
+            expression = through.table.delete().where(condition)
+            if returning:
+                rows = await database.fetch_all(expression.returning(through.source, through.target))
+            else:
+                rows = await database.fetch_all(
+                    sqlalchemy.select(through.source, through.target).where(condition)
+                )
+                if rows:
+                    await database.execute(expression)
+            removed.extend(tuple(row) for row in rows)
+    return removed
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Any, cast
+
+import edgy
+import sqlalchemy
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+# The insert constructs supporting `on_conflict_do_nothing`
+Insert = postgresql.Insert | sqlite.Insert
+
+# The dialects with a native `INSERT ... ON CONFLICT DO NOTHING`
+_CONFLICT_INSERTS: dict[str, Callable[[sqlalchemy.Table], Insert]] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def get_conflict_insert(
+    dialect: sqlalchemy.Dialect,
+) -> Callable[[sqlalchemy.Table], Insert] | None:
+    """
+    Returns the `insert` construct of the dialect when it supports both
+    `ON CONFLICT DO NOTHING` and `RETURNING`, otherwise None.
+    """
+    if not dialect.insert_returning:
+        return None
+    return _CONFLICT_INSERTS.get(dialect.name)
+
+
+async def get_or_insert(
+    model: type[edgy.Model], values: Sequence[dict[str, Any]], unique_fields: Sequence[str]
+) -> list[edgy.Model]:
+    """
+    Returns the instances of `model` matching the values on `unique_fields`, inserting
+    the rows that do not exist.
+
+    On PostgreSQL and SQLite the rows are written with a single
+    `INSERT ... ON CONFLICT DO NOTHING RETURNING`, so a row created concurrently is
+    skipped instead of raising an `IntegrityError`, and only the rows that already
+    existed are read with a second query. On the other databases, the existing rows
+    are read first and the missing ones inserted one by one in savepoints, a conflict
+    with a concurrent insert being skipped and the row read back.
+
+    Raises:
+        IntegrityError: If a row can neither be inserted nor read back.
+
+    Args:
+        model (type[edgy.Model]): The model, with a unique constraint on `unique_fields`.
+        values (Sequence[dict[str, Any]]): The field values of the rows.
+        unique_fields (Sequence[str]): The fields of the unique constraint.
+
+    Returns:
+        list[edgy.Model]: One instance per distinct row, in no particular order.
+    """
+    unique_columns = [
+        column for name in unique_fields for column in model.meta.field_to_column_names[name]
+    ]
+    rows = []
+    for value in values:
+        instance = model(**value)
+        rows.append(
+            instance.extract_column_values(instance.extract_db_fields(), phase="prepare_insert")
+        )
+
+    database = model.database
+    table = cast(sqlalchemy.Table, model.table)
+    columns_to_field = model.meta.columns_to_field
+    unique = sqlalchemy.tuple_(*(table.c[name] for name in unique_columns))
+
+    pending = {tuple(row[name] for name in unique_columns): row for row in rows}
+    instances: list[edgy.Model] = []
+
+    def collect(found: Sequence[Any]) -> None:
+        for row in found:
+            mapping = row._mapping
+            pending.pop(tuple(mapping[name] for name in unique_columns), None)
+            instances.append(
+                model(**{columns_to_field.get(name, name): value for name, value in mapping.items()})
+            )
+
+    async def read_pending() -> None:
+        if pending:
+            expression = sqlalchemy.select(*table.c).where(unique.in_(list(pending)))
+            collect(await database.fetch_all(expression))
+
+    insert = get_conflict_insert(database.engine.dialect)
+    if insert is not None:
+        # A multi-row `VALUES` needs the same columns in every row
+        batches: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for row in pending.values():
+            batches.setdefault(frozenset(row), []).append(row)
+        for batch in batches.values():
+            expression = (
+                insert(table)
+                .values(batch)
+                .on_conflict_do_nothing(index_elements=unique_columns)
+                .returning(*table.c)
+            )
+            collect(await database.fetch_all(expression))
+        await read_pending()
+        return instances
+
+    await read_pending()
+    errors: dict[tuple[Any, ...], IntegrityError] = {}
+    for key, row in list(pending.items()):
+        try:
+            async with database.transaction():
+                await database.execute(table.insert().values(row))
+        except IntegrityError as e:
+            # Inserted concurrently, read back below
+            errors[key] = e
+    await read_pending()
+    for key, error in errors.items():
+        if key in pending:
+            # Not a conflict with a concurrent insert
+            raise error
+    return instances
@@ -0,0 +1,67 @@
+from edgy_guardian.cache.changelog import (
+    Change,
+    ChangelogFollower,
+    ChangeRecorder,
+    apply_changes,
+    apply_changes_to_snapshot,
+    compact_changes,
+    get_changelog_follower,
+    get_changes_since,
+    get_last_sequence,
+    is_changelog_enabled,
+)
+from edgy_guardian.cache.coherence import (
+    GenerationTracker,
+    bump_generation,
+    get_generation_tracker,
+    is_generation_tracking_enabled,
+    sync_caches,
+    write_transaction,
+)
+from edgy_guardian.cache.decisions import (
+    DecisionCache,
+    get_decision_cache,
+    is_decision_cache_enabled,
+    make_decision_key,
+    normalize_codename,
+)
+from edgy_guardian.cache.groups import GroupCache, get_group_cache, is_group_cache_enabled
+from edgy_guardian.cache.signals import SignalInvalidator, get_signal_invalidator, mute_signals
+from edgy_guardian.cache.singleflight import (
+    SingleFlight,
+    get_single_flight,
+    is_single_flight_enabled,
+)
+
+__all__ = [
+    "Change",
+    "ChangeRecorder",
+    "ChangelogFollower",
+    "DecisionCache",
+    "GenerationTracker",
+    "GroupCache",
+    "SignalInvalidator",
+    "SingleFlight",
+    "apply_changes",
+    "apply_changes_to_snapshot",
+    "bump_generation",
+    "compact_changes",
+    "get_changelog_follower",
+    "get_changes_since",
+    "get_decision_cache",
+    "get_generation_tracker",
+    "get_group_cache",
+    "get_last_sequence",
+    "get_signal_invalidator",
+    "get_single_flight",
+    "is_changelog_enabled",
+    "is_decision_cache_enabled",
+    "is_generation_tracking_enabled",
+    "is_group_cache_enabled",
+    "is_single_flight_enabled",
+    "make_decision_key",
+    "mute_signals",
+    "normalize_codename",
+    "sync_caches",
+    "write_transaction",
+]
@@ -0,0 +1,12 @@
+from edgy_guardian.cache.backends.base import BaseCacheBackend, CacheBackend
+from edgy_guardian.cache.backends.memory import MemoryCacheBackend
+from edgy_guardian.cache.backends.redis import RedisCacheBackend
+from edgy_guardian.cache.backends.shared import SharedMemoryCacheBackend
+
+__all__ = [
+    "BaseCacheBackend",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "SharedMemoryCacheBackend",
+]
@@ -0,0 +1,113 @@
+from collections.abc import Iterable, Mapping
+from typing import Any, ClassVar, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """
+    The storage used by the guardian caches.
+
+    The keys are strings and the values anything the backend is able to store.
+    Every key is namespaced by the version of the backend, bumping the version
+    invalidates every entry at once, for all the processes sharing the backend.
+    """
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Returns the values of the given keys. Missing or expired keys are not included.
+        """
+        ...
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: float | None = None) -> None:
+        """
+        Stores the given values, expiring after `ttl` seconds when given.
+        """
+        ...
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Removes the given keys.
+        """
+        ...
+
+    async def clear(self) -> None:
+        """
+        Removes every key.
+        """
+        ...
+
+    async def get_version(self) -> int:
+        """
+        Returns the current version of the keys.
+        """
+        ...
+
+    async def incr_version(self) -> int:
+        """
+        Bumps the version of the keys and returns the new one.
+        """
+        ...
+
+
+class BaseCacheBackend:
+    """
+    The common helpers of the cache backends shipped with Edgy Guardian.
+
+    Attributes:
+        can_list_keys (bool): Whether `keys()` is cheap enough to be used to find
+            the keys to invalidate.
+    """
+
+    can_list_keys: ClassVar[bool] = False
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Returns the value of a single key, None if missing.
+        """
+        return (await self.get_many([key])).get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """
+        Stores the value of a single key.
+        """
+        await self.set_many({key: value}, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        """
+        Removes a single key.
+        """
+        await self.delete_many([key])
+
+    async def keys(self) -> list[str]:
+        """
+        Returns every live key of the current version.
+
+        Raises:
+            NotImplementedError: If the backend cannot list its keys.
+        """
+        raise NotImplementedError(f"'{type(self).__name__}' cannot list its keys.")
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        raise NotImplementedError()
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: float | None = None) -> None:
+        raise NotImplementedError()
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        raise NotImplementedError()
+
+    async def clear(self) -> None:
+        raise NotImplementedError()
+
+    async def get_version(self) -> int:
+        raise NotImplementedError()
+
+    async def incr_version(self) -> int:
+        raise NotImplementedError()
+
+    @staticmethod
+    def make_key(key: str, version: int) -> str:
+        """
+        Namespaces a key with a version.
+        """
+        return f"{version}:{key}"
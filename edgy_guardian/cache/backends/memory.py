@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from edgy_guardian.cache.backends.base import BaseCacheBackend
+
+
+class MemoryCacheBackend(BaseCacheBackend):
+    """
+    An in-process cache backend bounded by size, evicting the least recently used
+    keys first.
+
+    Args:
+        maxsize (int): The maximum number of keys kept in memory.
+        timer (Callable[[], float]): The clock used to compute the expiration.
+    """
+
+    can_list_keys = True
+
+    def __init__(self, maxsize: int = 10_000, timer: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.timer = timer
+        self.version = 1
+        self._data: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        values: dict[str, Any] = {}
+        now = self.timer()
+
+        for key in keys:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                continue
+
+            if expires is not None and expires <= now:
+                del self._data[key]
+                continue
+
+            self._data.move_to_end(key)
+            values[key] = value
+        return values
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        expires = None if ttl is None else self.timer() + ttl
+        for key, value in mapping.items():
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    async def keys(self) -> list[str]:
+        return list(self._data)
+
+    async def get_version(self) -> int:
+        return self.version
+
+    async def incr_version(self) -> int:
+        # Nothing else can read the previous version, the keys can go right away
+        self._data.clear()
+        self.version += 1
+        return self.version
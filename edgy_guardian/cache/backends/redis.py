@@ -0,0 +1,225 @@
+import asyncio
+import contextlib
+import json
+from collections.abc import Iterable, Mapping
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from edgy_guardian.cache.backends.base import BaseCacheBackend
+from edgy_guardian.exceptions import CacheBackendError
+
+
+class RedisCacheBackend(BaseCacheBackend):
+    """
+    A cache backend talking the Redis protocol (RESP) to any compatible server.
+
+    The adapter only relies on `GET`, `MGET`, `SET`, `DEL` and `INCR`, and pipelines
+    the commands of a batch in a single round trip. The version lives on the server,
+    so bumping it invalidates the keys of every process at once.
+
+    The values must be JSON serializable.
+
+    Args:
+        url (str): The server URL, `redis://[:password@]host[:port][/db]`.
+        prefix (str): The prefix of every key written by the backend.
+        timeout (float): The number of seconds to wait for the server.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "edgy-guardian",
+        timeout: float = 5.0,
+    ) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self.version: int | None = None
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.prefix}:version"
+
+    def make_key(self, key: str, version: int) -> str:
+        return f"{self.prefix}:{version}:{key}"
+
+    @staticmethod
+    def _encode(*args: Any) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            value = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        assert self._reader is not None
+
+        line = await self._reader.readline()
+        if not line:
+            raise CacheBackendError("The connection was closed by the server.")
+
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return CacheBackendError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise CacheBackendError(f"Unexpected reply from the server: {line!r}.")
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+
+        commands: list[tuple[Any, ...]] = []
+        if self.password:
+            commands.append(("AUTH", self.password))
+        if self.db:
+            commands.append(("SELECT", self.db))
+        try:
+            if commands:
+                await self._send(commands)
+        except BaseException:
+            # Never reuse a connection on the wrong database or not authenticated
+            await self.close()
+            raise
+
+    async def _send(self, commands: list[tuple[Any, ...]]) -> list[Any]:
+        assert self._writer is not None
+
+        self._writer.write(b"".join(self._encode(*command) for command in commands))
+        await self._writer.drain()
+        replies = [
+            await asyncio.wait_for(self._read_reply(), self.timeout) for _ in commands
+        ]
+        for reply in replies:
+            if isinstance(reply, CacheBackendError):
+                raise reply
+        return replies
+
+    async def execute(self, *commands: tuple[Any, ...]) -> list[Any]:
+        """
+        Sends the given commands in a single round trip and returns their replies.
+
+        Args:
+            *commands (tuple[Any, ...]): The commands, for instance `("GET", "key")`.
+
+        Returns:
+            list[Any]: The replies, in order.
+
+        Raises:
+            CacheBackendError: If the server replies with an error or is unreachable.
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            # Connections and locks are bound to the event loop that created them. Both
+            # are replaced before any await, so concurrent first calls share the lock.
+            self._lock, self._loop = asyncio.Lock(), loop
+            writer, self._reader, self._writer = self._writer, None, None
+            if writer is not None:
+                with contextlib.suppress(RuntimeError):
+                    writer.close()
+
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(list(commands))
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                raise CacheBackendError(str(e)) from e
+
+    async def close(self) -> None:
+        """
+        Closes the connection to the server.
+        """
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, RuntimeError):  # pragma: no cover
+                pass
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        version = self.version or 1
+        reply, values = await self.execute(
+            ("GET", self.version_key), ("MGET", *(self.make_key(key, version) for key in keys))
+        )
+
+        current = int(reply) if reply is not None else 1
+        if current != version:
+            # Another process bumped the version, nothing of the old one is valid
+            self.version = current
+            (values,) = await self.execute(
+                ("MGET", *(self.make_key(key, current) for key in keys))
+            )
+        else:
+            self.version = version
+
+        return {key: json.loads(value) for key, value in zip(keys, values, strict=True) if value is not None}
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: float | None = None) -> None:
+        if not mapping:
+            return
+
+        version = await self.get_version()
+        commands = []
+        for key, value in mapping.items():
+            command: tuple[Any, ...] = (
+                "SET",
+                self.make_key(key, version),
+                json.dumps(value, separators=(",", ":")),
+            )
+            if ttl is not None:
+                command += ("PX", max(int(ttl * 1000), 1))
+            commands.append(command)
+        await self.execute(*commands)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+
+        version = await self.get_version()
+        await self.execute(("DEL", *(self.make_key(key, version) for key in keys)))
+
+    async def clear(self) -> None:
+        await self.incr_version()
+
+    async def get_version(self) -> int:
+        (reply,) = await self.execute(("GET", self.version_key))
+        self.version = int(reply) if reply is not None else 1
+        return self.version
+
+    async def incr_version(self) -> int:
+        (reply,) = await self.execute(("INCR", self.version_key))
+        # A missing version is read as 1, the first bump has to skip it
+        if reply == 1:
+            (reply,) = await self.execute(("INCR", self.version_key))
+        self.version = int(reply)
+        return self.version
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from edgy_guardian.cache.backends.base import BaseCacheBackend
+from edgy_guardian.exceptions import GuardianImproperlyConfigured
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+MAGIC = b"EGCACHE1"
+
+# magic, version, number of slots, size of a slot
+HEADER = struct.Struct("<8sQQQ")
+
+# state, key hash, expiration (0 for never), key length, value length
+SLOT = struct.Struct("<B7xQdHH4x")
+
+EMPTY, USED, DELETED = 0, 1, 2
+
+
+def _hash(key: bytes) -> int:
+    """
+    A hash that is stable across processes, unlike `hash()`.
+    """
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class SharedMemoryCacheBackend(BaseCacheBackend):
+    """
+    A cache backend shared by all the processes of the same host.
+
+    The entries live in a fixed size hash table inside a memory mapped file, which
+    every worker maps. The accesses are serialized with a file lock, the values
+    must be JSON serializable and fit, together with their key, in a slot. Values
+    that do not fit are not cached.
+
+    When the probing window of a key is full, the first slot of the window is
+    overwritten.
+
+    The file lock is taken on the event loop, blocking it while another process
+    holds the lock. It is only held while a batch of keys is looked up in the table,
+    a few microseconds, which is far less than the cost of handing the work to a
+    thread.
+
+    Every file is a separate cache, the path has to be unique to the application and
+    database, as the applications sharing a file would read each other's decisions.
+
+    Args:
+        path (str): The file backing the table, for instance `/run/myapp/guardian-cache`.
+        slots (int): The number of slots of the table.
+        slot_size (int): The size in bytes of each slot.
+        max_probes (int): The maximum number of slots looked at per key.
+        timer (Callable[[], float]): The wall clock used to compute the expiration.
+    """
+
+    can_list_keys = True
+
+    def __init__(
+        self,
+        path: str,
+        slots: int = 65_536,
+        slot_size: int = 256,
+        max_probes: int = 32,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        if fcntl is None:
+            raise GuardianImproperlyConfigured(
+                f"'{type(self).__name__}' is only available on platforms supporting 'fcntl'."
+            )
+
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.max_probes = min(max_probes, slots)
+        self.timer = timer
+        self._pid: int | None = None
+        self._fd: int = -1
+        self._mmap: mmap.mmap | None = None
+
+    @property
+    def size(self) -> int:
+        return HEADER.size + self.slots * self.slot_size
+
+    def _open(self) -> mmap.mmap:
+        """
+        Maps the file, once per process, creating and formatting it when needed.
+
+        Forked processes map the file again to get their own lock.
+        """
+        if self._mmap is not None and self._pid == os.getpid():
+            return self._mmap
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != self.size:
+                os.ftruncate(fd, self.size)
+            data = mmap.mmap(fd, self.size)
+            magic, _, slots, slot_size = HEADER.unpack_from(data, 0)
+            if (magic, slots, slot_size) != (MAGIC, self.slots, self.slot_size):
+                data[: self.size] = bytes(self.size)
+                HEADER.pack_into(data, 0, MAGIC, 1, self.slots, self.slot_size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        self._fd, self._mmap, self._pid = fd, data, os.getpid()
+        return data
+
+    @contextmanager
+    def _lock(self, exclusive: bool = True) -> Iterator[mmap.mmap]:
+        data = self._open()
+        fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield data
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, index: int) -> int:
+        return HEADER.size + index * self.slot_size
+
+    def _version(self, data: mmap.mmap) -> int:
+        return int(HEADER.unpack_from(data, 0)[1])
+
+    def _find(self, data: mmap.mmap, key: bytes) -> tuple[int | None, int]:
+        """
+        Returns the slot holding the key, if any, and the slot where it can be stored.
+        """
+        key_hash = _hash(key)
+        start = key_hash % self.slots
+        free: int | None = None
+
+        for probe in range(self.max_probes):
+            index = (start + probe) % self.slots
+            offset = self._offset(index)
+            state, slot_hash, _, key_length, _ = SLOT.unpack_from(data, offset)
+
+            if state == EMPTY:
+                return None, index if free is None else free
+            if state == DELETED:
+                if free is None:
+                    free = index
+                continue
+
+            begin = offset + SLOT.size
+            if slot_hash == key_hash and data[begin : begin + key_length] == key:
+                return index, index
+
+        return None, start if free is None else free
+
+    def _read(self, data: mmap.mmap, index: int, now: float) -> tuple[bytes, Any] | None:
+        offset = self._offset(index)
+        state, _, expires, key_length, value_length = SLOT.unpack_from(data, offset)
+        if state != USED:
+            return None
+
+        if expires and expires <= now:
+            data[offset] = DELETED
+            return None
+
+        begin = offset + SLOT.size
+        key = data[begin : begin + key_length]
+        value = data[begin + key_length : begin + key_length + value_length]
+        return key, json.loads(value)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        values: dict[str, Any] = {}
+        with self._lock() as data:
+            version, now = self._version(data), self.timer()
+            for key in keys:
+                index, _ = self._find(data, self.make_key(key, version).encode())
+                if index is None:
+                    continue
+                entry = self._read(data, index, now)
+                if entry is not None:
+                    values[key] = entry[1]
+        return values
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: float | None = None) -> None:
+        with self._lock() as data:
+            version = self._version(data)
+            expires = 0.0 if ttl is None else self.timer() + ttl
+
+            for key, value in mapping.items():
+                encoded_key = self.make_key(key, version).encode()
+                encoded_value = json.dumps(value, separators=(",", ":")).encode()
+                if SLOT.size + len(encoded_key) + len(encoded_value) > self.slot_size:
+                    continue
+
+                _, index = self._find(data, encoded_key)
+                offset = self._offset(index)
+                SLOT.pack_into(
+                    data,
+                    offset,
+                    USED,
+                    _hash(encoded_key),
+                    expires,
+                    len(encoded_key),
+                    len(encoded_value),
+                )
+                begin = offset + SLOT.size
+                data[begin : begin + len(encoded_key) + len(encoded_value)] = (
+                    encoded_key + encoded_value
+                )
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock() as data:
+            version = self._version(data)
+            for key in keys:
+                index, _ = self._find(data, self.make_key(key, version).encode())
+                if index is not None:
+                    data[self._offset(index)] = DELETED
+
+    async def clear(self) -> None:
+        with self._lock() as data:
+            data[HEADER.size : self.size] = bytes(self.size - HEADER.size)
+
+    async def keys(self) -> list[str]:
+        keys: list[str] = []
+        with self._lock() as data:
+            prefix, now = self.make_key("", self._version(data)).encode(), self.timer()
+            for index in range(self.slots):
+                entry = self._read(data, index, now)
+                if entry is not None and entry[0].startswith(prefix):
+                    keys.append(entry[0][len(prefix) :].decode())
+        return keys
+
+    async def get_version(self) -> int:
+        with self._lock(exclusive=False) as data:
+            return self._version(data)
+
+    async def incr_version(self) -> int:
+        with self._lock() as data:
+            version = self._version(data) + 1
+            HEADER.pack_into(data, 0, MAGIC, version, self.slots, self.slot_size)
+            # The keys of the previous version can never be read again
+            data[HEADER.size : self.size] = bytes(self.size - HEADER.size)
+        return version
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._fd)
+        self._mmap, self._pid, self._fd = None, None, -1
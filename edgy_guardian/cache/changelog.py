@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import sqlalchemy
+
+from edgy_guardian._internal._keys import from_key, to_key
+from edgy_guardian.cache.decisions import get_decision_cache, make_decision_key
+from edgy_guardian.cache.groups import get_group_cache
+from edgy_guardian.enums import ChangeAction, ChangeRelation
+from edgy_guardian.exceptions import ChangelogTruncated, GuardianImproperlyConfigured
+from edgy_guardian.utils import (
+    get_changelog_model,
+    get_groups_model,
+    get_permission_model,
+    get_user_model,
+)
+
+if TYPE_CHECKING:
+    from edgy_guardian.permissions.snapshots import PermissionSnapshot
+
+
+class Change(NamedTuple):
+    """
+    A single entry of the changelog.
+
+    Attributes:
+        sequence (int): The position of the change in the changelog.
+        action (ChangeAction): Whether the relation was added or removed.
+        relation (ChangeRelation): The relation that changed.
+        permission_id (Any): The id of the permission, if any.
+        user_id (Any): The id of the user, if any.
+        group_id (Any): The id of the group, if any.
+        created_at (datetime): When the change was recorded.
+    """
+
+    sequence: int
+    action: ChangeAction
+    relation: ChangeRelation
+    permission_id: Any
+    user_id: Any
+    group_id: Any
+    created_at: datetime
+
+
+class ChangeRecorder:
+    """
+    Collects the changes made by a write and appends them to the changelog at once.
+
+    The changes are written when the context exits, even if the write failed
+    halfway, so the changelog always reflects what reached the database.
+
+    Example:
+        >>> async with ChangeRecorder() as recorder:
+        ...     await permission.users.add(user)
+        ...     recorder.add(ChangeAction.ADD, ChangeRelation.USER_PERMISSION, permission=permission, user=user)
+    """
+
+    def __init__(self) -> None:
+        self.model = get_changelog_model()
+        self.changes: list[dict[str, Any]] = []
+
+    async def __aenter__(self) -> ChangeRecorder:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.flush()
+
+    def add(
+        self,
+        action: ChangeAction,
+        relation: ChangeRelation,
+        permission: Any = None,
+        user: Any = None,
+        group: Any = None,
+    ) -> None:
+        """
+        Adds a change to be written.
+        """
+        if self.model is None:
+            return
+
+        self.changes.append(
+            {
+                "action": action.value,
+                "relation": relation.value,
+                "permission_id": None if permission is None else to_key(permission),
+                "user_id": None if user is None else to_key(user),
+                "group_id": None if group is None else to_key(group),
+            }
+        )
+
+    async def flush(self) -> None:
+        """
+        Writes the collected changes with a single bulk insert.
+        """
+        if self.model is None or not self.changes:
+            return
+
+        changes, self.changes = self.changes, []
+        await self.model.query.bulk_create(changes)
+
+
+def is_changelog_enabled() -> bool:
+    """
+    Returns True if a `changelog_model` is configured in the `EdgyGuardianConfig`.
+    """
+    return get_changelog_model() is not None
+
+
+def _get_changelog_model() -> Any:
+    model = get_changelog_model()
+    if model is None:
+        raise GuardianImproperlyConfigured(
+            "No 'changelog_model' is configured in the 'EdgyGuardianConfig'."
+        )
+    return model
+
+
+async def get_last_sequence() -> int:
+    """
+    Returns the sequence of the last change, 0 when the changelog is empty.
+    """
+    model = _get_changelog_model()
+    table = model.table
+    sequence = await model.database.fetch_val(sqlalchemy.select(sqlalchemy.func.max(table.c.id)))
+    return sequence or 0
+
+
+async def get_changes_since(sequence: int, limit: int | None = None) -> list[Change]:
+    """
+    Returns the changes made after the given sequence, oldest first.
+
+    Args:
+        sequence (int): The last sequence already seen.
+        limit (int | None): The maximum number of changes to return.
+
+    Returns:
+        list[Change]: The changes.
+
+    Raises:
+        ChangelogTruncated: If changes after `sequence` may have been compacted away.
+            The caller has to discard its caches and start again from `get_last_sequence()`.
+    """
+    model = _get_changelog_model()
+    table = model.table
+
+    first = await model.database.fetch_val(sqlalchemy.select(sqlalchemy.func.min(table.c.id)))
+    if first is not None and sequence < first - 1:
+        raise ChangelogTruncated(
+            f"The changes after {sequence} were compacted, the changelog starts at {first}."
+        )
+
+    expression = sqlalchemy.select(table).where(table.c.id > sequence).order_by(table.c.id)
+    if limit is not None:
+        expression = expression.limit(limit)
+
+    user_model, group_model, permission_model = (
+        get_user_model(),
+        get_groups_model(),
+        get_permission_model(),
+    )
+    return [
+        Change(
+            sequence=row.id,
+            action=ChangeAction(row.action),
+            relation=ChangeRelation(row.relation),
+            permission_id=from_key(permission_model, row.permission_id),
+            user_id=from_key(user_model, row.user_id),
+            group_id=from_key(group_model, row.group_id),
+            created_at=row.created_at,
+        )
+        for row in await model.database.fetch_all(expression)
+    ]
+
+
+async def compact_changes(before: int | None = None, older_than: datetime | None = None) -> int:
+    """
+    Deletes the old entries of the changelog.
+
+    The last entry is always kept, which is what allows `get_changes_since` to detect
+    that a reader fell behind the compaction.
+
+    Args:
+        before (int | None): Deletes the changes with a lower sequence.
+        older_than (datetime | None): Deletes the changes created before this moment.
+
+    Returns:
+        int: The number of deleted changes.
+    """
+    model = _get_changelog_model()
+    queryset = model.query.filter(id__lt=await get_last_sequence())
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    if older_than is not None:
+        queryset = queryset.filter(created_at__lt=older_than)
+    return int(await queryset.delete())
+
+
+async def apply_changes(changes: Iterable[Change]) -> None:
+    """
+    Applies the given changes to the decision cache and the group cache.
+
+    Only the entries that are already cached are updated, nothing is evicted.
+    """
+    from edgy_guardian.permissions.catalog import get_permission_catalog
+
+    changes = list(changes)
+    permissions = await get_permission_catalog().get_for_ids(
+        {change.permission_id for change in changes if change.permission_id is not None}
+    )
+    decision_cache = get_decision_cache()
+    group_cache = get_group_cache()
+
+    for change in changes:
+        is_added = change.action == ChangeAction.ADD
+
+        if change.relation == ChangeRelation.USER_PERMISSION:
+            permission = permissions.get(change.permission_id)
+            if permission is not None:
+                key = make_decision_key(change.user_id, permission.content_type, permission.codename)
+                await decision_cache.replace(key, is_added)
+        elif change.relation == ChangeRelation.GROUP_PERMISSION:
+            ids = [change.permission_id]
+            group_cache.update_group_permissions(
+                change.group_id, added=ids if is_added else (), removed=() if is_added else ids
+            )
+        elif change.relation == ChangeRelation.GROUP_MEMBERSHIP:
+            ids = [change.group_id]
+            group_cache.update_user_groups(
+                change.user_id, added=ids if is_added else (), removed=() if is_added else ids
+            )
+
+
+async def apply_changes_to_snapshot(
+    snapshot: PermissionSnapshot, changes: Iterable[Change]
+) -> PermissionSnapshot:
+    """
+    Returns a new snapshot with the direct permission changes of its user applied.
+
+    Args:
+        snapshot (PermissionSnapshot): The snapshot to update.
+        changes (Iterable[Change]): The changes, for instance from `get_changes_since`.
+
+    Returns:
+        PermissionSnapshot: The updated snapshot.
+    """
+    from edgy_guardian.permissions.catalog import get_permission_catalog
+
+    changes = [
+        change
+        for change in changes
+        if change.relation == ChangeRelation.USER_PERMISSION and change.user_id == snapshot.user_id
+    ]
+    if not changes:
+        return snapshot
+
+    permissions = await get_permission_catalog().get_for_ids(
+        {change.permission_id for change in changes}
+    )
+    added: dict[Any, Any] = {}
+    removed: dict[Any, Any] = {}
+    for change in changes:
+        permission = permissions.get(change.permission_id)
+        if permission is None:
+            continue
+        if change.action == ChangeAction.ADD:
+            added[permission.id] = permission
+            removed.pop(permission.id, None)
+        else:
+            removed[permission.id] = permission
+            added.pop(permission.id, None)
+    return snapshot.apply(added=added.values(), removed=removed.values())
+
+
+class ChangelogFollower:
+    """
+    Keeps the caches of the current process up to date by reading the changelog.
+
+    Unlike the generation tracker, which invalidates what changed, the follower
+    applies the changes to the cached entries, so warm caches stay warm after a
+    bulk grant made by another process.
+
+    The sequences are given when the changes are inserted, not when they are
+    committed, so a change can become visible after a change with a higher sequence.
+    A gap in the sequences read is therefore treated as not yet visible: the follower
+    does not move past it and reads the changes after it again, until the gap is
+    filled or older than `gap_timeout`, as rolled back writes leave gaps forever.
+    Applying a change again is harmless, the changes are applied in sequence order.
+
+    Args:
+        interval (float): The minimum number of seconds between two automatic reads
+            done via `maybe_catch_up()`.
+        timer (Callable[[], float]): The clock used to throttle the automatic reads.
+        gap_timeout (float): The number of seconds after which a gap in the sequences
+            is considered left by a rolled back write and skipped.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        timer: Callable[[], float] = time.monotonic,
+        gap_timeout: float = 10.0,
+    ) -> None:
+        self.interval = interval
+        self.timer = timer
+        self.gap_timeout = gap_timeout
+        self.sequence: int | None = None
+        self.synced_at: float | None = None
+        self.gaps: dict[int, float] = {}
+
+    def reset(self) -> None:
+        """
+        Forgets the last seen sequence. The next read clears the caches.
+        """
+        self.sequence = None
+        self.synced_at = None
+        self.gaps = {}
+
+    def _advance(self, sequence: int, changes: list[Change]) -> int:
+        """
+        Returns the sequence to read from next, the last one before a gap in the
+        sequences of `changes` that is still within the `gap_timeout`.
+        """
+        now = self.timer()
+        for change in changes:
+            if change.sequence != sequence + 1:
+                # The missing sequences may belong to a write not committed yet
+                seen_at = self.gaps.setdefault(sequence + 1, now)
+                if now - seen_at < self.gap_timeout:
+                    break
+            sequence = change.sequence
+        self.gaps = {start: seen_at for start, seen_at in self.gaps.items() if start > sequence}
+        return sequence
+
+    async def maybe_catch_up(self) -> int:
+        """
+        Catches up if the last read is older than the interval.
+
+        Returns:
+            int: The number of changes applied.
+        """
+        if self.synced_at is not None and self.timer() - self.synced_at < self.interval:
+            return 0
+        return await self.catch_up()
+
+    async def catch_up(self) -> int:
+        """
+        Applies the changes made since the last read to the caches.
+
+        Returns:
+            int: The number of changes applied.
+        """
+        if not is_changelog_enabled():
+            return 0
+
+        self.synced_at = self.timer()
+        if self.sequence is not None:
+            try:
+                changes = await get_changes_since(self.sequence)
+            except ChangelogTruncated:
+                pass
+            else:
+                if changes:
+                    await apply_changes(changes)
+                    self.sequence = self._advance(self.sequence, changes)
+                return len(changes)
+
+        # Nothing is known about what the caches hold, start from scratch
+        self.sequence = await get_last_sequence()
+        await get_decision_cache().clear()
+        get_group_cache().clear()
+        return 0
+
+
+@lru_cache
+def get_changelog_follower() -> ChangelogFollower:
+    """
+    Returns the process-wide changelog follower.
+
+    The follower is created on first use with the `changelog_sync_interval` and
+    `changelog_gap_timeout` values of the `EdgyGuardianConfig`.
+
+    Returns:
+        ChangelogFollower: The changelog follower.
+    """
+    from edgy.conf import settings
+
+    return ChangelogFollower(
+        interval=settings.edgy_guardian.changelog_sync_interval,
+        gap_timeout=settings.edgy_guardian.changelog_gap_timeout,
+    )
@@ -0,0 +1,227 @@
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any
+
+import sqlalchemy
+from sqlalchemy.exc import IntegrityError
+
+from edgy_guardian._internal._commit import replaying_after_commit
+from edgy_guardian._internal._keys import from_key, to_key
+from edgy_guardian.cache.changelog import get_changelog_follower, is_changelog_enabled
+from edgy_guardian.cache.decisions import get_decision_cache
+from edgy_guardian.cache.groups import get_group_cache
+from edgy_guardian.cache.signals import mute_signals
+from edgy_guardian.enums import UserGroup
+from edgy_guardian.utils import get_generation_model, get_groups_model, get_user_model
+
+GLOBAL_SCOPE = "global"
+
+
+@asynccontextmanager
+async def write_transaction() -> AsyncIterator[None]:
+    """
+    The context guardian writes run in.
+
+    When a generation model is configured, the writes and the generation bump
+    share a database transaction, otherwise nothing is opened. The signal receivers
+    are muted, as the guardian writes invalidate the caches themselves. The cache
+    invalidations made inside the transaction are run again after its commit, so a
+    concurrent read of the old rows cannot leave them cached.
+    """
+    model = get_generation_model()
+    with mute_signals():
+        if model is None:
+            yield
+        else:
+            async with replaying_after_commit(), model.database.transaction():
+                yield
+
+
+async def bump_generation(
+    users: Iterable[Any] | Any = (), groups: Iterable[Any] | Any = ()
+) -> int | None:
+    """
+    Bumps the global generation and stamps the given users and groups with it.
+
+    This is meant to be called inside the transaction of the write, see
+    `write_transaction`. The update of the global row locks it until the end of the
+    transaction, which serializes the guardian writes and keeps the generations
+    monotonic across processes.
+
+    Args:
+        users (Iterable[Any] | Any): The users (or user ids) affected by the write.
+        groups (Iterable[Any] | Any): The groups (or group ids) affected by the write.
+
+    Returns:
+        int | None: The new global generation or None if no generation model is configured.
+    """
+    model = get_generation_model()
+    if model is None:
+        return None
+
+    table = model.table
+    database = model.database
+    is_global = sqlalchemy.and_(table.c.scope == GLOBAL_SCOPE, table.c.key == "")
+
+    await database.execute(
+        sqlalchemy.update(table).where(is_global).values(value=table.c.value + 1)
+    )
+    generation = await database.fetch_val(sqlalchemy.select(table.c.value).where(is_global))
+    if generation is None:
+        try:
+            async with database.transaction():
+                await database.execute(
+                    sqlalchemy.insert(table).values(scope=GLOBAL_SCOPE, key="", value=1)
+                )
+        except IntegrityError:
+            # Another process created the row in the meantime
+            await database.execute(
+                sqlalchemy.update(table).where(is_global).values(value=table.c.value + 1)
+            )
+        generation = await database.fetch_val(sqlalchemy.select(table.c.value).where(is_global))
+
+    for scope, objs in ((UserGroup.USER.value, users), (UserGroup.GROUP.value, groups)):
+        if not isinstance(objs, (list, tuple, set, frozenset)):
+            objs = [objs]
+        keys = {to_key(obj) for obj in objs}
+        if not keys:
+            continue
+
+        in_scope = sqlalchemy.and_(table.c.scope == scope, table.c.key.in_(keys))
+        await database.execute(sqlalchemy.update(table).where(in_scope).values(value=generation))
+        existing = {
+            row[0] for row in await database.fetch_all(sqlalchemy.select(table.c.key).where(in_scope))
+        }
+        missing = keys - existing
+        if missing:
+            await database.execute_many(
+                sqlalchemy.insert(table),
+                [{"scope": scope, "key": key, "value": generation} for key in missing],
+            )
+    return int(generation)
+
+
+class GenerationTracker:
+    """
+    Keeps the caches of the current process coherent with the writes of other processes.
+
+    The tracker remembers the last global generation it has seen. A `sync()` reads
+    the global row and every row stamped after that generation with a single
+    indexed query, and invalidates only the users and groups that changed.
+
+    Args:
+        interval (float): The minimum number of seconds between two automatic syncs
+            done via `maybe_sync()`.
+        timer (Callable[[], float]): The clock used to throttle the automatic syncs.
+    """
+
+    def __init__(self, interval: float = 1.0, timer: Callable[[], float] = time.monotonic) -> None:
+        self.interval = interval
+        self.timer = timer
+        self.generation: int | None = None
+        self.synced_at: float | None = None
+
+    def reset(self) -> None:
+        """
+        Forgets the last seen generation. The next sync clears the caches.
+        """
+        self.generation = None
+        self.synced_at = None
+
+    async def maybe_sync(self) -> bool:
+        """
+        Syncs if the last sync is older than the interval.
+
+        Returns:
+            bool: True if the caches were invalidated.
+        """
+        if self.synced_at is not None and self.timer() - self.synced_at < self.interval:
+            return False
+        return await self.sync()
+
+    async def sync(self) -> bool:
+        """
+        Reads the generations and invalidates the caches of what changed since
+        the last sync.
+
+        Returns:
+            bool: True if the caches were invalidated.
+        """
+        model = get_generation_model()
+        if model is None:
+            return False
+
+        table = model.table
+        condition = sqlalchemy.and_(table.c.scope == GLOBAL_SCOPE, table.c.key == "")
+        if self.generation is not None:
+            condition = sqlalchemy.or_(condition, table.c.value > self.generation)
+
+        rows = await model.database.fetch_all(
+            sqlalchemy.select(table.c.scope, table.c.key, table.c.value).where(condition)
+        )
+        self.synced_at = self.timer()
+
+        generation = 0
+        users: set[str] = set()
+        groups: set[str] = set()
+        for scope, key, value in rows:
+            if scope == GLOBAL_SCOPE:
+                generation = value
+            elif scope == UserGroup.USER.value:
+                users.add(key)
+            elif scope == UserGroup.GROUP.value:
+                groups.add(key)
+
+        if self.generation is None:
+            # Nothing is known about what the caches hold, start from scratch
+            await get_decision_cache().clear()
+            get_group_cache().clear()
+        elif generation == self.generation:
+            return False
+        else:
+            user_ids = {from_key(get_user_model(), key) for key in users}
+            await get_decision_cache().invalidate_users(user_ids)
+            get_group_cache().invalidate_users(user_ids)
+            get_group_cache().invalidate_groups({from_key(get_groups_model(), key) for key in groups})
+
+        self.generation = generation
+        return True
+
+
+@lru_cache
+def get_generation_tracker() -> GenerationTracker:
+    """
+    Returns the process-wide generation tracker.
+
+    The tracker is created on first use with the `generation_sync_interval` value of
+    the `EdgyGuardianConfig`.
+
+    Returns:
+        GenerationTracker: The generation tracker.
+    """
+    from edgy.conf import settings
+
+    return GenerationTracker(interval=settings.edgy_guardian.generation_sync_interval)
+
+
+def is_generation_tracking_enabled() -> bool:
+    """
+    Returns True if a `generation_model` is configured in the `EdgyGuardianConfig`.
+    """
+    return get_generation_model() is not None
+
+
+async def sync_caches() -> None:
+    """
+    Brings the caches of the current process up to date with the writes of the other
+    processes, via the generation table and the changelog, when configured.
+
+    Both are throttled by their sync intervals, so this is cheap to call before every
+    cached permission check.
+    """
+    if is_generation_tracking_enabled():
+        await get_generation_tracker().maybe_sync()
+    if is_changelog_enabled():
+        await get_changelog_follower().maybe_catch_up()
@@ -0,0 +1,307 @@
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sized
+from functools import lru_cache
+from typing import Any
+
+import edgy
+
+from edgy_guardian._internal._commit import replay_after_commit
+from edgy_guardian.cache.backends import CacheBackend, MemoryCacheBackend
+from edgy_guardian.utils import get_cache_backend
+
+DecisionKey = tuple[Any, Any, str]
+
+
+def normalize_codename(perm: str | edgy.Model | type[edgy.Model]) -> str:
+    """
+    Returns the normalized codename of a permission.
+
+    Permission checks compare codenames with `iexact`, so the cache keys are
+    always built from the lowercase version of the codename.
+
+    Args:
+        perm (str | edgy.Model | type[edgy.Model]): The permission codename or a
+            permission instance.
+
+    Returns:
+        str: The lowercase codename.
+    """
+    codename = perm if isinstance(perm, str) else perm.codename
+    return codename.lower()
+
+
+def make_decision_key(
+    user: Any, content_type: Any, perm: str | edgy.Model | type[edgy.Model]
+) -> DecisionKey:
+    """
+    Builds the cache key used for a `has_user_perm` decision.
+
+    Args:
+        user (Any): The user instance or the user id.
+        content_type (Any): The content type instance or the content type id.
+        perm (str | edgy.Model | type[edgy.Model]): The permission codename or a
+            permission instance.
+
+    Returns:
+        DecisionKey: A `(user_id, content_type_id, codename)` tuple.
+    """
+    user_id = getattr(user, "id", user)
+    content_type_id = getattr(content_type, "id", content_type)
+    return (user_id, content_type_id, normalize_codename(perm))
+
+
+class DecisionCache:
+    """
+    A cache for permission decisions.
+
+    The decisions are stored by `(user_id, content_type_id, codename)` in a cache
+    backend, bounded by a time to live. By default the backend is an in-process
+    LRU, bounded by the number of entries.
+
+    The decisions of a user are invalidated by deleting their keys, found with
+    `keys()`. Backends that cannot list their keys, such as Redis, store every
+    decision with the current tag of its user instead, and invalidating the user
+    deletes the tag, which only drops the decisions of that user.
+
+    Args:
+        maxsize (int): The maximum number of decisions kept in memory by the default backend.
+        ttl (float | None): The number of seconds a decision is considered valid.
+            When `None`, decisions only leave the cache by eviction or invalidation.
+        timer (Callable[[], float]): The clock used by the default backend.
+        backend (CacheBackend | None): The backend storing the decisions.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float | None = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+        backend: CacheBackend | None = None,
+    ) -> None:
+        self.backend = backend if backend is not None else MemoryCacheBackend(maxsize, timer)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.tagged = not getattr(self.backend, "can_list_keys", False)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cached decisions, for the backends able to count their
+        keys without a round trip, such as the default in-process one.
+
+        Raises:
+            TypeError: If the backend cannot count its keys.
+        """
+        if not isinstance(self.backend, Sized):
+            raise TypeError(f"'{type(self.backend).__name__}' cannot count its keys.")
+        return len(self.backend)
+
+    @staticmethod
+    def make_backend_key(key: tuple[Any, ...]) -> str:
+        """
+        Returns the key of a decision in the backend, or the start of it when given
+        only the first parts of the decision key.
+        """
+        return "decision:" + ":".join(str(part) for part in key)
+
+    @staticmethod
+    def make_tag_key(user_id: Any) -> str:
+        """
+        Returns the key of the tag of the decisions of a user in the backend.
+        """
+        return f"decision-tag:{user_id}"
+
+    async def _get_tags(self, user_ids: Iterable[Any]) -> dict[Any, str]:
+        """
+        Returns the current tags of the given users, creating the missing ones.
+        """
+        tag_keys = {self.make_tag_key(user_id): user_id for user_id in user_ids}
+        tags = await self.backend.get_many(tag_keys)
+        missing = {tag_key: uuid.uuid4().hex for tag_key in tag_keys if tag_key not in tags}
+        if missing:
+            # A decision never outlives the tag it was stored with
+            await self.backend.set_many(missing, ttl=self.ttl)
+            tags.update(missing)
+        return {user_id: tags[tag_key] for tag_key, user_id in tag_keys.items()}
+
+    async def _get_many(self, backend_keys: Mapping[str, DecisionKey]) -> dict[DecisionKey, bool]:
+        """
+        Reads the decisions of the given backend keys, checking their tags, if any,
+        with the same backend call.
+        """
+        if not self.tagged:
+            values = await self.backend.get_many(backend_keys)
+            return {backend_keys[backend_key]: bool(value) for backend_key, value in values.items()}
+
+        tag_keys = {self.make_tag_key(key[0]) for key in backend_keys.values()}
+        values = await self.backend.get_many([*backend_keys, *tag_keys])
+        decisions: dict[DecisionKey, bool] = {}
+        for backend_key, key in backend_keys.items():
+            entry = values.get(backend_key)
+            tag = values.get(self.make_tag_key(key[0]))
+            if isinstance(entry, list) and tag is not None and entry[0] == tag:
+                decisions[key] = bool(entry[1])
+        return decisions
+
+    async def get(self, key: DecisionKey) -> bool | None:
+        """
+        Returns the cached decision for the given key.
+
+        Args:
+            key (DecisionKey): The decision key.
+
+        Returns:
+            bool | None: The cached decision or `None` if there is no valid entry.
+        """
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[DecisionKey]) -> dict[DecisionKey, bool]:
+        """
+        Returns the cached decisions for the given keys with a single backend call.
+
+        Args:
+            keys (Iterable[DecisionKey]): The decision keys.
+
+        Returns:
+            dict[DecisionKey, bool]: The cached decisions. Missing keys are not included.
+        """
+        backend_keys = {self.make_backend_key(key): key for key in keys}
+        decisions = await self._get_many(backend_keys)
+
+        self.hits += len(decisions)
+        self.misses += len(backend_keys) - len(decisions)
+        return decisions
+
+    async def set(self, key: DecisionKey, value: bool) -> None:
+        """
+        Stores a decision in the cache.
+
+        Args:
+            key (DecisionKey): The decision key.
+            value (bool): The decision.
+        """
+        await self.set_many({key: value})
+
+    async def set_many(self, decisions: Mapping[DecisionKey, bool]) -> None:
+        """
+        Stores the given decisions with a single backend call.
+        """
+        if not decisions:
+            return
+
+        if self.tagged:
+            tags = await self._get_tags({key[0] for key in decisions})
+            values: dict[str, Any] = {
+                self.make_backend_key(key): [tags[key[0]], value] for key, value in decisions.items()
+            }
+        else:
+            values = {self.make_backend_key(key): value for key, value in decisions.items()}
+        await self.backend.set_many(values, ttl=self.ttl)
+
+    def _replay_after_commit(self, apply: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Runs an invalidation again after the commit of the current guardian write
+        transaction and counts it again, so that a decision computed before the
+        commit is not stored once its entry is dropped.
+        """
+
+        async def replay() -> None:
+            self.invalidations += 1
+            await apply()
+
+        replay_after_commit(replay)
+
+    async def replace(self, key: DecisionKey, value: bool) -> None:
+        """
+        Updates a decision that is already in the cache, leaving the cache untouched
+        otherwise.
+
+        Args:
+            key (DecisionKey): The decision key.
+            value (bool): The new decision.
+        """
+        if await self._get_many({self.make_backend_key(key): key}):
+            await self.set_many({key: value})
+        self.invalidations += 1
+
+    async def invalidate(self, key: DecisionKey) -> None:
+        """
+        Removes a single decision from the cache.
+        """
+        await self.invalidate_many([key])
+
+    async def invalidate_many(self, keys: Iterable[DecisionKey]) -> None:
+        """
+        Removes all the given decisions from the cache in one pass.
+
+        Write operations collect every key they affect and call this method once,
+        which means a bulk operation results in a single invalidation.
+
+        Args:
+            keys (Iterable[DecisionKey]): The decision keys to remove.
+        """
+        backend_keys = {self.make_backend_key(key) for key in keys}
+        await self.backend.delete_many(backend_keys)
+        self.invalidations += 1
+        self._replay_after_commit(lambda: self.backend.delete_many(backend_keys))
+
+    async def invalidate_users(self, users: Iterable[Any]) -> None:
+        """
+        Removes all the decisions of the given users from the cache.
+
+        With backends that cannot list their keys, the tags of the users are deleted.
+
+        Args:
+            users (Iterable[Any]): User instances or user ids.
+        """
+        user_ids = {getattr(user, "id", user) for user in users}
+        prefixes = tuple(self.make_backend_key((user_id,)) + ":" for user_id in user_ids)
+
+        async def delete() -> None:
+            if self.tagged:
+                await self.backend.delete_many(self.make_tag_key(user_id) for user_id in user_ids)
+            else:
+                keys = await self.backend.keys()
+                await self.backend.delete_many(key for key in keys if key.startswith(prefixes))
+
+        await delete()
+        self.invalidations += 1
+        self._replay_after_commit(delete)
+
+    async def clear(self) -> None:
+        """
+        Removes every decision from the cache.
+        """
+        await self.backend.clear()
+        self.invalidations += 1
+        self._replay_after_commit(self.backend.clear)
+
+
+@lru_cache
+def get_decision_cache() -> DecisionCache:
+    """
+    Returns the process-wide decision cache.
+
+    The cache is created on first use with the `decision_cache_ttl` value and the
+    cache backend of the `EdgyGuardianConfig`.
+
+    Returns:
+        DecisionCache: The decision cache.
+    """
+    from edgy.conf import settings
+
+    return DecisionCache(
+        ttl=settings.edgy_guardian.decision_cache_ttl,
+        backend=get_cache_backend(),
+    )
+
+
+def is_decision_cache_enabled() -> bool:
+    """
+    Returns True if the `decision_cache` is enabled in the `EdgyGuardianConfig`.
+    """
+    from edgy.conf import settings
+
+    return bool(getattr(settings.edgy_guardian, "decision_cache", False))
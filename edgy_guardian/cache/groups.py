@@ -0,0 +1,235 @@
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from edgy_guardian._internal._commit import replay_after_commit
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def _get_ids(objs: Iterable[Any]) -> set[Any]:
+    """
+    Returns the ids of the given instances, accepting raw ids as well.
+    """
+    return {getattr(obj, "id", obj) for obj in objs}
+
+
+def _get(entries: OrderedDict[K, V], key: K) -> V | None:
+    """
+    Returns the entry for the given key and marks it as the most recently used.
+    """
+    value = entries.get(key)
+    if value is not None:
+        entries.move_to_end(key)
+    return value
+
+
+def _put(entries: OrderedDict[K, V], key: K, value: V, maxsize: int) -> None:
+    """
+    Stores an entry and evicts the least recently used ones above `maxsize`.
+    """
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > maxsize:
+        entries.popitem(last=False)
+
+
+class GroupCache:
+    """
+    A process-local cache of the group memberships and of the group permissions.
+
+    The cache keeps three maps:
+
+    * user id → the ids of the groups the user belongs to.
+    * group id → the ids of the permissions given to the group.
+    * group name → group id.
+
+    With the three maps loaded, `has_group_permission` becomes a lookup and a
+    set intersection in memory. The entries are invalidated by the write paths
+    of `BaseGroup`, which is where the memberships and the group permissions
+    change.
+
+    The cache lives in the memory of the current process. Each map keeps at most
+    `maxsize` entries and evicts the least recently used ones.
+
+    Args:
+        maxsize (int): The maximum number of entries kept by each map.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._user_groups: OrderedDict[Any, frozenset[Any]] = OrderedDict()
+        self._group_permissions: OrderedDict[Any, frozenset[Any]] = OrderedDict()
+        self._group_names: OrderedDict[str, Any] = OrderedDict()
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._user_groups) + len(self._group_permissions)
+
+    def _replay_after_commit(self, apply: Callable[[], None]) -> None:
+        """
+        Runs a change again after the commit of the current guardian write transaction
+        and counts it again, so that an entry read before the commit is not stored.
+        """
+
+        def replay() -> None:
+            self.invalidations += 1
+            apply()
+
+        replay_after_commit(replay)
+
+    def get_user_groups(self, user: Any) -> frozenset[Any] | None:
+        """
+        Returns the ids of the groups of the given user, if known.
+        """
+        return _get(self._user_groups, getattr(user, "id", user))
+
+    def set_user_groups(self, user: Any, group_ids: Iterable[Any]) -> None:
+        """
+        Stores the ids of the groups of the given user.
+        """
+        _put(self._user_groups, getattr(user, "id", user), frozenset(group_ids), self.maxsize)
+
+    def get_group_permissions(self, group: Any) -> frozenset[Any] | None:
+        """
+        Returns the ids of the permissions of the given group, if known.
+        """
+        return _get(self._group_permissions, getattr(group, "id", group))
+
+    def set_group_permissions(self, group: Any, permission_ids: Iterable[Any]) -> None:
+        """
+        Stores the ids of the permissions of the given group.
+        """
+        _put(
+            self._group_permissions,
+            getattr(group, "id", group),
+            frozenset(permission_ids),
+            self.maxsize,
+        )
+
+    def get_group_id(self, name: str) -> Any | None:
+        """
+        Returns the id of the group with the given name, if known.
+        """
+        return _get(self._group_names, name)
+
+    def set_group_id(self, name: str, group_id: Any) -> None:
+        """
+        Stores the id of the group with the given name.
+        """
+        _put(self._group_names, name, group_id, self.maxsize)
+
+    def update_user_groups(
+        self, user: Any, added: Iterable[Any] = (), removed: Iterable[Any] = ()
+    ) -> None:
+        """
+        Applies a membership change to the groups of a user already in the cache.
+        """
+        user_id = getattr(user, "id", user)
+        added, removed = _get_ids(added), _get_ids(removed)
+
+        def apply() -> None:
+            group_ids = self._user_groups.get(user_id)
+            if group_ids is not None:
+                self._user_groups[user_id] = (group_ids | added) - removed
+
+        apply()
+        self.invalidations += 1
+        self._replay_after_commit(apply)
+
+    def update_group_permissions(
+        self, group: Any, added: Iterable[Any] = (), removed: Iterable[Any] = ()
+    ) -> None:
+        """
+        Applies a permission change to the permissions of a group already in the cache.
+        """
+        group_id = getattr(group, "id", group)
+        added, removed = _get_ids(added), _get_ids(removed)
+
+        def apply() -> None:
+            permission_ids = self._group_permissions.get(group_id)
+            if permission_ids is not None:
+                self._group_permissions[group_id] = (permission_ids | added) - removed
+
+        apply()
+        self.invalidations += 1
+        self._replay_after_commit(apply)
+
+    def invalidate_users(self, users: Iterable[Any]) -> None:
+        """
+        Removes the memberships of the given users from the cache.
+
+        Args:
+            users (Iterable[Any]): User instances or user ids.
+        """
+        user_ids = _get_ids(users)
+
+        def apply() -> None:
+            for user_id in user_ids:
+                self._user_groups.pop(user_id, None)
+
+        apply()
+        self.invalidations += 1
+        self._replay_after_commit(apply)
+
+    def invalidate_groups(self, groups: Iterable[Any]) -> None:
+        """
+        Removes the permissions of the given groups and the names resolving to them
+        from the cache, so that a renamed or deleted group is looked up again.
+
+        Args:
+            groups (Iterable[Any]): Group instances or group ids.
+        """
+        group_ids = _get_ids(groups)
+
+        def apply() -> None:
+            for group_id in group_ids:
+                self._group_permissions.pop(group_id, None)
+            for name, group_id in list(self._group_names.items()):
+                if group_id in group_ids:
+                    del self._group_names[name]
+
+        apply()
+        self.invalidations += 1
+        self._replay_after_commit(apply)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+
+        def apply() -> None:
+            self._user_groups.clear()
+            self._group_permissions.clear()
+            self._group_names.clear()
+
+        apply()
+        self.invalidations += 1
+        self._replay_after_commit(apply)
+
+
+@lru_cache
+def get_group_cache() -> GroupCache:
+    """
+    Returns the process-wide group cache.
+
+    The cache is created on first use with the `group_cache_maxsize` value of the
+    `EdgyGuardianConfig`.
+
+    Returns:
+        GroupCache: The group cache.
+    """
+    from edgy.conf import settings
+
+    return GroupCache(maxsize=settings.edgy_guardian.group_cache_maxsize)
+
+
+def is_group_cache_enabled() -> bool:
+    """
+    Returns True if the `group_cache` is enabled in the `EdgyGuardianConfig`.
+    """
+    from edgy.conf import settings
+
+    return bool(getattr(settings.edgy_guardian, "group_cache", False))
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any
+
+from edgy_guardian.cache.decisions import get_decision_cache
+from edgy_guardian.cache.groups import get_group_cache
+from edgy_guardian.enums import UserGroup
+from edgy_guardian.utils import get_content_type_model, get_groups_model, get_permission_model
+
+logger = logging.getLogger(__name__)
+
+SIGNALS = ("post_save", "post_update", "post_delete")
+
+_muted: ContextVar[bool] = ContextVar("edgy_guardian_signals_muted", default=False)
+
+
+@contextmanager
+def mute_signals() -> Iterator[None]:
+    """
+    Makes the signal receivers ignore the writes made in the current context.
+
+    The guardian write paths invalidate exactly what they change, the receivers are
+    only needed for the writes made behind their back.
+    """
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
+
+
+def _get_id(obj: Any) -> Any:
+    return getattr(obj, "id", obj)
+
+
+class SignalInvalidator:
+    """
+    Invalidates the guardian caches when the guardian models are written directly
+    with Edgy, for instance from an admin or a data migration.
+
+    The receivers listen to `post_save`, `post_update` and `post_delete` of the
+    permission, group and content type models and of their through models, and only
+    record what has to be invalidated. The invalidation runs once per event loop
+    tick, so a loop writing ten thousand rows results in a single pass over the caches.
+
+    Inserting permissions, groups or content types does not invalidate anything,
+    as no cache can hold a row that did not exist.
+    """
+
+    def __init__(self) -> None:
+        self.decision_users: set[Any] = set()
+        self.group_users: set[Any] = set()
+        self.groups: set[Any] = set()
+        self.to_clear: set[str] = set()
+        self.passes = 0
+        self._task: asyncio.Task | None = None
+        self._receivers: list[tuple[Any, Callable[..., Any], type]] = []
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self._receivers)
+
+    @property
+    def is_pending(self) -> bool:
+        return bool(self.decision_users or self.group_users or self.groups or self.to_clear)
+
+    def connect(self) -> None:
+        """
+        Connects the receivers to the signals of the configured models. Connecting
+        twice does nothing.
+        """
+        if self._receivers:
+            return
+
+        permission_model = get_permission_model()
+        group_model = get_groups_model()
+        receivers = {
+            permission_model: self._on_permission_change,
+            group_model: self._on_group_change,
+            get_content_type_model(): self._on_content_type_change,
+            permission_model.meta.fields[UserGroup.USER].through: self._on_user_permission_change,
+            group_model.meta.fields[UserGroup.USER].through: self._on_membership_change,
+            group_model.meta.fields[UserGroup.PERMISSIONS].through: self._on_group_permission_change,
+        }
+
+        for model, receiver in receivers.items():
+            for name in SIGNALS:
+                signal = getattr(model.meta.signals, name)
+                signal.connect(receiver, sender=model, weak=False)
+                self._receivers.append((signal, receiver, model))
+
+    def disconnect(self) -> None:
+        """
+        Disconnects the receivers and drops what was not invalidated yet.
+        """
+        for signal, receiver, model in self._receivers:
+            signal.disconnect(receiver, sender=model)
+        self._receivers.clear()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drops what was not invalidated yet.
+        """
+        self.decision_users.clear()
+        self.group_users.clear()
+        self.groups.clear()
+        self.to_clear.clear()
+        self._task = None
+
+    def _schedule(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            # Whatever is recorded while a pass runs is handled by the next one
+            while self.is_pending:
+                await self.flush()
+        except Exception:  # noqa
+            logger.exception("Error invalidating the guardian caches.")
+
+    async def wait(self) -> None:
+        """
+        Waits until the scheduled invalidation, if any, is done.
+        """
+        if self._task is not None and self._task.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(self._task)
+
+    async def flush(self) -> None:
+        """
+        Applies the pending invalidations now.
+        """
+        from edgy_guardian.cache.coherence import bump_generation, is_generation_tracking_enabled
+        from edgy_guardian.content_types.registry import get_content_type_registry
+        from edgy_guardian.permissions.catalog import get_permission_catalog
+
+        clear, self.to_clear = self.to_clear, set()
+        decision_users, self.decision_users = self.decision_users, set()
+        group_users, self.group_users = self.group_users, set()
+        groups, self.groups = self.groups, set()
+
+        if "content_types" in clear:
+            get_content_type_registry().refresh(await get_content_type_model().guardian.all())
+        if "catalog" in clear:
+            get_permission_catalog().clear()
+
+        if "decisions" in clear:
+            await get_decision_cache().clear()
+        elif decision_users:
+            await get_decision_cache().invalidate_users(decision_users)
+
+        group_cache = get_group_cache()
+        if "groups" in clear:
+            group_cache.clear()
+        else:
+            if group_users:
+                group_cache.invalidate_users(group_users)
+            if groups:
+                group_cache.invalidate_groups(groups)
+
+        if is_generation_tracking_enabled() and (decision_users or group_users or groups):
+            # Lets the other processes drop the same entries
+            await bump_generation(users=decision_users | group_users, groups=groups)
+
+        self.passes += 1
+
+    def _record(self, clear: tuple[str, ...] = (), **kwargs: Any) -> None:
+        self.to_clear.update(clear)
+        for name, value in kwargs.items():
+            getattr(self, name).add(_get_id(value))
+        self._schedule()
+
+    async def _on_permission_change(self, sender: Any, is_update: Any = None, **kwargs: Any) -> None:
+        if _muted.get() or is_update is False:
+            return
+        self._record(clear=("catalog", "decisions", "groups"))
+
+    async def _on_content_type_change(
+        self, sender: Any, is_update: Any = None, **kwargs: Any
+    ) -> None:
+        if _muted.get() or is_update is False:
+            return
+        self._record(clear=("content_types", "catalog", "decisions", "groups"))
+
+    async def _on_group_change(self, sender: Any, is_update: Any = None, **kwargs: Any) -> None:
+        if _muted.get() or is_update is False:
+            return
+        self._record(clear=("groups",))
+
+    async def _on_user_permission_change(
+        self, sender: Any, model_instance: Any = None, **kwargs: Any
+    ) -> None:
+        if _muted.get():
+            return
+        if model_instance is None:
+            # A queryset write, the affected rows are unknown
+            self._record(clear=("decisions",))
+        else:
+            field = get_permission_model().meta.fields[UserGroup.USER]
+            self._record(decision_users=getattr(model_instance, field.to_foreign_key))
+
+    async def _on_membership_change(
+        self, sender: Any, model_instance: Any = None, **kwargs: Any
+    ) -> None:
+        if _muted.get():
+            return
+        if model_instance is None:
+            self._record(clear=("groups",))
+        else:
+            field = get_groups_model().meta.fields[UserGroup.USER]
+            self._record(group_users=getattr(model_instance, field.to_foreign_key))
+
+    async def _on_group_permission_change(
+        self, sender: Any, model_instance: Any = None, **kwargs: Any
+    ) -> None:
+        if _muted.get():
+            return
+        if model_instance is None:
+            self._record(clear=("groups",))
+        else:
+            field = get_groups_model().meta.fields[UserGroup.PERMISSIONS]
+            self._record(groups=getattr(model_instance, field.from_foreign_key))
+
+
+@lru_cache
+def get_signal_invalidator() -> SignalInvalidator:
+    """
+    Returns the process-wide signal invalidator.
+
+    Returns:
+        SignalInvalidator: The signal invalidator.
+    """
+    return SignalInvalidator()
@@ -0,0 +1,130 @@
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from edgy_guardian._internal._commit import in_transaction
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates identical lookups running at the same time.
+
+    The first caller of a key runs the lookup in its own task, on the database
+    connection of that task, while the callers arriving before it finishes wait on
+    the same future and get the same result, or the same exception. Nothing is
+    kept once the lookup finished, this is not a cache.
+
+    A caller inside a transaction of the `database` of the lookup could see its own
+    uncommitted writes, so it neither starts a shared flight nor joins one and runs
+    its lookup alone. The callers storing the result in a cache put the invalidation
+    counter of that cache in the key, so that a lookup started after a write never
+    joins one started before it.
+
+    If the first caller is cancelled, one of the waiting callers runs the lookup
+    again instead.
+
+    Attributes:
+        calls (Counter[str]): The number of lookups run, by name.
+        saved (Counter[str]): The number of lookups saved, by name.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.saved: Counter[str] = Counter()
+        self._flights: dict[tuple[str, Hashable], asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(
+        self,
+        name: str,
+        key: Hashable,
+        lookup: Callable[[], Awaitable[T]],
+        database: Any = None,
+    ) -> T:
+        """
+        Runs `lookup`, unless an identical one is already running, in which case its
+        result is awaited instead.
+
+        Args:
+            name (str): The name of the lookup, used for the counters.
+            key (Hashable): What identifies the lookup, for instance its arguments.
+            lookup (Callable[[], Awaitable[T]]): Runs the lookup.
+            database (Any): The database the lookup runs on. The lookup is not shared
+                when the current task is inside one of its transactions.
+
+        Returns:
+            T: The result of the lookup.
+        """
+        if database is not None and in_transaction(database):
+            self.calls[name] += 1
+            return await lookup()
+
+        flight_key = (name, key)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            future = self._flights.get(flight_key)
+            if future is None or future.get_loop() is not loop:
+                break
+
+            self.saved[name] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    # The waiting caller itself was cancelled
+                    raise
+                self.saved[name] -= 1
+
+        future = loop.create_future()
+        self._flights[flight_key] = future
+        self.calls[name] += 1
+        try:
+            result = await lookup()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody might be waiting, avoid the "exception was never retrieved" warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._flights.get(flight_key) is future:
+                del self._flights[flight_key]
+
+    def reset(self) -> None:
+        """
+        Resets the counters.
+        """
+        self.calls.clear()
+        self.saved.clear()
+
+
+@lru_cache
+def get_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide single-flight.
+
+    Returns:
+        SingleFlight: The single-flight.
+    """
+    return SingleFlight()
+
+
+def is_single_flight_enabled() -> bool:
+    """
+    Returns True if `single_flight` is enabled in the `EdgyGuardianConfig`.
+    """
+    from edgy.conf import settings
+
+    return bool(getattr(settings.edgy_guardian, "single_flight", False))
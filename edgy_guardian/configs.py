@@ -43,6 +43,84 @@ class EdgyGuardianConfig(BaseModel):
     """
     The content type model class. This should be a string that represents the content type model class location.
     """
+    decision_cache: bool = False
+    """
+    Enables the cache for the `has_user_perm` decisions. The cache lives in the memory of
+    each process unless a shared `cache_backend` is configured.
+    """
+    decision_cache_maxsize: int = 10_000
+    """
+    The maximum number of decisions kept by the default, in-process, cache backend.
+    """
+    decision_cache_ttl: float | None = 60.0
+    """
+    The number of seconds a cached decision is valid for. `None` disables the expiration.
+    """
+    cache_backend: str | None = None
+    """
+    The dotted path of the cache backend class storing the cached decisions, for instance
+    `edgy_guardian.cache.backends.RedisCacheBackend`. Defaults to an in-process LRU.
+    """
+    cache_backend_options: dict[str, Any] = {}
+    """
+    The keyword arguments used to create the cache backend.
+    """
+    group_cache: bool = False
+    """
+    Enables the process-local cache of the group memberships and group permissions
+    used by `has_group_permission`.
+    """
+    group_cache_maxsize: int = 10_000
+    """
+    The maximum number of users, groups and group names each kept by the group cache,
+    in the memory of each process. The least recently used entries are evicted first.
+    """
+    permission_catalog_maxsize: int = 10_000
+    """
+    The maximum number of permission rows kept by the process-local permission catalog.
+    The least recently used permissions are evicted first. The content type registry
+    is process-local as well and holds one entry per model, so it is not bounded.
+    """
+    generation_model: str | None = None
+    """
+    The generation model class used to keep the caches of several processes coherent.
+    When `None`, the caches are only invalidated by the writes of the current process.
+    """
+    generation_sync_interval: float = 1.0
+    """
+    The minimum number of seconds between two automatic reads of the generation table
+    done by the cached permission checks.
+    """
+    changelog_model: str | None = None
+    """
+    The changelog model class where every grant, revoke and group membership change is
+    appended. When `None`, no changelog is written.
+    """
+    changelog_sync_interval: float = 1.0
+    """
+    The minimum number of seconds between two automatic reads of the changelog done by
+    the cached permission checks.
+    """
+    changelog_gap_timeout: float = 10.0
+    """
+    The number of seconds a gap in the changelog sequences is waited for. A change can
+    be committed after a change with a higher sequence, the followers read the changes
+    after a gap again until it is filled or older than this timeout.
+    """
+    coalesce_checks: bool = False
+    """
+    Coalesces the concurrent `has_user_perm` and `has_group_permission` checks issued in
+    the same event loop tick into a single query.
+    """
+    coalesce_batch_size: int = 100
+    """
+    The maximum number of checks resolved by a single coalesced query.
+    """
+    single_flight: bool = False
+    """
+    Makes identical concurrent permission checks and content type lookups share a
+    single query.
+    """
 
     @model_validator(mode="after")
     def validate_models(self) -> Any:
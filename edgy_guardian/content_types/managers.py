@@ -1,25 +1,46 @@
+from collections.abc import Iterable
+from functools import partial
 from typing import Any, cast
 
 import edgy
 
+from edgy_guardian.cache.singleflight import get_single_flight, is_single_flight_enabled
+from edgy_guardian.content_types.registry import ContentTypeRegistry, get_content_type_registry
+from edgy_guardian.content_types.utils import get_model_name
+
 
 class ContentTypeManager(edgy.Manager):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        self._cache: dict[Any, Any] = {}
+    @property
+    def _cache(self) -> ContentTypeRegistry:
+        """
+        The content types cache, shared with the process-wide content type registry
+        and indexed by id, by `(app_label, model)` and by model class.
+        """
+        return get_content_type_registry()
 
     async def get_for_model(self, model: str | type[edgy.Model]) -> type[edgy.Model]:
         """
-        Retrieve the ContentType instance for the given model name.
+        Retrieve the ContentType instance for the given model.
+
+        The content type is served from the cache and only queried on a miss. With
+        `single_flight`, concurrent misses of the same model share a single query.
 
         Args:
-            model (str): The model name.
+            model (str | type[edgy.Model]): The model name, class or instance.
         Returns:
             ContentType: The ContentType instance.
         """
-        if isinstance(model, edgy.Model):
-            return cast(type[edgy.Model], await self.get(model=model.meta.tablename))  # type: ignore
-        return cast(type[edgy.Model], await self.get(model=model))
+        ctype = self._cache.get_for_model(model)
+        if ctype is None:
+            name = get_model_name(model)
+            if is_single_flight_enabled():
+                ctype = await get_single_flight().do(
+                    "get_for_model", name, partial(self.get, model=name), self.model_class.database
+                )
+            else:
+                ctype = await self.get(model=name)
+            self._add_to_cache(ctype)
+        return cast(type[edgy.Model], ctype)
 
     async def get_for_id(self, id: Any) -> Any:
         """
@@ -33,35 +54,90 @@ class ContentTypeManager(edgy.Manager):
         Returns:
             Any: The content type associated with the given ID.
         """
-
-        try:
-            ctype = self._cache[id][id]
-        except KeyError:
+        ctype = self._cache.get_for_id(id)
+        if ctype is None:
             ctype = await self.get(pk=id)
-            self._add_to_cache(ctype.id, ctype)
+            self._add_to_cache(ctype)
         return ctype
 
+    async def get_for_ids(self, ids: Iterable[Any]) -> dict[Any, Any]:
+        """
+        Retrieves the content types for all the given IDs.
+
+        The cache misses are resolved with a single `IN` query, which makes this
+        method suitable to resolve generic relations over many rows.
+
+        Args:
+            ids (Iterable[Any]): The IDs of the content types to retrieve.
+        Returns:
+            dict[Any, Any]: The content types by ID. Unknown IDs are not included.
+        """
+        ctypes: dict[Any, Any] = {}
+        missing: set[Any] = set()
+
+        for id in ids:
+            ctype = self._cache.get_for_id(id)
+            if ctype is None:
+                missing.add(id)
+            else:
+                ctypes[id] = ctype
+
+        if missing:
+            for ctype in await self.filter(id__in=list(missing)):
+                self._add_to_cache(ctype)
+                ctypes[ctype.id] = ctype
+        return ctypes
+
+    async def get_for_models(self, models: Iterable[Any]) -> dict[Any, Any]:
+        """
+        Retrieves the content types for all the given models.
+
+        The cache misses are resolved with a single `IN` query.
+
+        Args:
+            models (Iterable[Any]): Model names, classes or instances.
+        Returns:
+            dict[Any, Any]: The content types by model class (or by name when a name
+                was given). Unknown models are not included.
+        """
+        ctypes: dict[Any, Any] = {}
+        missing: dict[str, set[Any]] = {}
+
+        for model in models:
+            key = model if isinstance(model, (str, type)) else type(model)
+            if key in ctypes:
+                continue
+
+            ctype = self._cache.get_for_model(model)
+            if ctype is None:
+                missing.setdefault(get_model_name(model), set()).add(key)
+            else:
+                ctypes[key] = ctype
+
+        if missing:
+            for ctype in await self.filter(model__in=list(missing)):
+                self._add_to_cache(ctype)
+                for key in missing[ctype.model]:
+                    ctypes[key] = ctype
+        return ctypes
+
     def clear_cache(self) -> None:
         """
-        Clears the cache by removing all items from the internal cache dictionary.
+        Clears the cache by removing all the content types from it.
         This method is used to reset the cache, ensuring that any previously stored
         data is removed and the cache is empty.
         """
         self._cache.clear()
 
-    def _add_to_cache(self, key: Any, ctype: Any) -> None:
+    def _add_to_cache(self, ctype: Any) -> None:
         """
         Adds a content type object to the cache.
-        This method stores the given content type object in the cache, indexed by both
-        its (app_label, model) tuple and its ID.
+        This method stores the given content type object in the cache, indexed by
+        its ID, its (app_label, model) tuple and its model class.
 
         Args:
-            using (Any): The database alias being used.
             ctype (Any): The content type object to be cached.
         Returns:
             None
         """
-        base = key
-        key = (ctype.app_label, ctype.model)
-        self._cache.setdefault(base, {})[key] = ctype
-        self._cache.setdefault(base, {})[ctype.id] = ctype
+        self._cache.add(ctype)
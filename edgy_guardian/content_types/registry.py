@@ -0,0 +1,114 @@
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+import edgy
+
+from edgy_guardian.exceptions import GuardianImproperlyConfigured
+
+
+class ContentTypeRegistry:
+    """
+    An in-memory map of the content types of the application.
+
+    The content types only change when `handle_content_types` runs, which makes
+    them safe to keep in memory for the whole life of the process. The registry
+    indexes every content type by its id, by its `(app_label, model)` natural key,
+    by its model name and by the model class it represents.
+
+    The registry is local to the process. It holds one content type per model, so
+    unlike the other process-local caches it is not bounded.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: dict[Any, edgy.Model] = {}
+        self._by_natural_key: dict[tuple[str, str], edgy.Model] = {}
+        self._by_name: dict[str, edgy.Model] = {}
+        self._by_model: dict[type[edgy.Model], edgy.Model] = {}
+        self.is_ready = False
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add(self, ctype: edgy.Model) -> None:
+        """
+        Adds a content type to the registry.
+
+        Args:
+            ctype (edgy.Model): The content type instance.
+        """
+        self._by_id[ctype.id] = ctype
+        self._by_natural_key[(ctype.app_label, ctype.model)] = ctype
+        self._by_name.setdefault(ctype.model, ctype)
+
+        try:
+            model_class = ctype.model_class()
+        except (GuardianImproperlyConfigured, KeyError):
+            model_class = None
+
+        if model_class is not None:
+            self._by_model[model_class] = ctype
+
+    def refresh(self, ctypes: Iterable[edgy.Model]) -> None:
+        """
+        Replaces the content of the registry with the given content types.
+
+        Args:
+            ctypes (Iterable[edgy.Model]): All the content types of the application.
+        """
+        self.clear()
+        for ctype in ctypes:
+            self.add(ctype)
+        self.is_ready = True
+
+    def clear(self) -> None:
+        """
+        Removes all the content types from the registry.
+        """
+        self._by_id.clear()
+        self._by_natural_key.clear()
+        self._by_name.clear()
+        self._by_model.clear()
+        self.is_ready = False
+
+    def get_for_model(self, model: Any) -> edgy.Model | None:
+        """
+        Returns the content type of a model.
+
+        Args:
+            model (Any): A model instance, a model class or the model name.
+
+        Returns:
+            edgy.Model | None: The content type or None if it is not registered.
+        """
+        if isinstance(model, str):
+            return self._by_name.get(model)
+
+        model_class = model if isinstance(model, type) else type(model)
+        ctype = self._by_model.get(model_class)
+        if ctype is None:
+            ctype = self._by_name.get(model.meta.tablename)
+        return ctype
+
+    def get_for_id(self, id: Any) -> edgy.Model | None:
+        """
+        Returns the content type with the given id.
+        """
+        return self._by_id.get(id)
+
+    def get_by_natural_key(self, app_label: str, model: str) -> edgy.Model | None:
+        """
+        Returns the content type with the given `(app_label, model)`.
+        """
+        return self._by_natural_key.get((app_label, model))
+
+
+@lru_cache
+def get_content_type_registry() -> ContentTypeRegistry:
+    """
+    Returns the process-wide content type registry.
+
+    Returns:
+        ContentTypeRegistry: The content type registry.
+    """
+    return ContentTypeRegistry()
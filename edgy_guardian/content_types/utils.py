@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from typing import Any, cast
 
 import edgy
@@ -5,10 +6,33 @@ import edgy
 from edgy_guardian.utils import get_content_type_model
 
 
+def get_model_name(model: Any) -> str:
+    """
+    Returns the name used by the content types for the given model.
+
+    Parameters
+    ----------
+    model : Any
+        A model instance, a model class or the model name.
+
+    Returns
+    -------
+    str
+        The model name, this is, the table name of the model.
+    """
+    if isinstance(model, str):
+        return model
+    return str(model.meta.tablename)
+
+
 async def get_content_type(obj: Any) -> type[edgy.Model]:
     """
     Returns the default content type for the given object.
 
+    The content type is served from the in-memory content type registry, filled
+    by `handle_content_types`, and only queried from the database when the object
+    is not registered.
+
     Parameters
     ----------
     obj : Any
@@ -20,3 +44,33 @@ async def get_content_type(obj: Any) -> type[edgy.Model]:
         The content type of the object.
     """
     return cast(type[edgy.Model], await get_content_type_model().guardian.get_for_model(obj))
+
+
+async def get_content_types(objs: Iterable[Any]) -> list[type[edgy.Model]]:
+    """
+    Returns the content type of each of the given objects, in order.
+
+    The content types are resolved at once, with a single query for the ones that
+    are not in the content type registry.
+
+    Parameters
+    ----------
+    objs : Iterable[Any]
+        Model instances, model classes or model names, of any models.
+
+    Returns
+    -------
+    list[ContentType]
+        The content type of each object.
+    """
+    objs = list(objs)
+    ctypes = await get_content_type_model().guardian.get_for_models(objs)
+
+    result = []
+    for obj in objs:
+        ctype = ctypes.get(obj if isinstance(obj, (str, type)) else type(obj))
+        if ctype is None:
+            # Unknown models fail the same way as with `get_content_type`
+            ctype = await get_content_type(obj)
+        result.append(ctype)
+    return result
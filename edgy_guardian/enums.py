@@ -24,3 +24,26 @@ class UserGroup(str, Enum):
 
     def __repr__(self) -> str:
         return str(self)
+
+
+class ChangeAction(str, Enum):
+    ADD = "add"
+    REMOVE = "remove"
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class ChangeRelation(str, Enum):
+    USER_PERMISSION = "user_permission"
+    GROUP_PERMISSION = "group_permission"
+    GROUP_MEMBERSHIP = "group_membership"
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return str(self)
@@ -1 +1,7 @@
 class GuardianImproperlyConfigured(Exception): ...
+
+
+class ChangelogTruncated(Exception): ...
+
+
+class CacheBackendError(Exception): ...
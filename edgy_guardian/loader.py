@@ -3,7 +3,17 @@ from typing import TYPE_CHECKING, Any
 
 from edgy.conf import settings
 
+from edgy_guardian.cache import (
+    get_changelog_follower,
+    get_decision_cache,
+    get_generation_tracker,
+    get_group_cache,
+    get_signal_invalidator,
+    mute_signals,
+)
+from edgy_guardian.content_types.registry import get_content_type_registry
 from edgy_guardian.exceptions import GuardianImproperlyConfigured
+from edgy_guardian.permissions.catalog import get_permission_catalog
 from edgy_guardian.utils import get_content_type_model
 
 if TYPE_CHECKING:
@@ -24,6 +34,10 @@ async def handle_content_types() -> None:
     involves content types or permissions.
 
     Usually, using a lifespan event is the best way to run this function.
+
+    Once the content types are synchronized, they are loaded into the in-memory
+    content type registry so the permission checks do not need to query them, and the
+    guardian caches start listening to the signals of the guardian models.
     """
     from edgy_guardian.apps import get_apps
 
@@ -55,12 +69,24 @@ async def handle_content_types() -> None:
                 models.add(model_class.meta.tablename)
                 new_apps[name].append(model_class.meta.tablename)
 
-    for name, models in deleted_apps.items():
-        for model in models:
-            await get_content_type_model().guardian.filter(app_label=name, model=model).delete()
+    # Everything derived from the content types is refreshed below at once
+    with mute_signals():
+        for name, models in deleted_apps.items():
+            for model in models:
+                await get_content_type_model().guardian.filter(app_label=name, model=model).delete()
+
+        for name, models in new_apps.items():
+            for model in models:
+                await get_content_type_model().guardian.get_or_create(app_label=name, model=model)
 
-    for name, models in new_apps.items():
-        for model in models:
-            await get_content_type_model().guardian.get_or_create(app_label=name, model=model)
+    # Refresh the in-memory content types and anything derived from their ids
+    get_content_type_registry().refresh(await get_content_type_model().guardian.all())
+    await get_decision_cache().clear()
+    get_permission_catalog().clear()
+    get_group_cache().clear()
+    get_generation_tracker().reset()
+    get_changelog_follower().reset()
+    get_signal_invalidator().reset()
+    get_signal_invalidator().connect()
 
     logger.info("Content types have been successfully managed.")
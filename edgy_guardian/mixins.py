@@ -1,13 +1,22 @@
+from collections.abc import Iterable
 from typing import Any, cast
 
 import edgy
+from edgy import QuerySet
 
+from edgy_guardian.permissions.snapshots import ObjectPermissions, PermissionSnapshot
 from edgy_guardian.shortcuts import (
+    annotate_perms,
     assign_group_perm,
     assign_perm,
+    filter_permitted,
     get_obj_perms,
+    get_objects_for_user,
+    get_permission_snapshot,
     has_group_permission,
     has_user_perm,
+    has_user_perms,
+    prefetch_obj_perms,
     remove_group_perm,
     remove_perm,
 )
@@ -20,20 +29,106 @@ class UserMixin:
     This mixin can be added as an extension to the User model to provide
     methods for assigning and checking permissions for a user.
     """
-    async def obj_perms(self, obj: type[edgy.Model], **filters: Any) -> list[type[edgy.Model]]:
+    async def obj_perms(
+        self, obj: type[edgy.Model], include_groups: bool = False, **filters: Any
+    ) -> list[type[edgy.Model]]:
         """
         Return all permission instances of this type that `user` has on `obj`.
 
         Args:
             obj (edgy.Model): the object to check permissions against.
+            include_groups (bool): whether the permissions of the groups of the user are listed too.
             **filters: extra lookup args (e.g. codename__iexact="change_stuff").
 
         Returns:
             List[BasePermission]: all matching permission records.
         """
-        return await get_obj_perms(cast(type[edgy.Model], self), obj, **filters)
+        return await get_obj_perms(
+            cast(type[edgy.Model], self), obj, include_groups=include_groups, **filters
+        )
+
+    async def prefetch_obj_perms(self, objs: Iterable[Any]) -> ObjectPermissions:
+        """
+        Return the codenames the user holds on every object of `objs`, with a single
+        permission query.
+
+        Args:
+            objs (Iterable[Any]): the objects, of any models.
+
+        Returns:
+            ObjectPermissions: a mapping from each object to its set of codenames.
+        """
+        return await prefetch_obj_perms(cast(type[edgy.Model], self), objs)
+
+    async def filter_permitted(self, perm: str, objs: Iterable[Any]) -> list[Any]:
+        """
+        Return only the objects of `objs` on which the user has `perm`.
+
+        Args:
+            perm (str): the permission to check.
+            objs (Iterable[Any]): the objects, of any models.
+
+        Returns:
+            list[Any]: the permitted objects, in their original order.
+        """
+        return await filter_permitted(cast(type[edgy.Model], self), perm, objs)
 
-    async def has_perm(self, perm: str, obj: Any) -> bool:
+    def objects_with_perm(self, perm: str, model: type[edgy.Model] | QuerySet) -> QuerySet:
+        """
+        Return a lazy queryset of the objects of `model` on which the user has `perm`.
+
+        Args:
+            perm (str): the permission to check.
+            model (type[edgy.Model] | QuerySet): the model, or a queryset of it.
+
+        Returns:
+            QuerySet: the queryset of the permitted objects.
+
+        Example:
+            >>> items = await user.objects_with_perm('edit', Item).order_by('name')
+        """
+        return get_objects_for_user(cast(type[edgy.Model], self), perm, model)
+
+    def annotate_perms(
+        self, codenames: Iterable[str], model: type[edgy.Model] | QuerySet
+    ) -> QuerySet:
+        """
+        Return a lazy queryset of `model` with a `can_<codename>` flag per codename.
+
+        Args:
+            codenames (Iterable[str]): the permission codenames to flag.
+            model (type[edgy.Model] | QuerySet): the model, or a queryset of it.
+
+        Returns:
+            QuerySet: the annotated queryset.
+
+        Example:
+            >>> items = await user.annotate_perms(['edit', 'delete'], Item)
+            >>> items[0].can_edit
+            True
+        """
+        return annotate_perms(cast(type[edgy.Model], self), codenames, model)
+
+    async def permission_snapshot(self) -> PermissionSnapshot:
+        """
+        Load all the permissions of the user into an immutable snapshot.
+
+        The snapshot is loaded with a single query and answers the checks
+        synchronously, which makes it ideal to be created once per request.
+
+        Returns:
+            PermissionSnapshot: the snapshot of the permissions of the user.
+
+        Example:
+            >>> snapshot = await user.permission_snapshot()
+            >>> snapshot.has_perm('edit', some_object)
+            True
+            >>> snapshot.perms_for(some_object)
+            [<Permission: items | Edit>]
+        """
+        return await get_permission_snapshot(cast(type[edgy.Model], self))
+
+    async def has_perm(self, perm: str, obj: Any, include_groups: bool = False) -> bool:
         """
         Check if the user has the given permission on the given object.
 
@@ -43,6 +138,7 @@ class UserMixin:
         Args:
             perm (str): The permission to check.
             obj (Any): The object to check the permission on.
+            include_groups (bool): Whether the permission may also come from one of the groups of the user.
 
         Returns:
             bool: True if the user has the permission, False otherwise.
@@ -54,7 +150,25 @@ class UserMixin:
             >>> else:
             >>>     print("User does not have permission to edit the object.")
         """
-        return await has_user_perm(cast(type[edgy.Model], self), perm, obj)
+        return await has_user_perm(
+            cast(type[edgy.Model], self), perm, obj, include_groups=include_groups
+        )
+
+    async def has_perms(self, checks: Iterable[tuple[str, Any]]) -> list[bool]:
+        """
+        Check many `(perm, obj)` pairs for the user with a single query.
+
+        Args:
+            checks (Iterable[tuple[str, Any]]): The `(perm, obj)` pairs to check.
+
+        Returns:
+            list[bool]: The decisions, in the order of `checks`.
+
+        Example:
+            >>> await user.has_perms([('edit', item), ('view', product)])
+            [True, False]
+        """
+        return await has_user_perms(cast(type[edgy.Model], self), checks)
 
     async def assign_perm(
         self, perm: str | type[edgy.Model], obj: Any | None = None, revoke: bool = False
@@ -0,0 +1,250 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+import edgy
+
+from edgy_guardian._internal._upsert import get_or_insert
+from edgy_guardian.cache import normalize_codename
+from edgy_guardian.utils import get_permission_model
+
+CatalogKey = tuple[Any, str]
+
+
+def make_catalog_key(
+    content_type: Any, codename: str | edgy.Model | type[edgy.Model]
+) -> CatalogKey:
+    """
+    Builds the key used by the permission catalog.
+
+    Args:
+        content_type (Any): The content type instance or the content type id.
+        codename (str | edgy.Model | type[edgy.Model]): The permission codename or a
+            permission instance.
+
+    Returns:
+        CatalogKey: A `(content_type_id, codename)` tuple.
+    """
+    return (getattr(content_type, "id", content_type), normalize_codename(codename))
+
+
+class PermissionCatalog:
+    """
+    A process-wide catalog of the permission rows.
+
+    The set of codenames per model is small and stable, so once a permission row
+    is known there is no reason to query it again. The catalog maps
+    `(content_type_id, codename)` and the permission id to the permission instance
+    and only goes to the database on a real miss.
+
+    The catalog can be filled lazily, as permissions are requested, or at once
+    with `load()`, for instance in the lifespan of the application.
+
+    The catalog lives in the memory of the current process and keeps at most
+    `maxsize` permissions, evicting the least recently used ones.
+
+    Args:
+        maxsize (int): The maximum number of permissions kept in memory.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._by_key: dict[CatalogKey, edgy.Model] = {}
+        self._by_id: OrderedDict[Any, edgy.Model] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def permissions_model(self) -> type[edgy.Model]:
+        return get_permission_model()  # type: ignore
+
+    def add(self, permission: edgy.Model) -> None:
+        """
+        Adds a permission instance to the catalog.
+        """
+        self._by_key[make_catalog_key(permission.content_type, permission)] = permission
+        self._by_id[permission.id] = permission
+        self._by_id.move_to_end(permission.id)
+
+        while len(self._by_id) > self.maxsize:
+            _, evicted = self._by_id.popitem(last=False)
+            key = make_catalog_key(evicted.content_type, evicted)
+            if self._by_key.get(key) is evicted:
+                del self._by_key[key]
+
+    def discard(self, ids: Iterable[Any]) -> None:
+        """
+        Removes the permissions with the given ids from the catalog.
+        """
+        for id in ids:
+            permission = self._by_id.pop(id, None)
+            if permission is not None:
+                self._by_key.pop(make_catalog_key(permission.content_type, permission), None)
+
+    def clear(self) -> None:
+        """
+        Removes every permission from the catalog.
+        """
+        self._by_key.clear()
+        self._by_id.clear()
+
+    def get(
+        self, content_type: Any, codename: str | edgy.Model | type[edgy.Model]
+    ) -> edgy.Model | None:
+        """
+        Returns the permission for the given content type and codename, if known.
+        """
+        permission = self._by_key.get(make_catalog_key(content_type, codename))
+        if permission is not None:
+            self._by_id.move_to_end(permission.id)
+        return permission
+
+    def get_for_id(self, id: Any) -> edgy.Model | None:
+        """
+        Returns the permission with the given id, if known.
+        """
+        permission = self._by_id.get(id)
+        if permission is not None:
+            self._by_id.move_to_end(id)
+        return permission
+
+    async def get_for_ids(self, ids: Iterable[Any]) -> dict[Any, edgy.Model]:
+        """
+        Returns the permissions with the given ids, querying the unknown ones with
+        a single `IN` query.
+
+        Args:
+            ids (Iterable[Any]): The permission ids.
+
+        Returns:
+            dict[Any, edgy.Model]: The permissions by id. Unknown ids are not included.
+        """
+        permissions: dict[Any, edgy.Model] = {}
+        missing: set[Any] = set()
+
+        for id in ids:
+            permission = self.get_for_id(id)
+            if permission is None:
+                missing.add(id)
+            else:
+                permissions[id] = permission
+
+        if missing:
+            for permission in await self.permissions_model.guardian.filter(id__in=list(missing)):
+                self.add(permission)
+                permissions[permission.id] = permission
+        return permissions
+
+    async def load(self) -> None:
+        """
+        Loads every permission row into the catalog with a single query. Only the
+        last `maxsize` rows are kept.
+        """
+        self.clear()
+        for permission in await self.permissions_model.guardian.all():
+            self.add(permission)
+
+    async def get_or_create(
+        self, content_type: Any, codename: str | edgy.Model | type[edgy.Model]
+    ) -> edgy.Model:
+        """
+        Returns the permission for the given content type and codename, creating
+        the row only when it does not exist.
+
+        Args:
+            content_type (Any): The content type instance.
+            codename (str | edgy.Model | type[edgy.Model]): The permission codename or
+                a permission instance.
+
+        Returns:
+            edgy.Model: The permission instance.
+        """
+        permission = self.get(content_type, codename)
+        if permission is not None:
+            return permission
+
+        permissions = await self._get_or_insert([(content_type, normalize_codename(codename))])
+        return permissions[make_catalog_key(content_type, codename)]
+
+    async def bulk_get_or_create(
+        self,
+        content_types: Iterable[Any],
+        codenames: Iterable[str | edgy.Model],
+    ) -> list[edgy.Model]:
+        """
+        Returns the permissions for every combination of content type and codename,
+        creating the missing rows.
+
+        Known permissions are served from memory, the unknown ones are inserted, or
+        read when they exist, with `get_or_insert`.
+
+        Args:
+            content_types (Iterable[Any]): The content type instances.
+            codenames (Iterable[str | edgy.Model]): The permission codenames or
+                permission instances.
+
+        Returns:
+            list[edgy.Model]: The permission instances, one per combination.
+        """
+        content_types = list({ctype.id: ctype for ctype in content_types}.values())
+        names = list(dict.fromkeys(normalize_codename(codename) for codename in codenames))
+
+        # Kept aside, the catalog may evict them while the missing ones are added
+        permissions: dict[CatalogKey, edgy.Model] = {}
+        missing: list[tuple[Any, str]] = []
+
+        for ctype in content_types:
+            for codename in names:
+                permission = self.get(ctype, codename)
+                if permission is None:
+                    missing.append((ctype, codename))
+                else:
+                    permissions[make_catalog_key(ctype, codename)] = permission
+
+        if missing:
+            permissions.update(await self._get_or_insert(missing))
+
+        return [
+            permissions[make_catalog_key(ctype, codename)]
+            for ctype in content_types
+            for codename in names
+        ]
+
+    async def _get_or_insert(self, keys: list[tuple[Any, str]]) -> dict[CatalogKey, edgy.Model]:
+        """
+        Loads the permissions matching the given content types and codenames, inserting
+        the missing ones with a single `INSERT ... ON CONFLICT DO NOTHING` where the
+        database supports it, so concurrent creations of a codename do not conflict.
+
+        Returns:
+            dict[CatalogKey, edgy.Model]: The permissions by catalog key.
+        """
+        values = [
+            {"content_type": ctype, "codename": codename, "name": codename.capitalize()}
+            for ctype, codename in keys
+        ]
+        permissions: dict[CatalogKey, edgy.Model] = {}
+        for permission in await get_or_insert(
+            self.permissions_model, values, unique_fields=["content_type", "codename"]
+        ):
+            self.add(permission)
+            permissions[make_catalog_key(permission.content_type, permission)] = permission
+        return permissions
+
+
+@lru_cache
+def get_permission_catalog() -> PermissionCatalog:
+    """
+    Returns the process-wide permission catalog.
+
+    The catalog is created on first use with the `permission_catalog_maxsize` value of
+    the `EdgyGuardianConfig`.
+
+    Returns:
+        PermissionCatalog: The permission catalog.
+    """
+    from edgy.conf import settings
+
+    return PermissionCatalog(maxsize=settings.edgy_guardian.permission_catalog_maxsize)
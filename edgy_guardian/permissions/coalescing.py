@@ -0,0 +1,150 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, Generic, TypeVar
+
+from edgy_guardian.utils import get_groups_model, get_permission_model
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class CheckBatcher(Generic[K, V]):
+    """
+    Coalesces the checks issued in the same event loop tick into a single call of
+    `resolve`, in the style of a DataLoader.
+
+    Every check parks the calling coroutine on a future. The first check of a tick
+    schedules the dispatch right after the coroutines already scheduled in that tick
+    ran, so the checks of an `asyncio.gather` are resolved together. A batch is also
+    dispatched as soon as it reaches `max_batch_size`.
+
+    When resolving a batch fails, its keys are resolved again one by one, so a bad
+    check only fails its own caller instead of every check of the batch.
+
+    Args:
+        resolve (Callable[[list[K]], Awaitable[list[V]]]): Resolves a batch of keys,
+            returning the results in the same order.
+        max_batch_size (int): The maximum number of keys resolved at once.
+    """
+
+    def __init__(
+        self, resolve: Callable[[list[K]], Awaitable[list[V]]], max_batch_size: int = 100
+    ) -> None:
+        self.resolve = resolve
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.checks = 0
+        self._pending: list[tuple[K, asyncio.Future[V]]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def check(self, key: K) -> V:
+        """
+        Queues a key and waits for the result of its batch.
+
+        Args:
+            key (K): The key to resolve.
+
+        Returns:
+            V: The result for the key.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures are bound to the event loop that created them
+            self._loop, self._pending = loop, []
+
+        future: asyncio.Future[V] = loop.create_future()
+        self._pending.append((key, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif len(self._pending) == 1:
+            loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: list[tuple[K, asyncio.Future[V]]]) -> None:
+        self.batches += 1
+        self.checks += len(batch)
+        try:
+            results = await self.resolve([key for key, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._set_exception(batch[0][1], e)
+            else:
+                await asyncio.gather(*(self._resolve_one(key, future) for key, future in batch))
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    async def _resolve_one(self, key: K, future: asyncio.Future[V]) -> None:
+        try:
+            (result,) = await self.resolve([key])
+        except Exception as e:
+            self._set_exception(future, e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future[V], exception: Exception) -> None:
+        if not future.done():
+            future.set_exception(exception)
+
+
+async def _resolve_user_checks(checks: list[tuple[Any, Any, Any]]) -> list[bool]:
+    return await get_permission_model().has_users_permissions(checks)  # type: ignore
+
+
+async def _resolve_group_checks(checks: list[tuple[Any, Any, Any]]) -> list[bool]:
+    return await get_groups_model().has_group_permissions(checks)  # type: ignore
+
+
+@lru_cache
+def get_user_check_batcher() -> CheckBatcher[tuple[Any, Any, Any], bool]:
+    """
+    Returns the process-wide batcher of the `(user, perm, obj)` checks.
+
+    The batcher is created on first use with the `coalesce_batch_size` value of the
+    `EdgyGuardianConfig`.
+    """
+    from edgy.conf import settings
+
+    return CheckBatcher(
+        _resolve_user_checks, max_batch_size=settings.edgy_guardian.coalesce_batch_size
+    )
+
+
+@lru_cache
+def get_group_check_batcher() -> CheckBatcher[tuple[Any, Any, Any], bool]:
+    """
+    Returns the process-wide batcher of the `(user, perm, group)` checks.
+
+    The batcher is created on first use with the `coalesce_batch_size` value of the
+    `EdgyGuardianConfig`.
+    """
+    from edgy.conf import settings
+
+    return CheckBatcher(
+        _resolve_group_checks, max_batch_size=settings.edgy_guardian.coalesce_batch_size
+    )
+
+
+def is_coalescing_enabled() -> bool:
+    """
+    Returns True if `coalesce_checks` is enabled in the `EdgyGuardianConfig`.
+    """
+    from edgy.conf import settings
+
+    return bool(getattr(settings.edgy_guardian, "coalesce_checks", False))
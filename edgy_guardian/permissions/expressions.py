@@ -0,0 +1,216 @@
+from collections.abc import Iterable
+from typing import Any
+
+import edgy
+import sqlalchemy
+
+from edgy_guardian._internal._through import get_through_table
+from edgy_guardian.cache import normalize_codename
+from edgy_guardian.content_types.utils import get_model_name
+from edgy_guardian.enums import UserGroup
+from edgy_guardian.utils import get_content_type_model, get_groups_model, get_permission_model
+
+
+def content_type_id(model: Any) -> sqlalchemy.ScalarSelect:
+    """
+    Builds the subquery selecting the id of the content type of `model`, for the
+    expressions that must be built before the content type can be awaited.
+
+    Args:
+        model (Any): The model name, class or instance.
+
+    Returns:
+        sqlalchemy.ScalarSelect: The subquery, usable in place of a content type id.
+    """
+    table = get_content_type_model().table
+    return (
+        sqlalchemy.select(table.c.id)
+        .where(table.c.model == get_model_name(model))
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _permission_matches(content_type: Any, perm: str | type[edgy.Model]) -> sqlalchemy.ColumnElement[bool]:
+    """
+    Matches the permission rows of the given content type and codename, compared
+    case insensitively as in `has_user_perm`.
+    """
+    table = get_permission_model().table
+    (content_type_column,) = get_permission_model().meta.field_to_column_names["content_type"]
+    return sqlalchemy.and_(
+        table.c[content_type_column] == getattr(content_type, "id", content_type),
+        sqlalchemy.func.lower(table.c.codename) == normalize_codename(perm),
+    )
+
+
+def _user_grants() -> tuple[sqlalchemy.FromClause, sqlalchemy.Column]:
+    """
+    Joins the permissions to the users they were given to directly.
+
+    Returns:
+        tuple[sqlalchemy.FromClause, sqlalchemy.Column]: The join and its user id column.
+    """
+    permissions = get_permission_model()
+    table = permissions.table
+    users = get_through_table(permissions, UserGroup.USER.value)
+    return table.join(users.table, users.source == table.c.id), users.target
+
+
+def _group_grants() -> tuple[sqlalchemy.FromClause, sqlalchemy.Column]:
+    """
+    Joins the permissions to the members of the groups they were given to.
+
+    Returns:
+        tuple[sqlalchemy.FromClause, sqlalchemy.Column]: The join and its user id column.
+    """
+    groups = get_groups_model()
+    table = get_permission_model().table
+    members = get_through_table(groups, UserGroup.USER.value)
+    permissions = get_through_table(groups, UserGroup.PERMISSIONS.value)
+    join = members.table.join(permissions.table, permissions.source == members.source).join(
+        table, permissions.target == table.c.id
+    )
+    return join, members.target
+
+
+def _grant_exists(
+    grants: tuple[sqlalchemy.FromClause, sqlalchemy.Column],
+    user: Any,
+    content_type: Any,
+    perm: str | type[edgy.Model],
+) -> sqlalchemy.Exists:
+    join, user_column = grants
+    return sqlalchemy.exists(
+        sqlalchemy.select(sqlalchemy.literal(1))
+        .select_from(join)
+        .where(user_column == getattr(user, "id", user), _permission_matches(content_type, perm))
+    )
+
+
+def user_permission_exists(
+    user: Any, content_type: Any, perm: str | type[edgy.Model]
+) -> sqlalchemy.Exists:
+    """
+    Builds an `EXISTS` checking that the permission was given to the user directly.
+
+    Args:
+        user (Any): The user instance or the user id.
+        content_type (Any): The content type instance, id or `content_type_id` subquery.
+        perm (str | type[edgy.Model]): The permission codename or a permission instance.
+
+    Returns:
+        sqlalchemy.Exists: The expression, usable in any `WHERE` or `SELECT`.
+    """
+    return _grant_exists(_user_grants(), user, content_type, perm)
+
+
+def group_permission_exists(
+    user: Any, content_type: Any, perm: str | type[edgy.Model]
+) -> sqlalchemy.Exists:
+    """
+    Builds an `EXISTS` checking that the permission was given to a group of the user.
+
+    Args:
+        user (Any): The user instance or the user id.
+        content_type (Any): The content type instance, id or `content_type_id` subquery.
+        perm (str | type[edgy.Model]): The permission codename or a permission instance.
+
+    Returns:
+        sqlalchemy.Exists: The expression, usable in any `WHERE` or `SELECT`.
+    """
+    return _grant_exists(_group_grants(), user, content_type, perm)
+
+
+def permission_exists(
+    user: Any, content_type: Any, perm: str | type[edgy.Model], include_groups: bool = True
+) -> sqlalchemy.ColumnElement[bool]:
+    """
+    Builds the expression checking that the user holds the permission, directly
+    or, when `include_groups` is True, through one of their groups.
+
+    Guardian permissions are given per content type, so the expression does not
+    depend on the rows of the model and the database evaluates it once per query.
+
+    Args:
+        user (Any): The user instance or the user id.
+        content_type (Any): The content type instance, id or `content_type_id` subquery.
+        perm (str | type[edgy.Model]): The permission codename or a permission instance.
+        include_groups (bool): Whether the permissions of the groups of the user count.
+
+    Returns:
+        sqlalchemy.ColumnElement[bool]: The expression.
+    """
+    expression = user_permission_exists(user, content_type, perm)
+    if include_groups:
+        return sqlalchemy.or_(expression, group_permission_exists(user, content_type, perm))
+    return expression
+
+
+def permitted_user_ids(
+    content_type: Any,
+    perm: str | type[edgy.Model],
+    include_groups: bool = True,
+    user_ids: Iterable[Any] | None = None,
+) -> sqlalchemy.Select | sqlalchemy.CompoundSelect:
+    """
+    Builds the query selecting, once each, the ids of the users holding the permission,
+    directly or, when `include_groups` is True, through one of their groups.
+
+    Args:
+        content_type (Any): The content type instance, id or `content_type_id` subquery.
+        perm (str | type[edgy.Model]): The permission codename or a permission instance.
+        include_groups (bool): Whether the permissions of the groups count.
+        user_ids (Iterable[Any] | None): When given, only these users are selected.
+
+    Returns:
+        sqlalchemy.Select | sqlalchemy.CompoundSelect: The query, with a single `user_id` column.
+    """
+    grants = [_user_grants(), _group_grants()] if include_groups else [_user_grants()]
+    queries = []
+    for join, user_column in grants:
+        query = (
+            sqlalchemy.select(user_column.label("user_id"))
+            .select_from(join)
+            .where(_permission_matches(content_type, perm))
+        )
+        if user_ids is not None:
+            query = query.where(user_column.in_(list(user_ids)))
+        queries.append(query)
+
+    if len(queries) == 1:
+        return queries[0].distinct()
+    return sqlalchemy.union(*queries)
+
+
+def granted_permission_ids(user: Any, include_groups: bool = True) -> sqlalchemy.CompoundSelect | sqlalchemy.Select:
+    """
+    Builds the query selecting the ids of the permissions the user holds, directly
+    or, when `include_groups` is True, through one of their groups.
+
+    Args:
+        user (Any): The user instance or the user id.
+        include_groups (bool): Whether the permissions of the groups of the user count.
+
+    Returns:
+        sqlalchemy.CompoundSelect | sqlalchemy.Select: The query, usable with `in_`.
+    """
+    user_id = getattr(user, "id", user)
+    permissions = get_through_table(get_permission_model(), UserGroup.USER.value)
+    query = sqlalchemy.select(permissions.source).where(permissions.target == user_id)
+    if not include_groups:
+        return query
+
+    groups = get_groups_model()
+    members = get_through_table(groups, UserGroup.USER.value)
+    group_permissions = get_through_table(groups, UserGroup.PERMISSIONS.value)
+    return sqlalchemy.union(
+        query,
+        sqlalchemy.select(group_permissions.target)
+        .select_from(
+            members.table.join(
+                group_permissions.table, group_permissions.source == members.source
+            )
+        )
+        .where(members.target == user_id),
+    )
@@ -1,12 +1,44 @@
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from itertools import islice
 from typing import Any, cast
 
 import edgy
-
-from edgy_guardian.content_types.utils import get_content_type
+import sqlalchemy
+from edgy import QuerySet
+
+from edgy_guardian._internal._chunks import chunked, iterate
+from edgy_guardian._internal._keyset import iter_keyset
+from edgy_guardian.cache import (
+    bump_generation,
+    get_decision_cache,
+    get_group_cache,
+    is_decision_cache_enabled,
+    is_group_cache_enabled,
+    make_decision_key,
+    normalize_codename,
+    sync_caches,
+    write_transaction,
+)
+from edgy_guardian.content_types.utils import get_content_type, get_content_types
 from edgy_guardian.enums import UserGroup
-from edgy_guardian.exceptions import GuardianImproperlyConfigured
+from edgy_guardian.exceptions import CacheBackendError, GuardianImproperlyConfigured
+from edgy_guardian.permissions.catalog import get_permission_catalog
+from edgy_guardian.permissions.coalescing import (
+    get_group_check_batcher,
+    get_user_check_batcher,
+    is_coalescing_enabled,
+)
 from edgy_guardian.permissions.exceptions import ObjectNotPersisted
-from edgy_guardian.utils import get_groups_model, get_permission_model
+from edgy_guardian.permissions.expressions import (
+    content_type_id,
+    permission_exists,
+    permitted_user_ids,
+)
+from edgy_guardian.permissions.snapshots import ObjectPermissions, PermissionSnapshot
+from edgy_guardian.utils import get_content_type_model, get_groups_model, get_permission_model
+
+logger = logging.getLogger(__name__)
 
 
 class ManagerMixin:
@@ -154,6 +186,33 @@ class PermissionManager(edgy.Manager, ManagerMixin):
             GuardianImproperlyConfigured: If the user or group field does not exist or is not a ManyToManyField.
             ObjectNotPersisted: If the object is not persisted.
         """
+        permission, _ = await self._write_perm(perm, users, obj, revoke)
+        return permission
+
+    async def remove_perm(
+        self, perm: type[edgy.Model] | str, users: list[edgy.Model] | edgy.Model, obj: Any
+    ) -> int:
+        """
+        Revokes a permission from a user or list of users for a specific object, with
+        set-based deletes.
+
+        Returns:
+            int: The number of user permissions removed.
+        """
+        _, count = await self._write_perm(perm, users, obj, revoke=True)
+        return count
+
+    async def _write_perm(
+        self,
+        perm: type[edgy.Model] | str,
+        users: list[edgy.Model] | edgy.Model,
+        obj: Any,
+        revoke: bool,
+    ) -> tuple[type[edgy.Model], int]:
+        """
+        Assigns or revokes a permission, see `assign_perm`, and returns it with the
+        number of user permissions added or removed.
+        """
         self._check_field_exists(self.user_field, "ManyToManyField", self.permissions_model)
 
         if not isinstance(
@@ -168,9 +227,7 @@ class PermissionManager(edgy.Manager, ManagerMixin):
 
         ctype = await get_content_type(obj)
         if not isinstance(perm, self.permissions_model):
-            permission, _ = await self.get_or_create(
-                content_type=ctype, codename=perm.lower(), name=perm.capitalize()
-            )
+            permission = await get_permission_catalog().get_or_create(ctype, perm)
         else:
             permission = perm  # type: ignore
 
@@ -179,8 +236,10 @@ class PermissionManager(edgy.Manager, ManagerMixin):
             "revoke": revoke,
             "permission": permission,
         }
-        await self.permissions_model.assign_permission(**kwargs)
-        return cast(type[edgy.Model], permission)
+        async with write_transaction():
+            count = await self.permissions_model.assign_permission(**kwargs)
+            await bump_generation(users=users)
+        return cast(type[edgy.Model], permission), cast(int, count)
 
     async def assign_bulk_perm(
         self,
@@ -188,9 +247,12 @@ class PermissionManager(edgy.Manager, ManagerMixin):
         users: list[edgy.Model] | edgy.Model,
         objs: list[Any],
         revoke: bool,
-    ) -> None:
+    ) -> int:
         """
         Assigns permissions in bulk to a user or list of users.
+
+        Returns:
+            int: The number of user permissions added or removed.
         """
         self._check_field_exists(self.user_field, "ManyToManyField", self.permissions_model)
 
@@ -210,29 +272,11 @@ class PermissionManager(edgy.Manager, ManagerMixin):
         if not isinstance(objs, list):
             objs = [objs]  # type: ignore
 
-        # Pre-fetch content types for all objects to avoid multiple await calls
-        content_types = [await get_content_type(obj) for obj in objs]
-
-        # Bulk create objects
-        permissions: list[dict[str, Any]] = [
-            {"content_type": content_type, "codename": perm.lower(), "name": perm.capitalize()}
-            for content_type in content_types
-            for perm in perms
-        ]
-
-        # Bulk inserts or creates the permissions and internally Edgy does in an atomic way
-        permissions = await self.permissions_model.guardian.bulk_get_or_create(
-            permissions, unique_fields=["content_type", "codename"]
-        )
-
-        # Make sure we add all permissions to the filter
-        for perm in permissions:
-            self.permissions_model.guardian.filter(
-                codename=perm.codename, content_type=perm.content_type
-            )
+        content_types = await get_content_types(objs)
 
-        # Get all permissions that were created
-        permissions = await self.permissions_model.guardian.all()
+        # Only the permissions of the requested (content type, codename) pairs are
+        # touched, the missing ones are inserted
+        permissions = await get_permission_catalog().bulk_get_or_create(content_types, perms)
 
         # Assign permissions in bulk
         kwargs = {
@@ -240,33 +284,467 @@ class PermissionManager(edgy.Manager, ManagerMixin):
             "permissions": permissions,
             "revoke": revoke,
         }
-        await self.permissions_model.assign_bulk_permission(**kwargs)
+        async with write_transaction():
+            count = await self.permissions_model.assign_bulk_permission(**kwargs)
+            await bump_generation(users=users)
+        return cast(int, count)
 
-    async def has_user_perm(
+    async def stream_bulk_perm(
+        self,
+        triples: Iterable[tuple[Any, str, Any]] | AsyncIterable[tuple[Any, str, Any]] | None = None,
+        users: Iterable[edgy.Model] | AsyncIterable[edgy.Model] | None = None,
+        perms: Iterable[str] | AsyncIterable[str] | None = None,
+        objs: Iterable[Any] | AsyncIterable[Any] | None = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Grants permissions streamed from sync or async iterables, in chunks.
+
+        Either explicit `(user, codename, obj)` triples are given, or `users`, `perms`
+        and `objs`, in which case every user gets every permission on every object.
+        In the latter, the codenames and the content types of the objects are read
+        first and only the users are streamed, as the permissions are given per
+        content type.
+
+        Each chunk of at most `chunk_size` grants is written with multi-row inserts in
+        its own transaction, so only one chunk is held in memory and a failure only
+        rolls back the chunk being written, the previous ones stay committed.
+
+        Args:
+            triples (Iterable | AsyncIterable | None): the `(user, codename, obj)` triples.
+            users (Iterable | AsyncIterable | None): the users, without `triples`.
+            perms (Iterable | AsyncIterable | None): the codenames, without `triples`.
+            objs (Iterable | AsyncIterable | None): the objects or models, without `triples`.
+            chunk_size (int): the maximum number of grants per chunk.
+
+        Returns:
+            int: The number of user permissions added.
+
+        Raises:
+            ValueError: If both or none of `triples` and `users`, `perms`, `objs` are given.
+        """
+        if triples is not None:
+            if users is not None or perms is not None or objs is not None:
+                raise ValueError("Pass either 'triples' or 'users', 'perms' and 'objs', not both.")
+            chunks = self._chunk_triples(triples, chunk_size)
+        elif users is None or perms is None or objs is None:
+            raise ValueError("'users', 'perms' and 'objs' are required without 'triples'.")
+        else:
+            chunks = self._chunk_product(users, perms, objs, chunk_size)
+
+        database = self.permissions_model.database
+        count = 0
+        async for pairs in chunks:
+            async with database.transaction(), write_transaction():
+                count += await self.permissions_model.assign_permission_pairs(pairs)
+                await bump_generation(users=list(dict.fromkeys(user.id for _, user in pairs)))
+        return count
+
+    async def _chunk_triples(
+        self, triples: Iterable[tuple[Any, str, Any]] | AsyncIterable[tuple[Any, str, Any]], chunk_size: int
+    ) -> AsyncIterator[list[tuple[Any, Any]]]:
+        """
+        Yields the `(permission, user)` pairs of the triples, `chunk_size` at a time.
+
+        The permissions missing from the catalog are created between the chunks, outside
+        of their transactions, so a rolled back chunk leaves no stale catalog entry.
+        """
+        catalog = get_permission_catalog()
+        async for chunk in chunked(triples, chunk_size):
+            ctypes = await get_content_types(obj for _, _, obj in chunk)
+
+            missing: dict[Any, tuple[Any, set[str]]] = {}
+            for (_, perm, _), ctype in zip(chunk, ctypes, strict=True):
+                if catalog.get(ctype, perm) is None:
+                    missing.setdefault(ctype.id, (ctype, set()))[1].add(normalize_codename(perm))
+            for ctype, codenames in missing.values():
+                await catalog.bulk_get_or_create([ctype], codenames)
+
+            yield [
+                (catalog.get(ctype, perm), user)
+                for (user, perm, _), ctype in zip(chunk, ctypes, strict=True)
+            ]
+
+    async def _chunk_product(
+        self,
+        users: Iterable[edgy.Model] | AsyncIterable[edgy.Model],
+        perms: Iterable[str] | AsyncIterable[str],
+        objs: Iterable[Any] | AsyncIterable[Any],
+        chunk_size: int,
+    ) -> AsyncIterator[list[tuple[Any, Any]]]:
+        """
+        Yields the `(permission, user)` pairs giving every permission to every user,
+        streaming the users so that a chunk holds at most `chunk_size` pairs.
+        """
+        codenames = [perm async for perm in iterate(perms)]
+        content_types: dict[Any, Any] = {}
+        async for chunk in chunked(objs, chunk_size):
+            for ctype in await get_content_types(chunk):
+                content_types[ctype.id] = ctype
+
+        permissions = await get_permission_catalog().bulk_get_or_create(
+            content_types.values(), codenames
+        )
+        if not permissions:
+            return
+
+        async for chunk in chunked(users, max(1, chunk_size // len(permissions))):
+            yield [(permission, user) for user in chunk for permission in permissions]
+
+    async def _has_permission(
         self, user: edgy.Model, perm: str | type[edgy.Model], obj: Any
     ) -> bool:
         """
-        Checks if user has any permissions for given object.
+        Runs the permission check, coalesced with the concurrent ones when
+        `coalesce_checks` is enabled.
         """
+        if is_coalescing_enabled():
+            return await get_user_check_batcher().check((user, perm, obj))
         return cast(
             bool,
             await self.permissions_model.guardian.has_permission(user=user, perm=perm, obj=obj),
         )
 
-    async def get_obj_perms(self, user: edgy.Model, obj: type[edgy.Model], **filters: Any) -> list[type[edgy.Model]]:
+    async def has_user_perm(
+        self,
+        user: edgy.Model,
+        perm: str | type[edgy.Model],
+        obj: Any,
+        include_groups: bool = False,
+    ) -> bool:
+        """
+        Checks if user has any permissions for given object.
+
+        When the `decision_cache` is enabled in the settings, the decision is
+        served from the process-local cache and only computed on a miss. With a
+        `generation_model` or a `changelog_model` configured, the cache is first
+        synced with the writes of the other processes. With `coalesce_checks`, the
+        checks reaching the database are coalesced with the concurrent ones. When the
+        cache backend is unavailable, the decision is computed by the database.
+
+        With `include_groups`, the permissions given to the groups of the user count
+        too and the direct and group grants are checked together with a single query,
+        bypassing the decision cache and the coalescing.
+        """
+        if include_groups:
+            return cast(
+                bool,
+                await self.permissions_model.guardian.has_effective_permission(
+                    user=user, perm=perm, obj=obj
+                ),
+            )
+
+        if not is_decision_cache_enabled():
+            return await self._has_permission(user, perm, obj)
+
+        cache = get_decision_cache()
+        ctype = await get_content_type(obj)
+        key = make_decision_key(user, ctype, perm)
+
+        try:
+            await sync_caches()
+            decision = await cache.get(key)
+        except CacheBackendError as e:
+            logger.warning(f"The decision cache is unavailable: {e}")
+            return await self._has_permission(user, perm, obj)
+        if decision is not None:
+            return decision
+
+        # Avoid storing a decision that was invalidated while it was being computed
+        invalidations = cache.invalidations
+        decision = await self._has_permission(user, perm, obj)
+        if cache.invalidations == invalidations:
+            try:
+                await cache.set(key, decision)
+            except CacheBackendError as e:
+                logger.warning(f"The decision cache is unavailable: {e}")
+        return decision
+
+    async def has_user_perms(
+        self, user: edgy.Model, checks: Iterable[tuple[str | type[edgy.Model], Any]]
+    ) -> list[bool]:
+        """
+        Checks many `(perm, obj)` pairs, of any models, for `user` at once.
+
+        The pairs are answered with a single query. When the `decision_cache` is
+        enabled, the cached decisions are read in one go and only the misses are
+        queried, then stored. When the cache backend is unavailable, every pair is
+        queried.
+
+        Returns:
+            list[bool]: The decisions, in the order of `checks`.
+        """
+        checks = list(checks)
+        if not is_decision_cache_enabled():
+            return cast(
+                list[bool],
+                await self.permissions_model.guardian.has_permissions(user=user, checks=checks),
+            )
+
+        cache = get_decision_cache()
+        ctypes = await get_content_types(obj for _, obj in checks)
+        keys = [
+            make_decision_key(user, ctype, perm)
+            for ctype, (perm, _) in zip(ctypes, checks, strict=True)
+        ]
+
+        try:
+            await sync_caches()
+            decisions = await cache.get_many(keys)
+        except CacheBackendError as e:
+            logger.warning(f"The decision cache is unavailable: {e}")
+            decisions = {}
+        missing = {
+            key: check for key, check in zip(keys, checks, strict=True) if key not in decisions
+        }
+        if missing:
+            # Avoid storing decisions that were invalidated while they were being computed
+            invalidations = cache.invalidations
+            computed = dict(
+                zip(
+                    missing,
+                    await self.permissions_model.guardian.has_permissions(
+                        user=user, checks=list(missing.values())
+                    ),
+                    strict=True,
+                )
+            )
+            if cache.invalidations == invalidations:
+                try:
+                    await cache.set_many(computed)
+                except CacheBackendError as e:
+                    logger.warning(f"The decision cache is unavailable: {e}")
+            decisions.update(computed)
+        return [decisions[key] for key in keys]
+
+    async def get_obj_perms(
+        self, user: edgy.Model, obj: type[edgy.Model], include_groups: bool = False, **filters: Any
+    ) -> list[type[edgy.Model]]:
         """
         Return all permission instances of this type that `user` has on `obj`.
 
         Args:
             user (edgy.Model): the user whose permissions we’re querying.
             obj (edgy.Model): the object to check permissions against.
+            include_groups (bool): whether the permissions given to the groups of the
+                user are listed too, with the same single query.
             **filters: extra lookup args (e.g. codename__iexact="change_stuff").
 
         Returns:
             List[BasePermission]: all matching permission records.
         """
+        if include_groups:
+            return cast(
+                list[type[edgy.Model]],
+                await self.permissions_model.guardian.get_effective_obj_perms(user, obj, **filters),
+            )
         return cast(list[type[edgy.Model]], await self.permissions_model.guardian.get_user_obj_perms(user, obj, **filters))
 
+    async def _get_objects_codenames(
+        self, user: edgy.Model, objs: list[Any]
+    ) -> list[frozenset[str]]:
+        """
+        Returns the codenames `user` holds on each object, in order, with a single
+        permission query whatever the number of objects.
+        """
+        obj_ctypes = [ctype.id for ctype in await get_content_types(objs)]
+        codenames = await self.permissions_model.guardian.get_user_codenames(
+            user, set(obj_ctypes)
+        )
+        return [codenames[ctype_id] for ctype_id in obj_ctypes]
+
+    async def prefetch_obj_perms(self, user: edgy.Model, objs: Iterable[Any]) -> ObjectPermissions:
+        """
+        Loads the codenames `user` holds on every object of `objs`.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re loading.
+            objs (Iterable[Any]): the objects, of any models.
+
+        Returns:
+            ObjectPermissions: a mapping from each object to its set of codenames.
+        """
+        objs = list(objs)
+        return ObjectPermissions(objs, await self._get_objects_codenames(user, objs))
+
+    async def filter_permitted(
+        self, user: edgy.Model, perm: str | type[edgy.Model], objs: Iterable[Any]
+    ) -> list[Any]:
+        """
+        Returns the objects of `objs` on which `user` has `perm`, in their original order.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re checking.
+            perm (str | type[edgy.Model]): the permission codename or instance.
+            objs (Iterable[Any]): the objects, of any models.
+
+        Returns:
+            list[Any]: the permitted objects.
+        """
+        objs = list(objs)
+        codename = normalize_codename(perm)
+        codenames = await self._get_objects_codenames(user, objs)
+        return [
+            obj
+            for obj, names in zip(objs, codenames, strict=True)
+            if any(normalize_codename(name) == codename for name in names)
+        ]
+
+    def get_objects_for_user(
+        self,
+        user: edgy.Model,
+        perm: str | type[edgy.Model],
+        model: type[edgy.Model] | QuerySet,
+        include_groups: bool = True,
+    ) -> QuerySet:
+        """
+        Returns a lazy queryset of the objects of `model` on which `user` has `perm`.
+
+        The permission is checked by the database, with a subquery against the
+        permission and through tables, when the queryset is evaluated. The content type
+        of the model is selected by a subquery as well, so building the queryset does
+        not need to await anything.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re checking.
+            perm (str | type[edgy.Model]): the permission codename or instance.
+            model (type[edgy.Model] | QuerySet): the model, or a queryset of it to narrow down.
+            include_groups (bool): whether the permissions of the groups of the user count.
+
+        Returns:
+            QuerySet: the queryset, which can be further filtered, ordered and sliced.
+        """
+        queryset = model if isinstance(model, QuerySet) else model.query.all()
+        expression = permission_exists(
+            user, content_type_id(queryset.model_class), perm, include_groups=include_groups
+        )
+        return cast(QuerySet, queryset.filter(cast(sqlalchemy.BinaryExpression, expression)))
+
+    def annotate_perms(
+        self,
+        user: edgy.Model,
+        codenames: Iterable[str],
+        model: type[edgy.Model] | QuerySet,
+        include_groups: bool = True,
+    ) -> QuerySet:
+        """
+        Returns a lazy queryset of `model` where every object gets a `can_<codename>`
+        boolean attribute for each of `codenames`.
+
+        Each flag is an `EXISTS` subquery selected along the rows, so the objects and
+        their flags are loaded with a single query.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re checking.
+            codenames (Iterable[str]): the permission codenames to flag.
+            model (type[edgy.Model] | QuerySet): the model, or a queryset of it to narrow down.
+            include_groups (bool): whether the permissions of the groups of the user count.
+
+        Returns:
+            QuerySet: the annotated queryset, which can be further filtered, ordered and sliced.
+        """
+        queryset = model if isinstance(model, QuerySet) else model.query.all()
+        content_type = content_type_id(queryset.model_class)
+        flags = {
+            f"can_{codename}": permission_exists(
+                user, content_type, codename, include_groups=include_groups
+            ).label(f"can_{codename}")
+            for codename in map(normalize_codename, codenames)
+        }
+        return cast(
+            QuerySet,
+            queryset.extra_select(*flags.values()).reference_select({name: name for name in flags}),
+        )
+
+    async def users_with_perm(
+        self,
+        obj: Any,
+        perm: str | type[edgy.Model],
+        user_ids: Iterable[Any] | None = None,
+        include_groups: bool = True,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Streams, in chunks, the ids of the users holding `perm` on the content type of `obj`.
+
+        Without `user_ids`, a single query is run and read through a cursor, so only one
+        chunk is held in memory at a time. With `user_ids`, they are checked `chunk_size`
+        at a time, each chunk with one query.
+
+        Args:
+            obj (Any): the object, or its model.
+            perm (str | type[edgy.Model]): the permission codename or instance.
+            user_ids (Iterable[Any] | None): when given, only these users are considered.
+            include_groups (bool): whether the permissions of the groups of the users count.
+            chunk_size (int): the maximum number of ids per chunk.
+
+        Yields:
+            list[Any]: the ids of the permitted users, each id once.
+        """
+        ctype = await get_content_type(obj)
+        database = self.permissions_model.database
+
+        if user_ids is None:
+            query = permitted_user_ids(ctype, perm, include_groups=include_groups)
+            batches = cast(
+                AsyncIterator[list[Any]],
+                database.batched_iterate(query, batch_size=chunk_size, batch_wrapper=list),
+            )
+            async for batch in batches:
+                yield [row.user_id for row in batch]
+            return
+
+        user_ids = iter(user_ids)
+        while chunk := list(islice(user_ids, chunk_size)):
+            query = permitted_user_ids(ctype, perm, include_groups=include_groups, user_ids=chunk)
+            rows = await database.fetch_all(query)
+            if rows:
+                yield [row.user_id for row in rows]
+
+    async def iter_objects_for_user(
+        self, user: edgy.Model, include_groups: bool = True, batch_size: int = 1000
+    ) -> AsyncIterator[tuple[Any, list[Any]]]:
+        """
+        Streams the objects of every model on which `user` holds any permission.
+
+        The content types are found with one query, then the objects of each model
+        are read with keyset pagination on the primary key, so only one batch is held
+        in memory at a time. Models that are no longer registered are skipped.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re querying.
+            include_groups (bool): whether the permissions of the groups of the user count.
+            batch_size (int): the maximum number of objects per batch.
+
+        Yields:
+            tuple[Any, list[Any]]: the content type and a batch of its objects.
+        """
+        ctype_ids = await self.permissions_model.guardian.get_user_content_type_ids(
+            user, include_groups=include_groups
+        )
+        ctypes = await get_content_type_model().guardian.get_for_ids(ctype_ids)
+        for ctype_id in sorted(ctypes):
+            ctype = ctypes[ctype_id]
+            model = ctype.model_class()
+            if model is None:
+                continue
+            async for batch in iter_keyset(model.query.all(), batch_size):
+                yield ctype, batch
+
+    async def get_permission_snapshot(self, user: edgy.Model) -> PermissionSnapshot:
+        """
+        Loads all the permissions of `user` into an immutable snapshot.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re loading.
+
+        Returns:
+            PermissionSnapshot: the snapshot answering `has_perm` and `perms_for` from memory.
+        """
+        return cast(
+            PermissionSnapshot, await self.permissions_model.guardian.get_user_snapshot(user)
+        )
+
 class GroupManager(edgy.Manager, ManagerMixin):
     def __check_many_to_many_field(self, model: type[edgy.Model], field_name: str) -> None:
         """
@@ -322,9 +800,7 @@ class GroupManager(edgy.Manager, ManagerMixin):
         # Handles the content type for permissions assignment
         ctype = await get_content_type(obj)
         if not isinstance(perm, self.permissions_model):
-            permission, _ = await self.permissions_model.guardian.get_or_create(
-                content_type=ctype, codename=perm.lower(), name=perm.capitalize()
-            )
+            permission = await get_permission_catalog().get_or_create(ctype, perm)
         else:
             permission = perm  # type: ignore
 
@@ -335,15 +811,17 @@ class GroupManager(edgy.Manager, ManagerMixin):
             "group": group,
         }
 
-        # Handles the content type for group assignment
-        group_obj = await self.group_model.assign_group_perm(**group_kwargs)
-
         kwargs = {
             "users": users,
             "permission": permission,
             "revoke": revoke_users_permissions,
         }
-        await self.permissions_model.assign_permission(**kwargs)
+
+        async with write_transaction():
+            # Handles the content type for group assignment
+            group_obj = await self.group_model.assign_group_perm(**group_kwargs)
+            await self.permissions_model.assign_permission(**kwargs)
+            await bump_generation(users=users, groups=[group_obj])
         return cast(type[edgy.Model], group_obj)
 
     async def assign_bulk_group_perm(
@@ -376,31 +854,11 @@ class GroupManager(edgy.Manager, ManagerMixin):
         if not isinstance(users, list):
             users = [users]
 
-        permissions: list[edgy.Model] = []
-
-        # Pre-fetch content types for all objects to avoid multiple await calls
-        content_types = [await get_content_type(obj) for obj in objs]
-
-        # Bulk create objects
-        permissions: list[dict[str, Any]] = [  # type: ignore
-            {"content_type": content_type, "codename": perm.lower(), "name": perm.capitalize()}
-            for content_type in content_types
-            for perm in perms  # type: ignore
-        ]
+        content_types = await get_content_types(objs)
 
-        # Bulk inserts or creates the permissions and internally Edgy does in an atomic way
-        permissions = await self.permissions_model.guardian.bulk_get_or_create(
-            permissions, unique_fields=["content_type", "codename"]
-        )
-
-        # Make sure we add all permissions to the filter
-        for perm in permissions:
-            self.permissions_model.guardian.filter(
-                codename=perm.codename, content_type=perm.content_type
-            )
-
-        # Get all permissions that were created
-        permissions = await self.permissions_model.guardian.all()
+        # Only the permissions of the requested (content type, codename) pairs are
+        # touched, the missing ones are inserted
+        permissions = await get_permission_catalog().bulk_get_or_create(content_types, perms)
 
         group_kwargs = {
             "perms": permissions,
@@ -409,13 +867,99 @@ class GroupManager(edgy.Manager, ManagerMixin):
             "revoke": revoke,
         }
 
-        # Handles the content type for group assignment
-        await self.group_model.assign_bulk_group_perm(**group_kwargs)
-
         # Handles the permissions
         kwargs = {
             "users": users,
             "permissions": permissions,
             "revoke": revoke_users_permissions,
         }
-        await self.permissions_model.assign_bulk_permission(**kwargs)
+
+        async with write_transaction():
+            # Handles the content type for group assignment
+            group_objs = await self.group_model.assign_bulk_group_perm(**group_kwargs)
+            await self.permissions_model.assign_bulk_permission(**kwargs)
+            await bump_generation(users=users, groups=group_objs)
+
+    async def has_group_permission(
+        self, user: edgy.Model, perm: str | type[edgy.Model], group: type[edgy.Model] | str
+    ) -> bool:
+        """
+        Checks if a user belongs to the group and the group has the given permission.
+
+        When the `group_cache` is enabled in the settings, the memberships and the
+        group permissions are served from the process-local group cache, which turns
+        the check into a set intersection in memory. Otherwise, with `coalesce_checks`,
+        the check is coalesced with the concurrent ones into a single query.
+
+        Args:
+            user (edgy.Model): The user to check the permission for.
+            perm (str | type[edgy.Model]): The permission codename or instance.
+            group (type[edgy.Model] | str): The group instance or the group name.
+
+        Returns:
+            bool: True if the user has the permission through the group, False otherwise.
+        """
+        if not is_group_cache_enabled():
+            if is_coalescing_enabled():
+                return await get_group_check_batcher().check((user, perm, group))
+            return cast(
+                bool,
+                await self.group_model.has_group_permission(user=user, perm=perm, group=group),
+            )
+
+        await sync_caches()
+
+        cache = get_group_cache()
+
+        if isinstance(group, str):
+            group_id = cache.get_group_id(group)
+            if group_id is None:
+                group_id = await self.group_model.get_group_id(group)
+                if group_id is None:
+                    return False
+                cache.set_group_id(group, group_id)
+        else:
+            group_id = group.id
+
+        group_ids = cache.get_user_groups(user)
+        if group_ids is None:
+            invalidations = cache.invalidations
+            group_ids = await self.group_model.get_user_group_ids(user)
+            if cache.invalidations == invalidations:
+                cache.set_user_groups(user, group_ids)
+
+        if group_id not in group_ids:
+            return False
+
+        permission_ids = cache.get_group_permissions(group_id)
+        if permission_ids is None:
+            invalidations = cache.invalidations
+            permission_ids = await self.group_model.get_permission_ids(group_id)
+            if cache.invalidations == invalidations:
+                cache.set_group_permissions(group_id, permission_ids)
+
+        codename = normalize_codename(perm)
+        permissions = await get_permission_catalog().get_for_ids(permission_ids)
+        return any(normalize_codename(permission) == codename for permission in permissions.values())
+
+    async def get_groups_with_perms(
+        self, obj: Any, with_member_count: bool = False
+    ) -> ObjectPermissions:
+        """
+        Returns the groups holding permissions on the content type of `obj`, with their codenames.
+
+        Args:
+            obj (Any): the object, or its model.
+            with_member_count (bool): whether to also set the `member_count` attribute of
+                each group, counted by the database in the same query.
+
+        Returns:
+            ObjectPermissions: a mapping from each group, ordered by name, to its codenames.
+        """
+        ctype = await get_content_type(obj)
+        return cast(
+            ObjectPermissions,
+            await self.group_model.get_content_type_groups(
+                ctype, with_member_count=with_member_count
+            ),
+        )
@@ -1,16 +1,33 @@
 import logging
+from collections.abc import Iterable, Sequence
+from datetime import datetime
 from typing import Any, ClassVar, cast
 
 import edgy
+import sqlalchemy
 from sqlalchemy.exc import IntegrityError
 
 from edgy_guardian._internal._models import BaseGuardianModel
-from edgy_guardian.content_types.utils import get_content_type
-from edgy_guardian.enums import UserGroup
+from edgy_guardian._internal._through import add_pairs, get_through_table, remove_pairs
+from edgy_guardian._internal._upsert import get_or_insert
+from edgy_guardian.cache import (
+    bump_generation,
+    get_decision_cache,
+    get_group_cache,
+    is_generation_tracking_enabled,
+    make_decision_key,
+    normalize_codename,
+)
+from edgy_guardian.cache.changelog import ChangeRecorder
+from edgy_guardian.cache.singleflight import get_single_flight, is_single_flight_enabled
+from edgy_guardian.content_types.utils import get_content_type, get_content_types
+from edgy_guardian.enums import ChangeAction, ChangeRelation, UserGroup
+from edgy_guardian.permissions.expressions import granted_permission_ids, permission_exists
 from edgy_guardian.permissions.managers import (
     GroupManager,
     PermissionManager,
 )
+from edgy_guardian.permissions.snapshots import ObjectPermissions, PermissionSnapshot
 from edgy_guardian.utils import get_groups_model, get_permission_model, get_user_model
 
 logger = logging.getLogger(__name__)
@@ -52,13 +69,77 @@ class BasePermission(BaseUserGroup):
     def __str__(self) -> str:
         return f"{self.content_type} | {self.name}"
 
+    @classmethod
+    async def __add_user_permissions(
+        cls, users: list["edgy.Model"], permissions: list["edgy.Model"]
+    ) -> int:
+        """
+        Grants the permissions to the users with chunked multi-row inserts into the
+        through table, skipping the relations that already exist.
+
+        Returns:
+            int: The number of relations added.
+        """
+        return await cls.__add_pairs(
+            (permission.id, user.id) for permission in permissions for user in users
+        )
+
+    @classmethod
+    async def __add_pairs(cls, pairs: Iterable[tuple[Any, Any]]) -> int:
+        """
+        Inserts the missing `(permission id, user id)` relations and records them.
+
+        Returns:
+            int: The number of relations added.
+        """
+        through = get_through_table(cls, cls.__model_type__)
+
+        async with ChangeRecorder() as recorder:
+            added = await add_pairs(through, pairs)
+            for permission_id, user_id in added:
+                recorder.add(
+                    ChangeAction.ADD,
+                    ChangeRelation.USER_PERMISSION,
+                    permission=permission_id,
+                    user=user_id,
+                )
+        return len(added)
+
+    @classmethod
+    async def __remove_user_permissions(
+        cls, users: list["edgy.Model"], permissions: list["edgy.Model"]
+    ) -> int:
+        """
+        Revokes the permissions from the users with chunked set-based deletes from
+        the through table.
+
+        Returns:
+            int: The number of relations removed.
+        """
+        through = get_through_table(cls, cls.__model_type__)
+
+        async with ChangeRecorder() as recorder:
+            removed = await remove_pairs(
+                through,
+                (permission.id for permission in permissions),
+                (user.id for user in users),
+            )
+            for permission_id, user_id in removed:
+                recorder.add(
+                    ChangeAction.REMOVE,
+                    ChangeRelation.USER_PERMISSION,
+                    permission=permission_id,
+                    user=user_id,
+                )
+        return len(removed)
+
     @classmethod
     async def __bulk_create_or_update_permissions(
         cls,
         users: list["edgy.Model"],
         permissions: list["edgy.Model"],
         revoke: bool,
-    ) -> None:
+    ) -> int:
         """
         Creates or updates a list of permissions for the given users and objects.
 
@@ -67,63 +148,40 @@ class BasePermission(BaseUserGroup):
             permissions (list[edgy.Model]): List of permission models to apply.
             revoke (bool): Flag indicating whether to revoke (True) or add (False) permissions.
 
+        Returns:
+            int: The number of relations added or removed.
+
         Raises:
             AssertionError: If the model type is not found in the permission.
             IntegrityError: If there is an error processing the permission.
         """
-
-        async def process_users(users: list["edgy.Model"] | Any, action: Any) -> None:
-            """
-            Processes a list of users with the given action.
-
-            Args:
-                users (list[edgy.Model]): List of user models to process.
-                action (Callable): The action to perform on each user.
-            """
-            if isinstance(users, list):
-                for user in users:
-                    await action(user)
-            else:
-                await action(users)
-
         for permission in permissions:
-            model = getattr(permission, cls.__model_type__, None)
-            if not model:
+            if not getattr(permission, cls.__model_type__, None):
                 logger.error(f"Model '{cls.__model_type__}' not found")
                 raise AssertionError(f"'{cls.__model_type__}' not found")
 
-            try:
-                action = model.remove if revoke else model.add
-                await process_users(users, action)
-            except IntegrityError as e:
-                logger.error("Error processing permission", error=str(e))
-                raise e
+        if revoke:
+            return await cls.__remove_user_permissions(users, permissions)
+        return await cls.__add_user_permissions(users, permissions)
 
     @classmethod
     async def __assign_permission(
         cls, users: list[edgy.Model], obj: edgy.Model, revoke: bool
-    ) -> None:
+    ) -> int:
         """
         Creates or revokes a permission for the given users and object.
+
+        Returns:
+            int: The number of relations added or removed.
         """
         model = getattr(obj, cls.__model_type__, None)
         if not model:
             logger.error(f"Model '{cls.__model_type__}' not found")
-            return
-
-        async def process_users(users: list[Any] | Any, action: Any) -> None:
-            if isinstance(users, list):
-                for user in users:
-                    await action(user)
-            else:
-                await action(users)
+            return 0
 
-        try:
-            action = model.remove if revoke else model.add
-            await process_users(users, action)
-        except IntegrityError as e:
-            logger.error("Error processing permission", error=str(e))
-            raise e
+        if revoke:
+            return await cls.__remove_user_permissions(users, [obj])
+        return await cls.__add_user_permissions(users, [obj])
 
     @classmethod
     async def assign_permission(
@@ -131,10 +189,13 @@ class BasePermission(BaseUserGroup):
         users: list[edgy.Model] | Any,
         permission: "BasePermission",
         revoke: bool = False,
-    ) -> None:
+    ) -> int:
         """
         Assign or revoke permissions for a user or a list of users on a given object.
 
+        The grants are written with multi-row inserts into the through table, so
+        granting a permission to many users does not cost an `INSERT` per user.
+
         Args:
             users (list["User"] | "User"): A user or a list of users to whom the permission will be assigned or revoked.
             obj (edgy.Model): The object on which the permission will be assigned or revoked.
@@ -146,7 +207,7 @@ class BasePermission(BaseUserGroup):
             AssertionError: If users is not a list or a User instance.
             ValueError: If bulk_create_or_update is True and names is not provided.
         Returns:
-            None
+            int: The number of user permissions added or removed.
         """
         assert isinstance(users, list) or isinstance(users, get_user_model()), (  # type: ignore
             "Users must be a list or a User instance."
@@ -155,7 +216,12 @@ class BasePermission(BaseUserGroup):
         if not isinstance(users, list):
             users = [users]
 
-        return await cls.__assign_permission(users, permission, revoke)
+        try:
+            return await cls.__assign_permission(users, permission, revoke)
+        finally:
+            await get_decision_cache().invalidate_many(
+                make_decision_key(user, permission.content_type, permission) for user in users
+            )
 
     @classmethod
     async def has_permission(cls, user: edgy.Model, perm: str | type["BasePermission"], obj: Any) -> bool:
@@ -175,7 +241,105 @@ class BasePermission(BaseUserGroup):
             "codename__iexact": perm if isinstance(perm, str) else perm.codename,
             "content_type": ctype,
         }
-        return cast(bool, await cls.guardian.filter(**filter_kwargs).exists())
+        exists = cls.guardian.filter(**filter_kwargs).exists
+        if is_single_flight_enabled():
+            key = (user.id, ctype.id, normalize_codename(perm), get_decision_cache().invalidations)
+            return cast(
+                bool,
+                await get_single_flight().do("has_permission", key, exists, cls.database),
+            )
+        return cast(bool, await exists())
+
+    @classmethod
+    async def has_effective_permission(
+        cls, user: edgy.Model, perm: str | type["BasePermission"], obj: Any
+    ) -> bool:
+        """
+        Checks if a user has a specific permission on a given object, given to
+        them directly or through one of their groups, with a single query.
+
+        Args:
+            user (edgy.Model): The user to check the permission for.
+            perm (str): The permission to check.
+            obj (Any): The object to check the permission on.
+        Returns:
+            bool: True if the user has the permission by any route, False otherwise.
+        """
+        ctype = await get_content_type(obj)
+        expression = sqlalchemy.select(permission_exists(user, ctype, perm, include_groups=True))
+
+        async def exists() -> bool:
+            return bool(await cls.database.fetch_val(expression))
+
+        if is_single_flight_enabled():
+            key = (user.id, ctype.id, normalize_codename(perm), get_decision_cache().invalidations)
+            return cast(
+                bool,
+                await get_single_flight().do(
+                    "has_effective_permission", key, exists, cls.database
+                ),
+            )
+        return await exists()
+
+    @classmethod
+    async def has_permissions(
+        cls, user: edgy.Model, checks: Sequence[tuple[str | type["BasePermission"], Any]]
+    ) -> list[bool]:
+        """
+        Checks many `(perm, obj)` pairs, of any models, with a single query.
+
+        The content types of all the objects are resolved at once and the permissions
+        of `user` are matched by `(content type, codename)`. The result is the same as
+        calling `has_permission` for each pair.
+
+        Args:
+            user (edgy.Model): The user to check the permissions for.
+            checks (Sequence[tuple[str | BasePermission, Any]]): The `(perm, obj)` pairs.
+
+        Returns:
+            list[bool]: The decisions, in the order of `checks`.
+        """
+        return await cls.has_users_permissions([(user, perm, obj) for perm, obj in checks])
+
+    @classmethod
+    async def has_users_permissions(
+        cls, checks: Sequence[tuple[edgy.Model, str | type["BasePermission"], Any]]
+    ) -> list[bool]:
+        """
+        Checks many `(user, perm, obj)` triples, of any users and models, with a single query.
+
+        Args:
+            checks (Sequence[tuple[edgy.Model, str | BasePermission, Any]]): The
+                `(user, perm, obj)` triples.
+
+        Returns:
+            list[bool]: The decisions, in the order of `checks`.
+        """
+        if not checks:
+            return []
+
+        ctypes = await get_content_types(obj for _, _, obj in checks)
+        keys = [
+            (user.id, ctype.id, normalize_codename(perm))
+            for ctype, (user, perm, _) in zip(ctypes, checks, strict=True)
+        ]
+
+        table = cls.table
+        (content_type,) = cls.meta.field_to_column_names["content_type"]
+        codename = sqlalchemy.func.lower(table.c.codename)
+        through = get_through_table(cls, cls.__model_type__)
+        expression = (
+            sqlalchemy.select(through.target, table.c[content_type], codename)
+            .select_from(table.join(through.table, through.source == table.c.id))
+            .where(
+                through.target.in_({user_id for user_id, _, _ in keys}),
+                table.c[content_type].in_({ctype_id for _, ctype_id, _ in keys}),
+                codename.in_({name for _, _, name in keys}),
+            )
+            .group_by(through.target, table.c[content_type], codename)
+        )
+        granted = {tuple(row) for row in await cls.database.fetch_all(expression)}
+        return [key in granted for key in keys]
 
     @classmethod
     async def get_user_obj_perms(cls, user: edgy.Model, obj: edgy.Model, **filters: Any) -> list[type[edgy.Model]]:
@@ -199,18 +363,114 @@ class BasePermission(BaseUserGroup):
         }
         return cast(list[type[edgy.Model]], await cls.guardian.filter(**lookup).all())
 
+    @classmethod
+    async def get_effective_obj_perms(
+        cls, user: edgy.Model, obj: edgy.Model, **filters: Any
+    ) -> list[type[edgy.Model]]:
+        """
+        Return all permission instances of this type that `user` has on `obj`, given
+        directly or through one of their groups, with a single query.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re querying.
+            obj (edgy.Model): the object to check permissions against.
+            **filters: extra lookup args (e.g. codename__iexact="change_stuff").
+
+        Returns:
+            List[BasePermission]: all matching permission records.
+        """
+        ctype = await get_content_type(obj)
+        granted = cls.table.c.id.in_(granted_permission_ids(user, include_groups=True))
+        return cast(
+            list[type[edgy.Model]],
+            await cls.guardian.filter(granted, content_type=ctype, **filters).all(),
+        )
+
+    @classmethod
+    async def get_user_content_type_ids(
+        cls, user: edgy.Model, include_groups: bool = True
+    ) -> set[Any]:
+        """
+        Returns the ids of the content types on which `user` holds any permission,
+        with a single query.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re querying.
+            include_groups (bool): whether the permissions of the groups of the user count.
+
+        Returns:
+            set[Any]: the content type ids.
+        """
+        table = cls.table
+        (content_type,) = cls.meta.field_to_column_names["content_type"]
+        expression = (
+            sqlalchemy.select(table.c[content_type])
+            .where(table.c.id.in_(granted_permission_ids(user, include_groups=include_groups)))
+            .distinct()
+        )
+        return {row[0] for row in await cls.database.fetch_all(expression)}
+
+    @classmethod
+    async def get_user_codenames(
+        cls, user: edgy.Model, content_types: Iterable[Any]
+    ) -> dict[Any, frozenset[str]]:
+        """
+        Returns the codenames `user` holds on each of the given content types, with
+        a single query.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re loading.
+            content_types (Iterable[Any]): content type instances or ids.
+
+        Returns:
+            dict[Any, frozenset[str]]: the codenames by content type id. Content types
+                without any permission map to an empty set.
+        """
+        ctype_ids = {getattr(ctype, "id", ctype) for ctype in content_types}
+        codenames: dict[Any, set[str]] = {ctype_id: set() for ctype_id in ctype_ids}
+        if not ctype_ids:
+            return {}
+
+        table = cls.table
+        (content_type,) = cls.meta.field_to_column_names["content_type"]
+        through = get_through_table(cls, cls.__model_type__)
+        expression = (
+            sqlalchemy.select(table.c[content_type], table.c.codename)
+            .select_from(table.join(through.table, through.source == table.c.id))
+            .where(through.target == user.id, table.c[content_type].in_(ctype_ids))
+        )
+        for ctype_id, codename in await cls.database.fetch_all(expression):
+            codenames[ctype_id].add(codename)
+        return {ctype_id: frozenset(names) for ctype_id, names in codenames.items()}
+
+    @classmethod
+    async def get_user_snapshot(cls, user: edgy.Model) -> PermissionSnapshot:
+        """
+        Loads all the permissions of `user` with a single query.
+
+        Args:
+            user (edgy.Model): the user whose permissions we’re loading.
+
+        Returns:
+            PermissionSnapshot: an immutable view of the permissions of the user.
+        """
+        lookup = {f"{cls.__model_type__}__id": user.id}
+        permissions = await cls.guardian.filter(**lookup).select_related("content_type")
+        return PermissionSnapshot(user.id, permissions)
+
     @classmethod
     async def assign_bulk_permission(
         cls,
         users: list["edgy.Model"],
         permissions: list["edgy.Model"],
         revoke: bool = False,
-    ) -> None:
+    ) -> int:
         """
         Assign or revoke a list of permissions for a user or a list of users on a given object.
 
         This method processes a list of users and assigns or revokes the specified permissions
         for each user. It handles both adding and removing permissions based on the `revoke` flag.
+        The grants are written with chunked multi-row inserts into the through table.
 
         Args:
             users (List[edgy.Model]): A list of user models to whom the permissions will be assigned or revoked.
@@ -221,6 +481,9 @@ class BasePermission(BaseUserGroup):
             AssertionError: If the model type is not found in the permission.
             IntegrityError: If there is an error processing the permission.
 
+        Returns:
+            int: The number of user permissions added or removed.
+
         Example:
             users = [user1, user2]
             permissions = [perm1, perm2]
@@ -229,7 +492,43 @@ class BasePermission(BaseUserGroup):
         assert isinstance(users, list), "Users must be a list."
         assert isinstance(permissions, list), "Permissions must be a list."
 
-        return await cls.__bulk_create_or_update_permissions(users, permissions, revoke)
+        try:
+            return await cls.__bulk_create_or_update_permissions(users, permissions, revoke)
+        finally:
+            # A single, coalesced invalidation for the whole bulk operation
+            await get_decision_cache().invalidate_many(
+                make_decision_key(user, permission.content_type, permission)
+                for user in users
+                for permission in permissions
+            )
+
+    @classmethod
+    async def assign_permission_pairs(
+        cls, pairs: list[tuple["BasePermission", edgy.Model]]
+    ) -> int:
+        """
+        Grants each permission to the user it is paired with.
+
+        Unlike `assign_bulk_permission`, which grants every permission to every user,
+        only the given pairs are written, with chunked multi-row inserts into the
+        through table.
+
+        Args:
+            pairs (list[tuple[BasePermission, edgy.Model]]): The `(permission, user)` pairs.
+
+        Returns:
+            int: The number of user permissions added.
+
+        Example:
+            await Permission.assign_permission_pairs([(perm1, user1), (perm2, user2)])
+        """
+        try:
+            return await cls.__add_pairs((permission.id, user.id) for permission, user in pairs)
+        finally:
+            await get_decision_cache().invalidate_many(
+                make_decision_key(user, permission.content_type, permission)
+                for permission, user in pairs
+            )
 
 
 class BaseGroup(BaseUserGroup):
@@ -256,6 +555,39 @@ class BaseGroup(BaseUserGroup):
     def __str__(self) -> str:
         return self.name
 
+    async def __forget(self) -> None:
+        """
+        Drops the cached entries of the group, resolving its name or holding its
+        permissions. These writes are not seen by the signal receivers when they run
+        in a guardian write, where the signals are muted.
+        """
+        get_group_cache().invalidate_groups([self])
+        if is_generation_tracking_enabled():
+            await bump_generation(groups=[self])
+
+    async def save(self, *args: Any, **kwargs: Any) -> Any:
+        # A new group has no members nor permissions, nothing can be cached about it
+        force_insert = kwargs.get("force_insert", args[0] if args else False)
+        if force_insert or getattr(self, "id", None) is None:
+            return await super().save(*args, **kwargs)
+
+        try:
+            return await super().save(*args, **kwargs)
+        finally:
+            await self.__forget()
+
+    async def update(self, **kwargs: Any) -> Any:
+        try:
+            return await super().update(**kwargs)
+        finally:
+            await self.__forget()
+
+    async def delete(self, *args: Any, **kwargs: Any) -> None:
+        try:
+            await super().delete(*args, **kwargs)
+        finally:
+            await self.__forget()
+
     @classmethod
     async def __assign_users(
         cls, users: list[type[edgy.Model]] | type[edgy.Model], obj: edgy.Model, revoke: bool
@@ -265,20 +597,24 @@ class BaseGroup(BaseUserGroup):
             logger.error(f"Model '{cls.__model_type__}' not found")
             return
 
+        change = ChangeAction.REMOVE if revoke else ChangeAction.ADD
+
         async def process_users(users: list[Any] | Any, action: Any) -> None:
-            if isinstance(users, list):
-                for user in users:
-                    await action(user)
-            else:
-                await action(users)
+            for user in users if isinstance(users, list) else [users]:
+                # Adding an existing member returns None and is not a change
+                if await action(user) is not None or revoke:
+                    recorder.add(change, ChangeRelation.GROUP_MEMBERSHIP, user=user, group=obj)
 
-        try:
-            if revoke:
-                await process_users(users, model.remove)
-            else:
-                await process_users(users, model.add)
-        except IntegrityError as e:
-            logger.error("Error processing permission", error=str(e))
+        async with ChangeRecorder() as recorder:
+            try:
+                if revoke:
+                    await process_users(users, model.remove)
+                else:
+                    await process_users(users, model.add)
+            except IntegrityError as e:
+                logger.error("Error processing permission", error=str(e))
+            finally:
+                get_group_cache().invalidate_users(users if isinstance(users, list) else [users])
 
     @classmethod
     async def assign_group_perm(
@@ -324,19 +660,31 @@ class BaseGroup(BaseUserGroup):
 
         # Handles the content type for group assignment
         if isinstance(group, str):
-            group_obj, _ = await cls.guardian.get_or_create(name=group.lower())
+            (group_obj,) = await cls.get_or_create_groups([group])
         else:
-            group_obj = group
+            group_obj = cast("BaseGroup", group)
 
         # Assign/Revoke the users from the group
         await cls.__assign_users(users, group_obj, revoke)
 
         # Get the permission object from the group model
         permissions = getattr(group_obj, UserGroup.PERMISSIONS)
-        if not revoke:
-            await permissions.add(permission)
-        else:
-            await permissions.remove(permission)
+        async with ChangeRecorder() as recorder:
+            try:
+                if not revoke:
+                    added = await permissions.add(permission)
+                else:
+                    await permissions.remove(permission)
+
+                if revoke or added is not None:
+                    recorder.add(
+                        ChangeAction.REMOVE if revoke else ChangeAction.ADD,
+                        ChangeRelation.GROUP_PERMISSION,
+                        permission=permission,
+                        group=group_obj,
+                    )
+            finally:
+                get_group_cache().invalidate_groups([group_obj])
 
         return group_obj
 
@@ -347,7 +695,7 @@ class BaseGroup(BaseUserGroup):
         perms: list[type["BasePermission"]] | type["BasePermission"],
         groups: list[str] | list["BaseGroup"],
         revoke: bool = False,
-    ) -> None:
+    ) -> list["BaseGroup"]:
         """
         Assign or revoke a list of permissions for a user or a list of users in specified groups.
 
@@ -361,6 +709,9 @@ class BaseGroup(BaseUserGroup):
             groups (List[str]): A list of group names to which the permissions will be applied.
             revoke (bool, optional): If True, the permissions will be revoked. If False, the permissions will be assigned. Defaults to False.
 
+        Returns:
+            list[BaseGroup]: The group instances the permissions were applied to.
+
         Raises:
             AssertionError: If users is not a list or a User instance.
             IntegrityError: If there is an error processing the permission.
@@ -379,35 +730,41 @@ class BaseGroup(BaseUserGroup):
             f"Permissions must be a list or a '{get_permission_model().__name__}' instance."
         )
 
-        async def process_permissions(permissions: list[Any] | Any, action: Any) -> None:
-            if isinstance(permissions, list):
-                for permission in permissions:
-                    await action(permission)
-            else:
-                await action(permissions)
-
-        # Pre-fetch group objects to minimize await calls
-        group_objs = []
-        for group in groups:
-            if not isinstance(group, cls):
-                group_obj, _ = await cls.guardian.get_or_create(name=group.lower())
-            else:
-                group_obj = group
-            group_objs.append(group_obj)
-
-        for group_obj in group_objs:
-            # Assign/Revoke the users from the group
-            await cls.__assign_users(users, group_obj, revoke)
-
-            # Get the permission object from the group model
-            permissions = getattr(group_obj, UserGroup.PERMISSIONS)
+        change = ChangeAction.REMOVE if revoke else ChangeAction.ADD
 
-            try:
-                action = permissions.remove if revoke else permissions.add
-                await process_permissions(perms, action)
-            except IntegrityError as e:
-                logger.error("Error processing permission", error=str(e))
-                raise e
+        async def process_permissions(
+            permissions: list[Any] | Any, action: Any, group: "BaseGroup"
+        ) -> None:
+            for permission in permissions if isinstance(permissions, list) else [permissions]:
+                # Adding an existing relation returns None and is not a change
+                if await action(permission) is not None or revoke:
+                    recorder.add(
+                        change, ChangeRelation.GROUP_PERMISSION, permission=permission, group=group
+                    )
+
+        # Gets or creates the groups given by name at once
+        names = [group for group in groups if isinstance(group, str)]
+        by_name = iter(await cls.get_or_create_groups(names))
+        group_objs = [next(by_name) if isinstance(group, str) else group for group in groups]
+
+        try:
+            async with ChangeRecorder() as recorder:
+                for group_obj in group_objs:
+                    # Assign/Revoke the users from the group
+                    await cls.__assign_users(users, group_obj, revoke)
+
+                    # Get the permission object from the group model
+                    permissions = getattr(group_obj, UserGroup.PERMISSIONS)
+
+                    try:
+                        action = permissions.remove if revoke else permissions.add
+                        await process_permissions(perms, action, group_obj)
+                    except IntegrityError as e:
+                        logger.error("Error processing permission", error=str(e))
+                        raise e
+        finally:
+            get_group_cache().invalidate_groups(group_objs)
+        return group_objs
 
     @classmethod
     async def has_group_permission(
@@ -436,11 +793,260 @@ class BaseGroup(BaseUserGroup):
             >>> else:
             >>>     print("User does not have permission to edit the object.")
         """
+        name = group.name if isinstance(group, cls) else group
         filter_kwargs = {
             f"{UserGroup.USER}__id__in": [user.id],
-            "name": group.name if isinstance(group, cls) else group,
+            "name": name,
             f"{UserGroup.PERMISSIONS}__codename__iexact": perm.codename
             if isinstance(perm, BasePermission)
             else perm,
         }
-        return cast(bool, await get_groups_model().guardian.filter(**filter_kwargs).exists())
+        groups_model = get_groups_model()
+        exists = groups_model.guardian.filter(**filter_kwargs).exists
+        if is_single_flight_enabled():
+            key = (user.id, name, normalize_codename(perm))
+            return cast(
+                bool,
+                await get_single_flight().do(
+                    "has_group_permission", key, exists, groups_model.database
+                ),
+            )
+        return cast(bool, await exists())
+
+    @classmethod
+    async def has_group_permissions(
+        cls, checks: Sequence[tuple[edgy.Model, str | type[edgy.Model], type["BaseGroup"] | str]]
+    ) -> list[bool]:
+        """
+        Checks many `(user, perm, group)` triples with a single query.
+
+        The result is the same as calling `has_group_permission` for each triple.
+
+        Args:
+            checks (Sequence[tuple[edgy.Model, str | BasePermission, BaseGroup | str]]):
+                The `(user, perm, group)` triples, the group being an instance or a name.
+
+        Returns:
+            list[bool]: The decisions, in the order of `checks`.
+        """
+        if not checks:
+            return []
+
+        keys = [
+            (
+                user.id,
+                group.name if isinstance(group, cls) else group,
+                normalize_codename(perm),
+            )
+            for user, perm, group in checks
+        ]
+
+        groups_model = get_groups_model()
+        permissions_model = get_permission_model()
+        table = groups_model.table
+        members = get_through_table(groups_model, UserGroup.USER.value)
+        permissions = get_through_table(groups_model, UserGroup.PERMISSIONS.value)
+        codename = sqlalchemy.func.lower(permissions_model.table.c.codename)
+        expression = (
+            sqlalchemy.select(members.target, table.c.name, codename)
+            .select_from(
+                table.join(members.table, members.source == table.c.id)
+                .join(permissions.table, permissions.source == table.c.id)
+                .join(permissions_model.table, permissions.target == permissions_model.table.c.id)
+            )
+            .where(
+                members.target.in_({user_id for user_id, _, _ in keys}),
+                table.c.name.in_({name for _, name, _ in keys}),
+                codename.in_({name for _, _, name in keys}),
+            )
+            .group_by(members.target, table.c.name, codename)
+        )
+        granted = {tuple(row) for row in await groups_model.database.fetch_all(expression)}
+        return [key in granted for key in keys]
+
+    @classmethod
+    async def get_content_type_groups(
+        cls, content_type: Any, with_member_count: bool = False
+    ) -> ObjectPermissions:
+        """
+        Loads the groups holding permissions on `content_type`, with the codenames of
+        each, with a single query over the group permissions table.
+
+        Args:
+            content_type (Any): The content type instance or the content type id.
+            with_member_count (bool): Whether to also count, in SQL, the members of
+                each group into its `member_count` attribute.
+
+        Returns:
+            ObjectPermissions: The groups, ordered by name, mapped to their codenames.
+        """
+        groups_model = get_groups_model()
+        permissions_model = get_permission_model()
+        table = groups_model.table
+        permissions = get_through_table(groups_model, UserGroup.PERMISSIONS.value)
+        (content_type_column,) = permissions_model.meta.field_to_column_names["content_type"]
+
+        columns = [sqlalchemy.func.lower(permissions_model.table.c.codename).label("guardian_codename")]
+        if with_member_count:
+            members = get_through_table(groups_model, UserGroup.USER.value)
+            member_count = (
+                sqlalchemy.select(sqlalchemy.func.count())
+                .select_from(members.table)
+                .where(members.source == table.c.id)
+                .scalar_subquery()
+            )
+            columns.append(member_count.label("member_count"))
+
+        queryset = (
+            groups_model.query.filter(
+                permissions.source == table.c.id,
+                permissions.target == permissions_model.table.c.id,
+                permissions_model.table.c[content_type_column]
+                == getattr(content_type, "id", content_type),
+            )
+            .extra_select(*columns)
+            .reference_select({column.name: column.name for column in columns})
+            .order_by("name")
+        )
+
+        # One row per group and codename, merged into one instance per group
+        groups: dict[Any, Any] = {}
+        codenames: dict[Any, set[str]] = {}
+        for group in await queryset:
+            codename = group.__dict__.pop("guardian_codename")
+            groups.setdefault(group.id, group)
+            codenames.setdefault(group.id, set()).add(codename)
+        return ObjectPermissions(
+            groups.values(), (frozenset(codenames[group_id]) for group_id in groups)
+        )
+
+    @classmethod
+    async def get_or_create_groups(cls, names: list[str]) -> list["BaseGroup"]:
+        """
+        Returns the groups with the given names, creating the missing ones.
+
+        The groups are inserted with a single `INSERT ... ON CONFLICT DO NOTHING` where
+        the database supports it, so concurrent creations of a group do not raise an
+        `IntegrityError` on the unique name.
+
+        Args:
+            names (list[str]): The names of the groups, compared lowercased.
+
+        Returns:
+            list[BaseGroup]: The groups, in the order of `names`.
+        """
+        names = [name.lower() for name in names]
+        if not names:
+            return []
+
+        groups = await get_or_insert(cls, [{"name": name} for name in names], unique_fields=["name"])
+        by_name = {group.name: group for group in groups}
+        return [by_name[name] for name in names]
+
+    @classmethod
+    async def get_group_id(cls, name: str) -> Any | None:
+        """
+        Returns the id of the group with the given name.
+
+        Args:
+            name (str): The name of the group.
+
+        Returns:
+            Any | None: The id of the group or None if the group does not exist.
+        """
+        group = await get_groups_model().guardian.get_or_none(name=name)
+        return None if group is None else group.id
+
+    @classmethod
+    async def get_user_group_ids(cls, user: edgy.Model) -> set[Any]:
+        """
+        Returns the ids of all the groups `user` belongs to with a single query
+        on the membership table.
+
+        Args:
+            user (edgy.Model): The user whose groups we’re loading.
+
+        Returns:
+            set[Any]: The group ids.
+        """
+        through = get_through_table(get_groups_model(), UserGroup.USER.value)
+        expression = sqlalchemy.select(through.source).where(through.target == user.id)
+        rows = await get_groups_model().database.fetch_all(expression)
+        return {row[0] for row in rows}
+
+    @classmethod
+    async def get_permission_ids(cls, group: Any) -> set[Any]:
+        """
+        Returns the ids of all the permissions given to `group` with a single query
+        on the group permissions table.
+
+        Args:
+            group (Any): The group instance or the group id.
+
+        Returns:
+            set[Any]: The permission ids.
+        """
+        through = get_through_table(get_groups_model(), UserGroup.PERMISSIONS.value)
+        expression = sqlalchemy.select(through.target).where(
+            through.source == getattr(group, "id", group)
+        )
+        rows = await get_groups_model().database.fetch_all(expression)
+        return {row[0] for row in rows}
+
+
+class BaseGeneration(BaseGuardianModel):
+    """
+    A generation counter used to keep the guardian caches of several processes coherent.
+
+    There is a single `global` row, bumped by every guardian write, and one row per
+    user and per group touched by a write. The scoped rows store the global generation
+    of their last write, which allows a process to find everything that changed since
+    the generation it last saw with a single indexed read.
+
+    Attributes:
+        scope (str): The scope of the counter, `global`, `users` or `groups`.
+        key (str): The id of the user or group, empty for the `global` scope.
+        value (int): The generation.
+    """
+
+    scope: str = edgy.CharField(max_length=20)
+    key: str = edgy.CharField(max_length=100, default="")
+    value: int = edgy.BigIntegerField(default=0, index=True)
+
+    class Meta:
+        abstract = True
+        unique_together = [("scope", "key")]
+
+    def __str__(self) -> str:
+        return f"{self.scope}:{self.key} | {self.value}"
+
+
+class BaseChangelog(BaseGuardianModel):
+    """
+    An append-only log of the grants, revokes and group membership changes.
+
+    The `id` of each entry is its sequence, which allows a long-lived process to
+    read only the changes made since the last sequence it has seen and apply them
+    to its caches, instead of throwing them away.
+
+    Attributes:
+        action (str): `add` or `remove`.
+        relation (str): `user_permission`, `group_permission` or `group_membership`.
+        permission_id (str | None): The id of the permission, if any.
+        user_id (str | None): The id of the user, if any.
+        group_id (str | None): The id of the group, if any.
+        created_at (datetime): When the change was recorded.
+    """
+
+    action: str = edgy.CharField(max_length=10)
+    relation: str = edgy.CharField(max_length=20)
+    permission_id: str | None = edgy.CharField(max_length=100, null=True)
+    user_id: str | None = edgy.CharField(max_length=100, null=True)
+    group_id: str | None = edgy.CharField(max_length=100, null=True)
+    created_at: datetime = edgy.DateTimeField(auto_now_add=True, index=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self) -> str:
+        return f"{self.id} | {self.action} {self.relation}"
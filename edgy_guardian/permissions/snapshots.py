@@ -0,0 +1,174 @@
+from collections.abc import Iterable, Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+import edgy
+
+from edgy_guardian.cache import normalize_codename
+from edgy_guardian.content_types.utils import get_model_name
+
+
+class PermissionSnapshot:
+    """
+    An immutable, in-memory view of all the permissions a user holds.
+
+    A snapshot is loaded with a single query and then answers every check
+    synchronously, which makes it ideal to be created once per request and
+    shared by all the permission checks done during that request.
+
+    The answers have the same semantics as `BasePermission.has_permission` and
+    `BasePermission.get_user_obj_perms`, as of the moment the snapshot was taken.
+
+    Example:
+        >>> snapshot = await user.permission_snapshot()
+        >>> snapshot.has_perm("edit", item)
+        True
+        >>> snapshot.perms_for(item)
+        [<Permission: items | Edit>]
+    """
+
+    __slots__ = ("_user_id", "_permissions")
+
+    _user_id: Any
+    _permissions: Mapping[str, Mapping[str, tuple[edgy.Model, ...]]]
+
+    def __init__(self, user_id: Any, permissions: Iterable[edgy.Model]) -> None:
+        grouped: dict[str, dict[str, list[edgy.Model]]] = {}
+        for permission in permissions:
+            codenames = grouped.setdefault(permission.content_type.model, {})
+            codenames.setdefault(normalize_codename(permission), []).append(permission)
+
+        object.__setattr__(self, "_user_id", user_id)
+        object.__setattr__(
+            self,
+            "_permissions",
+            MappingProxyType(
+                {
+                    model: MappingProxyType(
+                        {codename: tuple(perms) for codename, perms in codenames.items()}
+                    )
+                    for model, codenames in grouped.items()
+                }
+            ),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'{type(self).__name__}' is immutable.")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: user={self._user_id!r}, permissions={len(self)}>"
+
+    def __len__(self) -> int:
+        return sum(
+            len(perms) for codenames in self._permissions.values() for perms in codenames.values()
+        )
+
+    @property
+    def user_id(self) -> Any:
+        """
+        The id of the user the snapshot belongs to.
+        """
+        return self._user_id
+
+    @property
+    def permissions(self) -> Mapping[str, Mapping[str, tuple[edgy.Model, ...]]]:
+        """
+        The permissions grouped by content type model name and codename.
+        """
+        return self._permissions
+
+    def has_perm(self, perm: str | type[edgy.Model], obj: Any) -> bool:
+        """
+        Checks if the user had the given permission on the given object.
+
+        Args:
+            perm (str | type[edgy.Model]): The permission codename or a permission instance.
+            obj (Any): The object to check the permission on.
+
+        Returns:
+            bool: True if the user has the permission, False otherwise.
+        """
+        codenames = self._permissions.get(get_model_name(obj))
+        if not codenames:
+            return False
+        return normalize_codename(perm) in codenames
+
+    def perms_for(self, obj: Any) -> list[edgy.Model]:
+        """
+        Returns all the permission instances the user holds on the given object.
+
+        Args:
+            obj (Any): The object to check permissions against.
+
+        Returns:
+            list[edgy.Model]: The permission instances.
+        """
+        codenames = self._permissions.get(get_model_name(obj), {})
+        return [permission for perms in codenames.values() for permission in perms]
+
+    def apply(
+        self, added: Iterable[edgy.Model] = (), removed: Iterable[edgy.Model] = ()
+    ) -> "PermissionSnapshot":
+        """
+        Returns a new snapshot with the given permissions added and removed.
+
+        Args:
+            added (Iterable[edgy.Model]): The permissions granted to the user.
+            removed (Iterable[edgy.Model]): The permissions revoked from the user.
+
+        Returns:
+            PermissionSnapshot: The new snapshot. This snapshot is left untouched.
+        """
+        permissions = {
+            permission.id: permission
+            for codenames in self._permissions.values()
+            for perms in codenames.values()
+            for permission in perms
+        }
+        for permission in removed:
+            permissions.pop(permission.id, None)
+        for permission in added:
+            permissions[permission.id] = permission
+        return type(self)(self._user_id, permissions.values())
+
+
+class ObjectPermissions(Mapping[Any, frozenset[str]]):
+    """
+    The codenames a user holds on each object of a list, as returned by
+    `prefetch_obj_perms`.
+
+    Edgy models are not hashable, so the objects are looked up by identity: only the
+    very instances that were prefetched are keys of the mapping.
+
+    Example:
+        >>> perms = await prefetch_obj_perms(user, items)
+        >>> "edit" in perms[items[0]]
+        True
+    """
+
+    __slots__ = ("_objs", "_codenames")
+
+    def __init__(self, objs: Iterable[Any], codenames: Iterable[frozenset[str]]) -> None:
+        self._objs = list(objs)
+        self._codenames = {
+            id(obj): names for obj, names in zip(self._objs, codenames, strict=True)
+        }
+
+    def __getitem__(self, obj: Any) -> frozenset[str]:
+        try:
+            return self._codenames[id(obj)]
+        except KeyError:
+            raise KeyError(obj) from None
+
+    def __iter__(self) -> Iterator[Any]:
+        seen: set[int] = set()
+        for obj in self._objs:
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                yield obj
+
+    def __len__(self) -> int:
+        return len(self._codenames)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: objects={len(self)}>"
@@ -1,12 +1,16 @@
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from typing import Any, cast
 
 import edgy
+from edgy import QuerySet
 from edgy.exceptions import RelationshipNotFound
 
+from edgy_guardian.permissions.snapshots import ObjectPermissions, PermissionSnapshot
 from edgy_guardian.utils import get_groups_model, get_permission_model
 
 __all__ = [
     "has_user_perm",
+    "has_user_perms",
     "has_group_permission",
     "assign_group_perm",
     "assign_bulk_group_perm",
@@ -15,26 +19,252 @@ __all__ = [
     "remove_group_perm",
     "assign_bulk_perm",
     "remove_bulk_perm",
+    "stream_bulk_perm",
     "remove_bulk_group_perm",
+    "get_permission_snapshot",
+    "prefetch_obj_perms",
+    "filter_permitted",
+    "get_objects_for_user",
+    "annotate_perms",
+    "users_with_perm",
+    "get_groups_with_perms",
+    "iter_objects_for_user",
 ]
 
 
-async def get_obj_perms(user: type[edgy.Model], obj: Any, **filters: Any) -> list[type[edgy.Model]]:
+async def get_obj_perms(
+    user: type[edgy.Model], obj: Any, include_groups: bool = False, **filters: Any
+) -> list[type[edgy.Model]]:
     """
     Return all permission instances of this type that `user` has on `obj`.
 
     Args:
         user (edgy.Model): the user whose permissions we’re querying.
         obj (edgy.Model): the object to check permissions against.
+        include_groups (bool): whether the permissions given to the groups of the user
+            are listed too. The direct and group grants are still read with a single query.
         **filters: extra lookup args (e.g. codename__iexact="change_stuff").
 
     Returns:
         List[BasePermission]: all matching permission records.
     """
-    return cast(list[type[edgy.Model]], await get_permission_model().guardian.get_obj_perms(user, obj, **filters))
+    return cast(
+        list[type[edgy.Model]],
+        await get_permission_model().guardian.get_obj_perms(
+            user, obj, include_groups=include_groups, **filters
+        ),
+    )
+
+
+async def prefetch_obj_perms(user: type[edgy.Model], objs: Iterable[Any]) -> ObjectPermissions:
+    """
+    Loads the codenames `user` holds on every object of `objs` at once.
+
+    This is the bulk version of `get_obj_perms`: the content types are resolved
+    together and a single permission query is run, whatever the number of objects.
+
+    Args:
+        user (edgy.Model): the user whose permissions we’re loading.
+        objs (Iterable[Any]): the objects, of any models.
+
+    Returns:
+        ObjectPermissions: a mapping from each object to the set of codenames the user holds on it.
+
+    Example:
+        >>> perms = await prefetch_obj_perms(user, items)
+        >>> for item in items:
+        >>>     print(item, perms[item])
+    """
+    return cast(
+        ObjectPermissions, await get_permission_model().guardian.prefetch_obj_perms(user, objs)
+    )
+
+
+async def filter_permitted(
+    user: type[edgy.Model], perm: str | type[edgy.Model], objs: Iterable[Any]
+) -> list[Any]:
+    """
+    Returns only the objects of `objs` on which `user` has the permission `perm`.
+
+    The objects keep their original order. A single permission query is run,
+    whatever the number of objects, and the permission is compared as in `has_user_perm`.
+
+    Args:
+        user (edgy.Model): the user whose permissions we’re checking.
+        perm (str | edgy.Model): the permission codename or instance.
+        objs (Iterable[Any]): the objects, of any models.
+
+    Returns:
+        list[Any]: the permitted objects.
+
+    Example:
+        >>> editable = await filter_permitted(user, "edit", items)
+    """
+    return cast(list[Any], await get_permission_model().guardian.filter_permitted(user, perm, objs))
 
 
-async def has_user_perm(user: type[edgy.Model], perm: str | type[edgy.Model], obj: Any) -> bool:
+def get_objects_for_user(
+    user: type[edgy.Model],
+    perm: str | type[edgy.Model],
+    model: type[edgy.Model] | QuerySet,
+    include_groups: bool = True,
+) -> QuerySet:
+    """
+    Returns a lazy queryset of the objects of `model` on which `user` has the permission `perm`.
+
+    Nothing is loaded in Python: the permission, given to the user directly or,
+    unless `include_groups` is False, through one of their groups, is checked by
+    the database with a subquery when the queryset is evaluated. The queryset can
+    be further filtered, ordered and sliced like any other.
+
+    Args:
+        user (edgy.Model): the user whose permissions we’re checking.
+        perm (str | edgy.Model): the permission codename or instance.
+        model (type[edgy.Model] | QuerySet): the model, or a queryset of it to narrow down.
+        include_groups (bool): whether the permissions of the groups of the user count.
+
+    Returns:
+        QuerySet: the queryset of the permitted objects.
+
+    Example:
+        >>> items = await get_objects_for_user(user, "edit", Item).order_by("name").limit(10)
+    """
+    return cast(
+        QuerySet,
+        get_permission_model().guardian.get_objects_for_user(
+            user, perm, model, include_groups=include_groups
+        ),
+    )
+
+
+def annotate_perms(
+    user: type[edgy.Model],
+    codenames: Iterable[str],
+    model: type[edgy.Model] | QuerySet,
+    include_groups: bool = True,
+) -> QuerySet:
+    """
+    Returns a lazy queryset of `model` whose objects carry a `can_<codename>` flag per codename.
+
+    The flags are `EXISTS` subqueries selected along the rows, so a list and the
+    permissions of the user on it are loaded with a single query instead of one
+    `has_user_perm` per row and codename.
+
+    Args:
+        user (edgy.Model): the user whose permissions we’re checking.
+        codenames (Iterable[str]): the permission codenames to flag, compared as in `has_user_perm`.
+        model (type[edgy.Model] | QuerySet): the model, or a queryset of it to narrow down.
+        include_groups (bool): whether the permissions of the groups of the user count.
+
+    Returns:
+        QuerySet: the annotated queryset.
+
+    Example:
+        >>> for item in await annotate_perms(user, ["edit", "delete"], Item).order_by("name"):
+        >>>     print(item.name, item.can_edit, item.can_delete)
+    """
+    return cast(
+        QuerySet,
+        get_permission_model().guardian.annotate_perms(
+            user, codenames, model, include_groups=include_groups
+        ),
+    )
+
+
+def users_with_perm(
+    obj: Any,
+    perm: str | type[edgy.Model],
+    user_ids: Iterable[Any] | None = None,
+    include_groups: bool = True,
+    chunk_size: int = 1000,
+) -> AsyncIterator[list[Any]]:
+    """
+    Streams the ids of the users holding the permission `perm` on `obj`, in chunks.
+
+    The users holding the permission directly or, unless `include_groups` is False,
+    through one of their groups are selected by the database, each once, and read
+    through a cursor so that only a chunk of ids is held in memory at a time. When
+    `user_ids` is given, only those users are considered.
+
+    Args:
+        obj (Any): the object, or its model.
+        perm (str | edgy.Model): the permission codename or instance.
+        user_ids (Iterable[Any] | None): the candidate users, for instance the subscribers of `obj`.
+        include_groups (bool): whether the permissions of the groups of the users count.
+        chunk_size (int): the maximum number of ids per chunk.
+
+    Returns:
+        AsyncIterator[list[Any]]: the chunks of user ids.
+
+    Example:
+        >>> async for ids in users_with_perm(item, "view", user_ids=subscribers):
+        >>>     await notify(ids, item)
+    """
+    return cast(
+        AsyncIterator[list[Any]],
+        get_permission_model().guardian.users_with_perm(
+            obj, perm, user_ids=user_ids, include_groups=include_groups, chunk_size=chunk_size
+        ),
+    )
+
+
+def iter_objects_for_user(
+    user: type[edgy.Model], include_groups: bool = True, batch_size: int = 1000
+) -> AsyncIterator[tuple[Any, list[Any]]]:
+    """
+    Streams every object, across all the registered models, on which `user` holds any permission.
+
+    The content types are resolved to their models with `model_class()` and the
+    objects of each model are read in batches with keyset pagination, so memory
+    stays flat however many objects the user can reach.
+
+    Args:
+        user (edgy.Model): the user whose permissions we’re querying.
+        include_groups (bool): whether the permissions of the groups of the user count.
+        batch_size (int): the maximum number of objects per batch.
+
+    Returns:
+        AsyncIterator[tuple[Any, list[Any]]]: `(content type, batch of objects)` pairs.
+
+    Example:
+        >>> async for ctype, objs in iter_objects_for_user(user):
+        >>>     await export(ctype.model, objs)
+    """
+    return cast(
+        AsyncIterator[tuple[Any, list[Any]]],
+        get_permission_model().guardian.iter_objects_for_user(
+            user, include_groups=include_groups, batch_size=batch_size
+        ),
+    )
+
+
+async def get_permission_snapshot(user: type[edgy.Model]) -> PermissionSnapshot:
+    """
+    Loads all the permissions of `user` with a single query.
+
+    The returned snapshot is immutable and answers `has_perm` and `perms_for`
+    synchronously from memory, with the same semantics as `has_user_perm` and
+    `get_obj_perms`.
+
+    Args:
+        user (edgy.Model): the user whose permissions we’re loading.
+
+    Returns:
+        PermissionSnapshot: the snapshot of the permissions of the user.
+
+    Example:
+        >>> snapshot = await get_permission_snapshot(user)
+        >>> if snapshot.has_perm("edit", some_object):
+        >>>     print("User has permission to edit the object.")
+    """
+    return cast(
+        PermissionSnapshot, await get_permission_model().guardian.get_permission_snapshot(user)
+    )
+
+
+async def has_user_perm(
+    user: type[edgy.Model], perm: str | type[edgy.Model], obj: Any, include_groups: bool = False
+) -> bool:
     """
     Checks if a user has a specific permission for a given object.
 
@@ -47,6 +277,9 @@ async def has_user_perm(user: type[edgy.Model], perm: str | type[edgy.Model], ob
             being performed.
         perm (str): The permission string to check (e.g., 'view', 'edit').
         obj (Any): The object for which the permission is being checked.
+        include_groups (bool): Whether the permission may also come from one of the
+            groups of the user. The direct and group grants are then checked
+            together with a single query.
 
     Returns:
         bool: True if the user has the specified permission for the object,
@@ -59,7 +292,66 @@ async def has_user_perm(user: type[edgy.Model], perm: str | type[edgy.Model], ob
         >>> else:
         >>>     print("User does not have permission to edit the object.")
     """
-    return cast(bool, await get_permission_model().guardian.has_user_perm(user, perm, obj))
+    return cast(
+        bool,
+        await get_permission_model().guardian.has_user_perm(
+            user, perm, obj, include_groups=include_groups
+        ),
+    )
+
+
+async def has_user_perms(
+    user: type[edgy.Model], checks: Iterable[tuple[str | type[edgy.Model], Any]]
+) -> list[bool]:
+    """
+    Checks many permissions, on objects of any models, for a user at once.
+
+    The content types of all the objects are resolved together and the pairs are
+    answered with a single query, instead of a query per `has_user_perm` call.
+
+    Args:
+        user (type[edgy.Model]): The user for whom the permission checks are
+            being performed.
+        checks (Iterable[tuple[str | edgy.Model, Any]]): The `(perm, obj)` pairs to check.
+
+    Returns:
+        list[bool]: For each pair, in the same order, True if the user has the
+        permission for the object, False otherwise.
+
+    Example:
+        >>> can_edit_item, can_view_product = await has_user_perms(
+        >>>     user, [("edit", item), ("view", product)]
+        >>> )
+    """
+    return cast(list[bool], await get_permission_model().guardian.has_user_perms(user, checks))
+
+
+async def get_groups_with_perms(obj: Any, with_member_count: bool = False) -> ObjectPermissions:
+    """
+    Returns the groups holding permissions on `obj`, each with the set of its codenames.
+
+    A single query over the group permissions table is run, whatever the number of
+    groups. With `with_member_count`, the members of every group are counted in the
+    same query into its `member_count` attribute.
+
+    Args:
+        obj (Any): the object, or its model.
+        with_member_count (bool): whether to count the members of the groups.
+
+    Returns:
+        ObjectPermissions: a mapping from each group, ordered by name, to its codenames.
+
+    Example:
+        >>> groups = await get_groups_with_perms(item, with_member_count=True)
+        >>> for group, codenames in groups.items():
+        >>>     print(group.name, group.member_count, sorted(codenames))
+    """
+    return cast(
+        ObjectPermissions,
+        await get_groups_model().guardian.get_groups_with_perms(
+            obj, with_member_count=with_member_count
+        ),
+    )
 
 
 async def has_group_permission(
@@ -240,7 +532,7 @@ async def assign_perm(
     )
 
 
-async def remove_perm(perm: type[edgy.Model] | str, users: Any, obj: Any | None = None) -> None:
+async def remove_perm(perm: type[edgy.Model] | str, users: Any, obj: Any | None = None) -> int:
     """
     Removes a permission from a user or group for a specific object.
 
@@ -254,7 +546,8 @@ async def remove_perm(perm: type[edgy.Model] | str, users: Any, obj: Any | None
         obj (Any, optional): The object for which the permission is being revoked. This can be any object for which permissions are managed. Defaults to None, meaning the permission is revoked globally.
 
     Returns:
-        None: This function does not return any value.
+        int: The number of user permissions removed. The relations are deleted with set-based
+        `DELETE` statements and the missing ones are not counted.
 
     Example:
         # Revoke the 'edit' permission from a user for a specific object
@@ -264,9 +557,11 @@ async def remove_perm(perm: type[edgy.Model] | str, users: Any, obj: Any | None
         await remove_perm('delete', group_instance)
     """
     try:
-        await assign_perm(perm, users, obj, revoke=True)
+        return cast(
+            int, await get_permission_model().guardian.remove_perm(perm=perm, users=users, obj=obj)
+        )
     except RelationshipNotFound:
-        return None
+        return 0
 
 
 async def remove_group_perm(
@@ -319,7 +614,7 @@ async def assign_bulk_perm(
     users: list[edgy.Model] | edgy.Model,
     objs: list[Any],
     revoke: bool = False,
-) -> None:
+) -> int:
     """
     Assigns or revokes bulk permissions for users on specified objects.
 
@@ -340,7 +635,8 @@ async def assign_bulk_perm(
             - If False (default), the specified permissions will be assigned to the users on the objects.
 
     Returns:
-        None: This function does not return any value.
+        int: The number of user permissions added or removed. The grants are written with
+        multi-row inserts, the relations that already existed are not counted.
 
     Example:
         # Assign permissions to multiple users on multiple objects
@@ -359,17 +655,20 @@ async def assign_bulk_perm(
             revoke=True
         )
     """
-    await get_permission_model().guardian.assign_bulk_perm(
-        users=users,
-        objs=objs,
-        perms=perms,
-        revoke=revoke,
+    return cast(
+        int,
+        await get_permission_model().guardian.assign_bulk_perm(
+            users=users,
+            objs=objs,
+            perms=perms,
+            revoke=revoke,
+        ),
     )
 
 
 async def remove_bulk_perm(
     perms: list[edgy.Model] | list[str], users: list[edgy.Model] | edgy.Model, objs: list[Any]
-) -> None:
+) -> int:
     """
     Removes bulk permissions for users on specified objects.
 
@@ -387,10 +686,8 @@ async def remove_bulk_perm(
             - Each object in the list can be of any type, depending on the context in which the permissions are being removed.
 
     Returns:
-        None: This function does not return any value.
-
-    Raises:
-        RelationshipNotFound: If the relationship between the user and the object is not found.
+        int: The number of user permissions removed, with chunked set-based `DELETE` statements.
+        The relations that did not exist are not counted.
 
     Example:
         # Remove permissions from multiple users on multiple objects
@@ -408,9 +705,64 @@ async def remove_bulk_perm(
         )
     """
     try:
-        await assign_bulk_perm(perms, users, objs, revoke=True)
+        return await assign_bulk_perm(perms, users, objs, revoke=True)
     except RelationshipNotFound:
-        return
+        return 0
+
+
+async def stream_bulk_perm(
+    triples: Iterable[tuple[Any, str, Any]] | AsyncIterable[tuple[Any, str, Any]] | None = None,
+    users: Iterable[edgy.Model] | AsyncIterable[edgy.Model] | None = None,
+    perms: Iterable[str] | AsyncIterable[str] | None = None,
+    objs: Iterable[Any] | AsyncIterable[Any] | None = None,
+    chunk_size: int = 1000,
+) -> int:
+    """
+    Grants permissions streamed from sync or async iterables, in chunks.
+
+    Unlike `assign_bulk_perm`, nothing is materialized upfront. Either explicit
+    `(user, codename, obj)` triples are given, or `users`, `perms` and `objs` to give
+    every permission to every user on every object, streaming the users.
+
+    Each chunk of at most `chunk_size` grants is written in its own transaction, so
+    the memory stays bounded and a failure only rolls back the current chunk.
+
+    Args:
+        triples (Iterable | AsyncIterable | None): The `(user, codename, obj)` triples.
+        users (Iterable | AsyncIterable | None): The users, without `triples`.
+        perms (Iterable | AsyncIterable | None): The permission codenames, without `triples`.
+        objs (Iterable | AsyncIterable | None): The objects or models, without `triples`.
+        chunk_size (int): The maximum number of grants per chunk and transaction.
+
+    Returns:
+        int: The number of user permissions added. The relations that already existed
+        are not counted.
+
+    Raises:
+        ValueError: If both or none of `triples` and `users`, `perms`, `objs` are given.
+
+    Example:
+        # Give the same permissions to every user of the tenant
+        await stream_bulk_perm(
+            users=User.query.filter(tenant=tenant),
+            perms=["view", "edit"],
+            objs=[Item, Product],
+            chunk_size=5000,
+        )
+
+        # Explicit grants
+        await stream_bulk_perm(triples=((user, "view", item) async for user, item in rows()))
+    """
+    return cast(
+        int,
+        await get_permission_model().guardian.stream_bulk_perm(
+            triples=triples,
+            users=users,
+            perms=perms,
+            objs=objs,
+            chunk_size=chunk_size,
+        ),
+    )
 
 
 async def remove_bulk_group_perm(
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import cast
+from typing import Any, cast
 
 import edgy
 
@@ -62,3 +62,67 @@ def get_groups_model() -> edgy.Model:
     model = settings.edgy_guardian.group_model
     db_model = settings.edgy_guardian.registry.models[model]
     return cast(edgy.Model, db_model)
+
+
+@lru_cache
+def get_generation_model() -> edgy.Model | None:
+    """
+    Returns the generation model class, if one is configured.
+
+    Returns:
+        type[edgy.Model] | None: The generation model class or None when the
+            cross-process coherence is disabled.
+    """
+    from edgy.conf import settings
+
+    model = getattr(settings.edgy_guardian, "generation_model", None)
+    if model is None:
+        return None
+    db_model = settings.edgy_guardian.registry.models[model]
+    return cast(edgy.Model, db_model)
+
+
+@lru_cache
+def get_changelog_model() -> edgy.Model | None:
+    """
+    Returns the changelog model class, if one is configured.
+
+    Returns:
+        type[edgy.Model] | None: The changelog model class or None when the
+            changelog is disabled.
+    """
+    from edgy.conf import settings
+
+    model = getattr(settings.edgy_guardian, "changelog_model", None)
+    if model is None:
+        return None
+    db_model = settings.edgy_guardian.registry.models[model]
+    return cast(edgy.Model, db_model)
+
+
+@lru_cache
+def get_cache_backend() -> Any:
+    """
+    Returns the cache backend used by the guardian caches.
+
+    The backend is the `cache_backend` class of the `EdgyGuardianConfig`, created with
+    the `cache_backend_options`. Defaults to an in-process LRU bounded by the
+    `decision_cache_maxsize`.
+
+    Returns:
+        CacheBackend: The cache backend.
+    """
+    from edgy.conf import settings
+
+    from edgy_guardian._internal._module_loading import import_string
+    from edgy_guardian.cache.backends import MemoryCacheBackend
+
+    backend = getattr(settings.edgy_guardian, "cache_backend", None)
+    options = getattr(settings.edgy_guardian, "cache_backend_options", None) or {}
+    if backend is None:
+        return MemoryCacheBackend(
+            **{"maxsize": settings.edgy_guardian.decision_cache_maxsize, **options}
+        )
+
+    backend_class = import_string(backend) if isinstance(backend, str) else backend
+    return backend_class(**options)
@@ -3,7 +3,12 @@ from __future__ import annotations
 import edgy
 from esmerald.conf import settings
 
-from edgy_guardian.permissions.models import BaseGroup, BasePermission
+from edgy_guardian.permissions.models import (
+    BaseChangelog,
+    BaseGeneration,
+    BaseGroup,
+    BasePermission,
+)
 
 
 class Group(BaseGroup):
@@ -27,3 +32,13 @@ class Permission(BasePermission):
 
     class Meta:
         registry = settings.registry
+
+
+class Generation(BaseGeneration):
+    class Meta:
+        registry = settings.registry
+
+
+class Changelog(BaseChangelog):
+    class Meta:
+        registry = settings.registry
@@ -30,4 +30,6 @@ class EdgyAppSettings(BaseSettings):
         user_model="User",
         permission_model="Permission",
         group_model="Group",
+        generation_model="Generation",
+        changelog_model="Changelog",
     )
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from edgy.conf import settings as edgy_settings
+
+from edgy_guardian.cache import DecisionCache
+from edgy_guardian.cache.backends import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    SharedMemoryCacheBackend,
+)
+from edgy_guardian.exceptions import CacheBackendError
+from edgy_guardian.utils import get_cache_backend
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeTimer:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RedisStandIn:
+    """
+    A local stand-in for a Redis server supporting the commands used by the adapter.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, tuple[float | None, bytes]] = {}
+        self.commands: list[list[bytes]] = []
+        self.server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/1"
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def get(self, key: bytes) -> bytes | None:
+        expires, value = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    @staticmethod
+    def bulk(value: bytes | None) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def run(self, command: list[bytes]) -> bytes:
+        name, args = command[0].upper(), command[1:]
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            return self.bulk(self.get(args[0]))
+        if name == b"MGET":
+            return b"*%d\r\n" % len(args) + b"".join(self.bulk(self.get(key)) for key in args)
+        if name == b"SET":
+            expires = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires = time.monotonic() + int(args[3]) / 1000
+            self.data[args[0]] = (expires, args[1])
+            return b"+OK\r\n"
+        if name == b"DEL":
+            deleted = sum(self.data.pop(key, None) is not None for key in args)
+            return b":%d\r\n" % deleted
+        if name == b"INCR":
+            value = int(self.get(args[0]) or 0) + 1
+            self.data[args[0]] = (None, str(value).encode())
+            return b":%d\r\n" % value
+        return b"-ERR unknown command '%s'\r\n" % name
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                command = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    command.append((await reader.readexactly(length + 2))[:-2])
+                self.commands.append(command)
+                writer.write(self.run(command))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def redis_server():
+    server = RedisStandIn()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+def shared_path(tmp_path):
+    return str(tmp_path / "guardian-cache")
+
+
+@pytest.fixture(params=["memory", "shared", "redis"])
+async def backend(request, shared_path, redis_server):
+    if request.param == "memory":
+        yield MemoryCacheBackend()
+    elif request.param == "shared":
+        backend = SharedMemoryCacheBackend(path=shared_path, slots=64)
+        yield backend
+        backend.close()
+    else:
+        backend = RedisCacheBackend(url=redis_server.url)
+        yield backend
+        await backend.close()
+
+
+async def test_backends_implement_the_protocol(backend):
+    assert isinstance(backend, CacheBackend)
+
+    await backend.set_many({"a": True, "b": [1, 2]})
+
+    assert await backend.get_many(["a", "b", "c"]) == {"a": True, "b": [1, 2]}
+    assert await backend.get("b") == [1, 2]
+
+    await backend.delete_many(["a"])
+    assert await backend.get_many(["a", "b"]) == {"b": [1, 2]}
+
+    await backend.clear()
+    assert await backend.get_many(["a", "b"]) == {}
+
+
+async def test_backends_bump_the_version(backend):
+    await backend.set("a", 1)
+    version = await backend.get_version()
+
+    assert await backend.incr_version() == version + 1
+    assert await backend.get_version() == version + 1
+    assert await backend.get("a") is None
+
+
+async def test_decision_cache_works_with_every_backend(backend):
+    cache = DecisionCache(ttl=None, backend=backend)
+
+    await cache.set_many({(1, 1, "view"): True, (12, 1, "view"): False, (2, 1, "view"): True})
+
+    assert await cache.get_many([(1, 1, "view"), (12, 1, "view")]) == {
+        (1, 1, "view"): True,
+        (12, 1, "view"): False,
+    }
+
+    await cache.invalidate_users([1])
+
+    assert await cache.get((1, 1, "view")) is None
+    assert await cache.get((1, 1, "edit")) is None
+
+
+async def test_memory_backend_expires_and_evicts():
+    timer = FakeTimer()
+    backend = MemoryCacheBackend(maxsize=2, timer=timer)
+
+    await backend.set("a", 1, ttl=5)
+    await backend.set("b", 2)
+    await backend.get("a")
+    await backend.set("c", 3)
+
+    assert await backend.keys() == ["a", "c"]
+
+    timer.now += 5
+    assert await backend.get_many(["a", "c"]) == {"c": 3}
+
+
+async def test_shared_backend_is_shared_between_instances(shared_path):
+    timer = FakeTimer()
+    first = SharedMemoryCacheBackend(path=shared_path, slots=64, timer=timer)
+    second = SharedMemoryCacheBackend(path=shared_path, slots=64, timer=timer)
+
+    await first.set("a", True, ttl=10)
+    await first.set("b", "x" * 1000)
+
+    # Values that do not fit in a slot are not cached
+    assert await second.get_many(["a", "b"]) == {"a": True}
+
+    await second.incr_version()
+    assert await first.get("a") is None
+
+    await first.set("a", False, ttl=10)
+    timer.now += 10
+    assert await second.get("a") is None
+
+    first.close()
+    second.close()
+
+
+async def test_shared_backend_overwrites_when_the_probing_window_is_full(shared_path):
+    backend = SharedMemoryCacheBackend(path=shared_path, slots=4, max_probes=2)
+
+    await backend.set_many({f"key-{index}": index for index in range(10)})
+
+    assert len(await backend.keys()) <= 4
+    assert await backend.get("key-9") == 9
+
+    backend.close()
+
+
+async def test_redis_backend_pipelines_and_follows_the_version(redis_server):
+    first = RedisCacheBackend(url=redis_server.url, prefix="test")
+    second = RedisCacheBackend(url=redis_server.url, prefix="test")
+
+    await first.set_many({"a": 1, "b": 2}, ttl=60)
+    assert await second.get_many(["a", "b"]) == {"a": 1, "b": 2}
+
+    # One round trip reads the version and the keys
+    redis_server.commands.clear()
+    await second.get_many(["a", "b"])
+    assert [command[0] for command in redis_server.commands] == [b"GET", b"MGET"]
+
+    await first.incr_version()
+    assert await second.get_many(["a", "b"]) == {}
+
+    with pytest.raises(CacheBackendError):
+        await first.execute(("UNKNOWN",))
+
+    await first.close()
+    await second.close()
+
+
+async def test_redis_backend_connects_once_for_concurrent_first_calls(redis_server):
+    writer = RedisCacheBackend(url=redis_server.url)
+    await writer.set("a", 1)
+    await writer.close()
+    redis_server.commands.clear()
+
+    backend = RedisCacheBackend(url=redis_server.url)
+
+    results = await asyncio.gather(*(backend.get_many(["a"]) for _ in range(20)))
+
+    assert results == [{"a": 1}] * 20
+    assert [command for command in redis_server.commands if command[0] == b"SELECT"] == [
+        [b"SELECT", b"1"]
+    ]
+
+    # The decisions stored remotely cannot be counted
+    with pytest.raises(TypeError):
+        len(DecisionCache(backend=backend))
+
+    await backend.close()
+
+
+async def test_decisions_of_a_user_are_invalidated_with_its_tag(redis_server):
+    backend = RedisCacheBackend(url=redis_server.url)
+    cache = DecisionCache(backend=backend)
+    assert cache.tagged is True
+
+    await cache.set_many({(1, 2, "view"): True, (1, 2, "edit"): False, (3, 2, "view"): True})
+    assert await cache.get_many([(1, 2, "view"), (1, 2, "edit")]) == {
+        (1, 2, "view"): True,
+        (1, 2, "edit"): False,
+    }
+
+    redis_server.commands.clear()
+    await cache.invalidate_users([1])
+
+    # Only the decisions of the user are dropped, not the whole cache
+    assert [command[0] for command in redis_server.commands] == [b"GET", b"DEL"]
+    assert await cache.get_many([(1, 2, "view"), (3, 2, "view")]) == {(3, 2, "view"): True}
+
+    await cache.replace((1, 2, "view"), False)
+    assert await cache.get((1, 2, "view")) is None
+
+    await cache.set((1, 2, "view"), False)
+    assert await cache.get((1, 2, "view")) is False
+
+    await backend.close()
+
+
+async def test_cache_backend_is_selected_in_the_settings(monkeypatch, shared_path):
+    monkeypatch.setattr(
+        edgy_settings.edgy_guardian,
+        "cache_backend",
+        "edgy_guardian.cache.backends.SharedMemoryCacheBackend",
+        raising=False,
+    )
+    monkeypatch.setattr(
+        edgy_settings.edgy_guardian,
+        "cache_backend_options",
+        {"path": shared_path, "slots": 64},
+        raising=False,
+    )
+    get_cache_backend.cache_clear()
+
+    try:
+        backend = get_cache_backend()
+        assert isinstance(backend, SharedMemoryCacheBackend)
+        assert backend.path == shared_path
+    finally:
+        get_cache_backend.cache_clear()
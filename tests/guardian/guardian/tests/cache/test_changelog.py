@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Changelog, Permission
+
+from edgy_guardian.cache import (
+    ChangeRecorder,
+    apply_changes_to_snapshot,
+    compact_changes,
+    get_changelog_follower,
+    get_changes_since,
+    get_decision_cache,
+    get_group_cache,
+    get_last_sequence,
+    make_decision_key,
+    mute_signals,
+)
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.enums import ChangeAction, ChangeRelation
+from edgy_guardian.exceptions import ChangelogTruncated
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    get_permission_snapshot,
+    has_group_permission,
+    has_user_perm,
+    remove_perm,
+)
+from tests.factories import ItemFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def follower(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "decision_cache", True)
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "group_cache", True)
+    follower = get_changelog_follower()
+    monkeypatch.setattr(follower, "interval", 0)
+    yield follower
+    follower.reset()
+
+
+async def test_writes_append_to_the_changelog(client):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    permission = await assign_perm("edit", [user], item)
+    # Granting an existing permission is not a change
+    await assign_perm("edit", [user], item)
+    await remove_perm("edit", [user], item)
+    group = await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+    changes = await get_changes_since(0)
+
+    assert [(change.action, change.relation) for change in changes] == [
+        (ChangeAction.ADD, ChangeRelation.USER_PERMISSION),
+        (ChangeAction.REMOVE, ChangeRelation.USER_PERMISSION),
+        (ChangeAction.ADD, ChangeRelation.GROUP_MEMBERSHIP),
+        (ChangeAction.ADD, ChangeRelation.GROUP_PERMISSION),
+        (ChangeAction.ADD, ChangeRelation.USER_PERMISSION),
+    ]
+    assert changes[0].permission_id == permission.id
+    assert changes[0].user_id == user.id
+    assert changes[2].group_id == group.id
+    assert [change.sequence for change in changes] == sorted(change.sequence for change in changes)
+
+    assert await get_changes_since(changes[-2].sequence) == changes[-1:]
+    assert await get_last_sequence() == changes[-1].sequence
+
+
+async def test_follower_applies_the_changes_of_other_processes(client, follower):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    permission = await assign_perm("edit", [user, user_two], item)
+
+    assert await has_user_perm(user, "edit", item) is True
+    assert await has_user_perm(user_two, "edit", item) is True
+    cached = len(get_decision_cache())
+
+    # Another process revokes the permission of the first user
+    through = Permission.meta.fields["users"].through
+    with mute_signals():
+        await through.query.filter(permission=permission, user=user).delete()
+    async with ChangeRecorder() as recorder:
+        recorder.add(
+            ChangeAction.REMOVE, ChangeRelation.USER_PERMISSION, permission=permission, user=user
+        )
+
+    assert await follower.catch_up() == 1
+
+    # The entry was updated in place instead of being thrown away
+    ctype = await get_content_type(item)
+    assert len(get_decision_cache()) == cached
+    assert await get_decision_cache().get(make_decision_key(user, ctype, "edit")) is False
+    assert await has_user_perm(user, "edit", item) is False
+    assert await has_user_perm(user_two, "edit", item) is True
+
+
+async def test_follower_applies_group_changes(client, follower):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    group = await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+    assert await has_group_permission(user=user, perm="view", group="admin") is True
+
+    # Another process removes the user from the group
+    with mute_signals():
+        await group.users.remove(user)
+    async with ChangeRecorder() as recorder:
+        recorder.add(ChangeAction.REMOVE, ChangeRelation.GROUP_MEMBERSHIP, user=user, group=group)
+
+    assert await follower.catch_up() == 1
+    assert get_group_cache().get_user_groups(user) == frozenset()
+    assert await has_group_permission(user=user, perm="view", group="admin") is False
+
+
+async def test_follower_waits_for_the_changes_committed_late(client, follower, monkeypatch):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    permission = await assign_perm("edit", [user, user_two], item)
+    await follower.catch_up()
+    sequence = follower.sequence
+
+    assert await has_user_perm(user, "edit", item) is True
+    assert await has_user_perm(user_two, "edit", item) is True
+
+    # Another process revokes both grants in two writes, the first one commits last
+    through = Permission.meta.fields["users"].through
+    with mute_signals():
+        await through.query.filter(permission=permission).delete()
+    async with ChangeRecorder() as recorder:
+        for revoked in (user, user_two):
+            recorder.add(
+                ChangeAction.REMOVE, ChangeRelation.USER_PERMISSION, permission=permission, user=revoked
+            )
+    late = await Changelog.query.get(id=sequence + 1)
+    await late.delete()
+
+    now = 0.0
+    monkeypatch.setattr(follower, "timer", lambda: now)
+
+    # The follower does not move past the missing sequence
+    assert await follower.catch_up() == 1
+    assert follower.sequence == sequence
+    assert await has_user_perm(user_two, "edit", item) is False
+
+    await Changelog.query.create(
+        id=late.id,
+        action=late.action,
+        relation=late.relation,
+        permission_id=late.permission_id,
+        user_id=late.user_id,
+    )
+
+    assert await follower.catch_up() == 2
+    assert follower.sequence == sequence + 2
+    assert await has_user_perm(user, "edit", item) is False
+
+    # A gap left by a rolled back write is skipped after the timeout
+    await assign_perm("view", [user], item)
+    await assign_perm("view", [user_two], item)
+    await Changelog.query.filter(id=sequence + 3).delete()
+
+    assert await follower.catch_up() == 1
+    assert follower.sequence == sequence + 2
+
+    now = follower.gap_timeout
+    assert await follower.catch_up() == 1
+    assert follower.sequence == sequence + 4
+    assert follower.gaps == {}
+
+
+async def test_compaction_truncates_the_changelog(client, follower):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await follower.catch_up()
+    sequence = follower.sequence
+
+    for perm in ("view", "edit", "delete"):
+        await assign_perm(perm, [user], item)
+
+    last = await get_last_sequence()
+    assert await compact_changes(before=last) == 2
+
+    # The last entry is always kept
+    assert await compact_changes() == 0
+    assert await Changelog.query.count() == 1
+
+    with pytest.raises(ChangelogTruncated):
+        await get_changes_since(sequence)
+
+    # A follower behind the compaction starts over
+    assert await follower.catch_up() == 0
+    assert follower.sequence == last
+
+
+async def test_apply_changes_to_snapshot(client):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await assign_perm("view", [user], item)
+    snapshot = await get_permission_snapshot(user)
+    sequence = await get_last_sequence()
+
+    await assign_perm("edit", [user], item)
+    await remove_perm("view", [user], item)
+
+    updated = await apply_changes_to_snapshot(snapshot, await get_changes_since(sequence))
+
+    assert snapshot.has_perm("view", item) is True
+    assert updated.has_perm("view", item) is False
+    assert updated.has_perm("edit", item) is True
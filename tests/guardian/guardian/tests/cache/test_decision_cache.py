@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Permission
+
+from edgy_guardian._internal._commit import replaying_after_commit
+from edgy_guardian.cache import DecisionCache, get_decision_cache, make_decision_key
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.exceptions import CacheBackendError
+from edgy_guardian.shortcuts import (
+    assign_bulk_perm,
+    assign_perm,
+    has_user_perm,
+    has_user_perms,
+    remove_bulk_perm,
+    remove_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def decision_cache(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "decision_cache", True)
+    cache = get_decision_cache()
+    await cache.clear()
+    yield cache
+    await cache.clear()
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_decision_cache_expires_entries():
+    timer = FakeTimer()
+    cache = DecisionCache(maxsize=10, ttl=5, timer=timer)
+
+    await cache.set((1, 1, "view"), True)
+    assert await cache.get((1, 1, "view")) is True
+
+    timer.now = 5
+    assert await cache.get((1, 1, "view")) is None
+    assert len(cache) == 0
+
+
+async def test_decision_cache_evicts_least_recently_used():
+    cache = DecisionCache(maxsize=2, ttl=None)
+
+    await cache.set((1, 1, "view"), True)
+    await cache.set((1, 1, "edit"), False)
+
+    # Touch the first key so the second one becomes the least recently used
+    assert await cache.get((1, 1, "view")) is True
+
+    await cache.set((1, 1, "delete"), True)
+
+    assert await cache.get((1, 1, "edit")) is None
+    assert await cache.get((1, 1, "view")) is True
+    assert await cache.get((1, 1, "delete")) is True
+
+
+async def test_replayed_invalidations_are_counted_again():
+    cache = DecisionCache(maxsize=10, ttl=None)
+
+    async with replaying_after_commit():
+        await cache.invalidate_users([1])
+        invalidations = cache.invalidations
+
+    # A decision computed before the commit is not stored
+    assert cache.invalidations == invalidations + 1
+
+
+async def test_make_decision_key_normalizes_codename():
+    assert make_decision_key(1, 2, "EDIT") == (1, 2, "edit")
+
+
+async def test_has_user_perm_is_served_from_cache(client, decision_cache):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await assign_perm(perm="edit", users=[user], obj=item)
+    hits = decision_cache.hits
+
+    assert await has_user_perm(user, "edit", item) is True
+    assert await has_user_perm(user, "EDIT", item) is True
+    assert decision_cache.hits == hits + 1
+
+    # Bypass guardian entirely, the cached decision is still served
+    await Permission.meta.fields["users"].through.query.delete()
+
+    assert await has_user_perm(user, "edit", item) is True
+
+
+async def test_assign_and_remove_invalidate_only_affected_keys(client, decision_cache):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+    ctype = await get_content_type(item)
+
+    assert await has_user_perm(user, "edit", item) is False
+    assert await has_user_perm(user_two, "edit", item) is False
+
+    await assign_perm(perm="edit", users=[user], obj=item)
+
+    assert await decision_cache.get(make_decision_key(user, ctype, "edit")) is None
+    assert await decision_cache.get(make_decision_key(user_two, ctype, "edit")) is False
+
+    assert await has_user_perm(user, "edit", item) is True
+
+    await remove_perm(perm="edit", users=[user], obj=item)
+
+    assert await has_user_perm(user, "edit", item) is False
+
+
+async def test_bulk_operations_invalidate_once(client, decision_cache):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+    product = await ProductFactory().build_and_save()
+
+    for obj in (item, product):
+        assert await has_user_perm(user, "view", obj) is False
+        assert await has_user_perm(user_two, "view", obj) is False
+
+    invalidations = decision_cache.invalidations
+
+    await assign_bulk_perm(perms=["view", "edit"], users=[user, user_two], objs=[item, product])
+
+    # Once, then once again after the commit of the write transaction
+    assert decision_cache.invalidations == invalidations + 2
+
+    for obj in (item, product):
+        assert await has_user_perm(user, "view", obj) is True
+        assert await has_user_perm(user_two, "view", obj) is True
+
+    await remove_bulk_perm(perms=["view"], users=[user], objs=[item, product])
+
+    assert await has_user_perm(user, "view", item) is False
+    assert await has_user_perm(user_two, "view", item) is True
+
+
+async def test_an_unavailable_backend_falls_back_to_the_database(
+    client, decision_cache, monkeypatch
+):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+    product = await ProductFactory().build_and_save()
+
+    await assign_perm(perm="edit", users=[user], obj=item)
+
+    async def unavailable(*args, **kwargs):
+        raise CacheBackendError("The cache backend is unavailable.")
+
+    for method in ("get_many", "set_many"):
+        monkeypatch.setattr(decision_cache.backend, method, unavailable)
+
+    assert await has_user_perm(user, "edit", item) is True
+    assert await has_user_perm(user, "edit", product) is False
+    assert await has_user_perms(user, [("edit", item), ("edit", product)]) == [True, False]
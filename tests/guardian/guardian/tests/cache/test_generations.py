@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Generation, Permission
+
+from edgy_guardian.cache import (
+    bump_generation,
+    get_decision_cache,
+    get_generation_tracker,
+    get_group_cache,
+    make_decision_key,
+    mute_signals,
+    write_transaction,
+)
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    has_group_permission,
+    has_user_perm,
+)
+from tests.factories import ItemFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "decision_cache", True)
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "group_cache", True)
+    tracker = get_generation_tracker()
+    monkeypatch.setattr(tracker, "interval", 0)
+    yield tracker
+    tracker.reset()
+
+
+async def test_writes_bump_the_generations(client):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await assign_perm("edit", [user], item)
+    group = await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+    generations = {(row.scope, row.key): row.value for row in await Generation.query.all()}
+
+    assert generations == {
+        ("global", ""): 2,
+        ("users", str(user.id)): 2,
+        ("groups", str(group.id)): 2,
+    }
+
+
+async def test_sync_invalidates_the_writes_of_other_processes(client, tracker):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    permission = await assign_perm("edit", [user, user_two], item)
+
+    assert await has_user_perm(user, "edit", item) is True
+    assert await has_user_perm(user_two, "edit", item) is True
+
+    # Another process revokes the permission of the first user
+    through = Permission.meta.fields["users"].through
+    with mute_signals():
+        await through.query.filter(permission=permission, user=user).delete()
+    await bump_generation(users=[user])
+
+    ctype = await get_content_type(item)
+    assert await has_user_perm(user, "edit", item) is False
+    assert await get_decision_cache().get(make_decision_key(user_two, ctype, "edit")) is True
+
+    # Nothing changed since the last sync
+    assert await tracker.sync() is False
+
+
+async def test_sync_invalidates_the_groups_of_other_processes(client, tracker):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    group = await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+    assert await has_group_permission(user=user, perm="view", group="admin") is True
+
+    # Another process removes the permission from the group
+    with mute_signals():
+        await group.permissions.remove((await group.permissions.all())[0])
+    await bump_generation(groups=[group])
+
+    assert await has_group_permission(user=user, perm="view", group="admin") is False
+    assert get_group_cache().get_user_groups(user) == frozenset({group.id})
+
+
+async def test_sync_is_throttled_by_the_interval(client, tracker):
+    user = await UserFactory().build_and_save()
+
+    assert await tracker.maybe_sync() is True
+
+    tracker.interval = 60
+    await bump_generation(users=[user])
+
+    assert await tracker.maybe_sync() is False
+    assert await tracker.sync() is True
+
+
+async def test_invalidations_are_replayed_after_the_commit(client, tracker):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+    key = make_decision_key(user, await get_content_type(item), "edit")
+    decision_cache = get_decision_cache()
+    group_cache = get_group_cache()
+
+    async with write_transaction():
+        await decision_cache.invalidate_many([key])
+        group_cache.invalidate_users([user])
+
+        # A concurrent read of the rows before the commit caches them again
+        await decision_cache.set(key, False)
+        group_cache.set_user_groups(user, [])
+
+    assert await decision_cache.get(key) is None
+    assert group_cache.get_user_groups(user) is None
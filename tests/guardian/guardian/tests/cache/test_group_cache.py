@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Group
+
+from edgy_guardian.cache import GroupCache, get_group_cache, mute_signals
+from edgy_guardian.shortcuts import (
+    assign_bulk_group_perm,
+    assign_group_perm,
+    has_group_permission,
+    remove_bulk_group_perm,
+    remove_group_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def group_cache(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "group_cache", True)
+    cache = get_group_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+async def test_group_cache_invalidation_accepts_instances_and_ids():
+    cache = GroupCache()
+    user = UserFactory().build()
+    user.id = 1
+
+    cache.set_user_groups(user, [1, 2])
+    cache.set_user_groups(2, [3])
+    cache.set_group_permissions(1, [10])
+
+    assert cache.get_user_groups(1) == frozenset({1, 2})
+
+    cache.invalidate_users([user, 2])
+    assert cache.get_user_groups(1) is None
+    assert cache.get_user_groups(2) is None
+    assert cache.get_group_permissions(1) == frozenset({10})
+
+    cache.set_group_id("admin", 1)
+    cache.set_group_id("staff", 2)
+
+    cache.invalidate_groups([1])
+    assert cache.get_group_permissions(1) is None
+    assert cache.get_group_id("admin") is None
+    assert cache.get_group_id("staff") == 2
+    assert len(cache) == 0
+
+
+async def test_group_cache_evicts_least_recently_used():
+    cache = GroupCache(maxsize=2)
+
+    cache.set_user_groups(1, [1])
+    cache.set_user_groups(2, [2])
+
+    # Touch the first user so the second one becomes the least recently used
+    assert cache.get_user_groups(1) == frozenset({1})
+
+    cache.set_user_groups(3, [3])
+    cache.set_group_permissions(1, [10])
+    cache.set_group_id("admin", 1)
+
+    assert cache.get_user_groups(2) is None
+    assert cache.get_user_groups(1) == frozenset({1})
+    assert cache.get_user_groups(3) == frozenset({3})
+    assert len(cache) == 3
+
+
+async def test_has_group_permission_is_served_from_cache(client, group_cache):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    group = await assign_group_perm(perm="create", users=[user], obj=item, group="admin")
+
+    assert await has_group_permission(user=user, perm="create", group="admin") is True
+    assert await has_group_permission(user=user, perm="CREATE", group=group) is True
+    assert await has_group_permission(user=user, perm="edit", group="admin") is False
+    assert await has_group_permission(user=user, perm="create", group="missing") is False
+
+    assert group_cache.get_user_groups(user) == frozenset({group.id})
+    assert len(group_cache.get_group_permissions(group)) == 1
+
+    # A write that bypasses guardian is not seen while the entries are cached
+    await group.permissions.remove((await group.permissions.all())[0])
+
+    assert await has_group_permission(user=user, perm="create", group="admin") is True
+
+
+async def test_group_writes_invalidate_the_cache(client, group_cache):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await assign_group_perm(perm="create", users=[user], obj=item, group="admin")
+
+    assert await has_group_permission(user=user, perm="create", group="admin") is True
+    assert await has_group_permission(user=user_two, perm="create", group="admin") is False
+
+    # Adding a member invalidates the membership of that user
+    await assign_group_perm(perm="edit", users=[user_two], obj=item, group="admin")
+
+    assert await has_group_permission(user=user_two, perm="create", group="admin") is True
+    assert await has_group_permission(user=user, perm="edit", group="admin") is True
+
+    # Revoking removes the permission from the group and the membership
+    await remove_group_perm(perm="edit", users=[user_two], obj=item, group="admin")
+
+    assert await has_group_permission(user=user, perm="edit", group="admin") is False
+    assert await has_group_permission(user=user_two, perm="create", group="admin") is False
+    assert await has_group_permission(user=user, perm="create", group="admin") is True
+
+
+async def test_bulk_group_writes_invalidate_the_cache(client, group_cache):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+    product = await ProductFactory().build_and_save()
+
+    await assign_bulk_group_perm(
+        perms=["create", "edit"], groups=["admin", "users"], users=[user], objs=[item, product]
+    )
+
+    assert await has_group_permission(user=user, perm="edit", group="users") is True
+
+    await remove_bulk_group_perm(
+        perms=["edit"], groups=["users"], users=[user], objs=[item, product]
+    )
+
+    assert await has_group_permission(user=user, perm="edit", group="users") is False
+    assert await has_group_permission(user=user, perm="edit", group="admin") is True
+
+    groups = await Group.guardian.filter(users__id__in=[user.id])
+    assert {group.name for group in groups} == {"admin"}
+
+
+async def test_renamed_and_deleted_groups_are_resolved_again(client, group_cache):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    group = await assign_group_perm(perm="create", users=[user], obj=item, group="admin")
+    assert await has_group_permission(user=user, perm="create", group="admin") is True
+
+    # As in a guardian write, the signal receivers do not see these
+    with mute_signals():
+        await group.update(name="staff")
+        assert group_cache.get_group_id("admin") is None
+        assert await has_group_permission(user=user, perm="create", group="admin") is False
+
+        other = await assign_group_perm(perm="edit", users=[user], obj=item, group="other")
+        assert await has_group_permission(user=user, perm="edit", group="other") is True
+        await other.delete()
+
+        assert group_cache.get_group_id("other") is None
+        assert await has_group_permission(user=user, perm="edit", group="other") is False
+
+
+async def test_created_groups_do_not_invalidate_the_cache(client, group_cache):
+    invalidations = group_cache.invalidations
+
+    group = await Group.query.create(name="new")
+    await Group(name="newer").save()
+    assert group_cache.invalidations == invalidations
+
+    # Saving an existing group may rename it
+    group.name = "renamed"
+    await group.save()
+    assert group_cache.invalidations > invalidations
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Group, Permission
+
+from edgy_guardian.cache import (
+    get_decision_cache,
+    get_group_cache,
+    get_signal_invalidator,
+    make_decision_key,
+)
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.permissions.catalog import get_permission_catalog
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    has_group_permission,
+    has_user_perm,
+)
+from tests.factories import ItemFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def invalidator(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "decision_cache", True)
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "group_cache", True)
+    return get_signal_invalidator()
+
+
+async def test_direct_writes_invalidate_the_decisions(client, invalidator):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    permission = await assign_perm("edit", [user, user_two], item)
+
+    assert await has_user_perm(user, "edit", item) is True
+    assert await has_user_perm(user_two, "edit", item) is True
+
+    # Written with Edgy, behind the back of the guardian APIs
+    await permission.users.remove(user)
+    await invalidator.wait()
+
+    ctype = await get_content_type(item)
+    assert await get_decision_cache().get(make_decision_key(user, ctype, "edit")) is None
+    assert await get_decision_cache().get(make_decision_key(user_two, ctype, "edit")) is True
+    assert await has_user_perm(user, "edit", item) is False
+
+    # The affected rows of a queryset write are unknown
+    through = Permission.meta.fields["users"].through
+    await through.query.filter(permission=permission).delete()
+    await invalidator.wait()
+
+    assert len(get_decision_cache()) == 0
+    assert await has_user_perm(user_two, "edit", item) is False
+
+
+async def test_direct_writes_invalidate_the_groups(client, invalidator):
+    user = await UserFactory().build_and_save()
+    user_two = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    group = await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+    assert await has_group_permission(user=user_two, perm="view", group="admin") is False
+
+    await group.users.add(user_two)
+    await invalidator.wait()
+
+    assert get_group_cache().get_user_groups(user_two) is None
+    assert await has_group_permission(user=user_two, perm="view", group="admin") is True
+
+    # Renaming the group drops the name cache
+    await Group.query.filter(id=group.id).update(name="staff")
+    await invalidator.wait()
+
+    assert get_group_cache().get_group_id("admin") is None
+    assert await has_group_permission(user=user_two, perm="view", group="admin") is False
+
+
+async def test_permission_changes_clear_the_catalog(client, invalidator):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    permission = await assign_perm("edit", [user], item)
+    assert get_permission_catalog().get_for_id(permission.id) is not None
+
+    await Permission.query.filter(id=permission.id).update(codename="change")
+    await invalidator.wait()
+
+    assert get_permission_catalog().get_for_id(permission.id) is None
+    assert await has_user_perm(user, "edit", item) is False
+    assert await has_user_perm(user, "change", item) is True
+
+
+async def test_guardian_writes_do_not_go_through_the_signals(client, invalidator):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    passes = invalidator.passes
+    await assign_perm("edit", [user], item)
+    await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+    await invalidator.wait()
+
+    assert invalidator.passes == passes
+
+
+async def test_invalidations_are_batched_per_tick(client, invalidator):
+    through = Permission.meta.fields["users"].through
+    passes = invalidator.passes
+
+    for index in range(10_000):
+        await through.meta.signals.post_delete.send_async(
+            through,
+            instance=None,
+            model_instance=SimpleNamespace(permission=1, user=index),
+        )
+
+    assert invalidator.decision_users == set(range(10_000))
+
+    await invalidator.wait()
+
+    assert invalidator.passes == passes + 1
+    assert invalidator.is_pending is False
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Permission
+
+from edgy_guardian.cache import SingleFlight, get_decision_cache, get_single_flight
+from edgy_guardian.content_types.registry import get_content_type_registry
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    has_group_permission,
+    has_user_perm,
+)
+from tests.factories import ItemFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def single_flight(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "single_flight", True)
+    flight = get_single_flight()
+    flight.reset()
+    return flight
+
+
+async def test_identical_lookups_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def lookup(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    results = await asyncio.gather(
+        *(flight.do("double", 1, lambda: lookup(1)) for _ in range(5)),
+        flight.do("double", 2, lambda: lookup(2)),
+    )
+
+    assert results == [2, 2, 2, 2, 2, 4]
+    assert calls == [1, 2]
+    assert flight.calls["double"] == 2
+    assert flight.saved["double"] == 4
+    assert len(flight) == 0
+
+    # Once finished, nothing is kept
+    assert await flight.do("double", 1, lambda: lookup(1)) == 2
+    assert calls == [1, 2, 1]
+
+
+async def test_errors_are_shared():
+    flight = SingleFlight()
+
+    async def lookup():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("fail", None, lookup), flight.do("fail", None, lookup), return_exceptions=True
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flight.calls["fail"] == 1
+
+
+async def test_a_waiter_takes_over_when_the_first_caller_is_cancelled():
+    flight = SingleFlight()
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    first = asyncio.ensure_future(flight.do("count", None, lookup))
+    second = asyncio.ensure_future(flight.do("count", None, lookup))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 2
+    assert first.cancelled()
+    assert flight.calls["count"] == 2
+    assert flight.saved["count"] == 0
+
+
+async def test_concurrent_checks_share_a_query(client, single_flight):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await assign_perm("edit", [user], item)
+    await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+    assert await asyncio.gather(*(has_user_perm(user, "edit", item) for _ in range(10))) == [
+        True
+    ] * 10
+    assert await asyncio.gather(
+        *(has_group_permission(user=user, perm="VIEW", group="admin") for _ in range(10))
+    ) == [True] * 10
+
+    assert single_flight.calls["has_permission"] == 1
+    assert single_flight.saved["has_permission"] == 9
+    assert single_flight.calls["has_group_permission"] == 1
+    assert single_flight.saved["has_group_permission"] == 9
+
+
+async def test_lookups_inside_a_transaction_are_not_shared(client):
+    flight = SingleFlight()
+    database = Permission.database
+
+    async def lookup():
+        await asyncio.sleep(0.01)
+        return True
+
+    async def in_transaction():
+        async with database.transaction():
+            return await flight.do("lookup", None, lookup, database)
+
+    results = await asyncio.gather(
+        flight.do("lookup", None, lookup, database),
+        in_transaction(),
+        flight.do("lookup", None, lookup, database),
+    )
+
+    assert results == [True] * 3
+    assert flight.calls["lookup"] == 2
+    assert flight.saved["lookup"] == 1
+
+
+async def test_checks_after_an_invalidation_do_not_join_earlier_ones(client, single_flight):
+    user = await UserFactory().build_and_save()
+    item = await ItemFactory().build_and_save()
+
+    await assign_perm("edit", [user], item)
+
+    async def invalidate():
+        await get_decision_cache().invalidate_users([user])
+
+    await asyncio.gather(
+        has_user_perm(user, "edit", item), invalidate(), has_user_perm(user, "edit", item)
+    )
+
+    assert single_flight.calls["has_permission"] == 2
+    assert single_flight.saved["has_permission"] == 0
+
+
+async def test_concurrent_content_type_misses_share_a_query(client, single_flight):
+    item = await ItemFactory().build_and_save()
+    get_content_type_registry().clear()
+
+    ctypes = await asyncio.gather(*(get_content_type(item) for _ in range(10)))
+
+    assert {ctype.id for ctype in ctypes} == {ctypes[0].id}
+    assert single_flight.calls["get_for_model"] == 1
+    assert single_flight.saved["get_for_model"] == 9
@@ -3,6 +3,10 @@ from __future__ import annotations
 import pytest
 from contenttypes.models import ContentType
 from edgy import settings
+from items.models import Item
+from products.models import Product
+
+from tests.factories import ItemFactory
 
 pytestmark = pytest.mark.anyio
 
@@ -30,8 +34,50 @@ async def test_cache(client):
 
     ContentType.guardian.clear_cache()
 
-    assert ContentType.guardian._cache == {}
+    assert len(ContentType.guardian._cache) == 0
 
     content_type = await ContentType.guardian.get_for_id(1)
 
     assert content_type is not None
+
+
+async def test_cache_is_indexed_by_id_natural_key_and_model(client):
+    ContentType.guardian.clear_cache()
+
+    content_type = await ContentType.guardian.get_for_model(Item)
+
+    assert ContentType.guardian._cache.get_for_id(content_type.id) is content_type
+    assert ContentType.guardian._cache.get_for_model(Item) is content_type
+    assert (
+        ContentType.guardian._cache.get_by_natural_key(content_type.app_label, content_type.model)
+        is content_type
+    )
+    assert await ContentType.guardian.get_for_id(content_type.id) is content_type
+
+
+async def test_get_for_ids(client):
+    content_types = await ContentType.guardian.all()
+    ids = [ctype.id for ctype in content_types]
+
+    ContentType.guardian.clear_cache()
+    await ContentType.guardian.get_for_id(ids[0])
+
+    result = await ContentType.guardian.get_for_ids(ids + [ids[0], 9999])
+
+    assert set(result) == set(ids)
+    assert all(result[ctype.id].model == ctype.model for ctype in content_types)
+    assert len(ContentType.guardian._cache) == len(ids)
+
+
+async def test_get_for_models(client):
+    ContentType.guardian.clear_cache()
+
+    item = await ItemFactory().build_and_save()
+    item_two = await ItemFactory().build_and_save()
+
+    result = await ContentType.guardian.get_for_models([item, item_two, Product, "users"])
+
+    assert set(result) == {Item, Product, "users"}
+    assert result[Item].model == Item.meta.tablename
+    assert result[Product].model == Product.meta.tablename
+    assert result["users"].model == "users"
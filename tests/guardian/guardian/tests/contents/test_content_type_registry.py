@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from contenttypes.models import ContentType
+from edgy import Registry
+from edgy.conf import settings as edgy_settings
+from items.models import Item
+from products.models import Product
+
+from edgy_guardian.content_types.registry import get_content_type_registry
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.loader import handle_content_types
+from tests.factories import ItemFactory
+
+pytestmark = pytest.mark.anyio
+
+models = edgy_settings.edgy_guardian.registry
+
+
+async def test_registry_is_filled_by_handle_content_types(client):
+    registry = get_content_type_registry()
+    content_types = await ContentType.guardian.all()
+
+    assert registry.is_ready is True
+    assert len(registry) == len(content_types)
+
+    for ctype in content_types:
+        assert registry.get_for_id(ctype.id).id == ctype.id
+        assert registry.get_by_natural_key(ctype.app_label, ctype.model).id == ctype.id
+
+
+async def test_get_content_type_does_not_query(client):
+    item = await ItemFactory().build_and_save()
+    ctype = await ContentType.guardian.get(model=Item.meta.tablename)
+
+    # Remove the row behind the back of the registry, the lookup is served from memory
+    await ContentType.guardian.filter(id=ctype.id).delete()
+
+    content_type = await get_content_type(item)
+
+    assert content_type.id == ctype.id
+    assert (await get_content_type(Item)).id == ctype.id
+    assert (await get_content_type(Item.meta.tablename)).id == ctype.id
+
+
+async def test_registry_is_refreshed(client):
+    registry = get_content_type_registry()
+    product_ctype = registry.get_for_model(Product)
+
+    assert product_ctype is not None
+
+    new_registry = Registry(database=models.database)
+    new_registry.models = {
+        k: v for k, v in models.models.items() if k == "User" or k == "ContentType"
+    }
+    edgy_settings.edgy_guardian.register(new_registry)
+
+    try:
+        await handle_content_types()
+    finally:
+        # Rollback to original registry
+        edgy_settings.edgy_guardian.register(models)
+
+    assert len(registry) == 2
+    assert registry.get_for_model(Product) is None
+    assert registry.get_for_id(product_ctype.id) is None
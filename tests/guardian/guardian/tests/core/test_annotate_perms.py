@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+from items.models import Item
+from permissions.models import Permission
+
+from edgy_guardian.shortcuts import (
+    annotate_perms,
+    assign_group_perm,
+    assign_perm,
+    remove_perm,
+)
+from tests.factories import ItemFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestAnnotatePerms:
+    async def test_flags_are_loaded_with_the_rows(self, client, monkeypatch):
+        user = await UserFactory().build_and_save()
+        items = [await ItemFactory().build_and_save() for _ in range(4)]
+
+        await assign_perm(perm="edit", users=[user], obj=items[0])
+
+        database = Permission.database
+        fetch_all = database.fetch_all
+        statements = []
+
+        async def counting_fetch_all(*args, **kwargs):
+            statements.append(args)
+            return await fetch_all(*args, **kwargs)
+
+        monkeypatch.setattr(database, "fetch_all", counting_fetch_all)
+
+        annotated = await annotate_perms(user, ["EDIT", "delete"], Item).order_by("id").limit(3)
+
+        assert len(statements) == 1
+        assert [item.id for item in annotated] == [item.id for item in items[:3]]
+        assert all(item.can_edit is True and item.can_delete is False for item in annotated)
+
+    async def test_group_permissions_count(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        await assign_group_perm(perm="delete", users=[user], obj=item, group="moderators")
+        # Keep the group grant only
+        await remove_perm(perm="delete", users=[user], obj=item)
+
+        (annotated,) = await user.annotate_perms(["delete", "view"], Item.query.filter(id=item.id))
+
+        assert annotated.can_delete is True
+        assert annotated.can_view is False
+        assert annotated.name == item.name
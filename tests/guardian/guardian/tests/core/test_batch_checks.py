@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+from edgy.conf import settings as edgy_settings
+from permissions.models import Permission
+
+from edgy_guardian.cache import get_decision_cache, make_decision_key
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.shortcuts import assign_perm, has_user_perm, has_user_perms
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestHasUserPerms:
+    async def test_matches_single_checks(self, client):
+        user = await UserFactory().build_and_save()
+        user_two = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="create", users=[user], obj=item)
+        edit = await assign_perm(perm="edit", users=[user], obj=item)
+        await assign_perm(perm="update", users=[user], obj=product)
+        await assign_perm(perm="delete", users=[user_two], obj=product)
+
+        checks = [
+            (perm, obj)
+            for perm in ("create", "EDIT", edit, "update", "delete")
+            for obj in (item, product)
+        ]
+
+        decisions = await has_user_perms(user, checks)
+
+        assert decisions == [await Permission.has_permission(user, perm, obj) for perm, obj in checks]
+        assert decisions == [True, False, True, False, True, False, False, True, False, False]
+
+    async def test_keeps_the_input_order_and_duplicates(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="view", users=[user], obj=product)
+
+        assert await user.has_perms(
+            [("view", product), ("view", item), ("view", product), ("view", "products")]
+        ) == [True, False, True, True]
+        assert await has_user_perms(user, []) == []
+
+    async def test_uses_the_decision_cache(self, client, monkeypatch):
+        monkeypatch.setattr(edgy_settings.edgy_guardian, "decision_cache", True)
+        await get_decision_cache().clear()
+
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+
+        assert await has_user_perm(user, "edit", item) is True
+
+        misses = get_decision_cache().misses
+        assert await has_user_perms(user, [("edit", item), ("edit", product)]) == [True, False]
+        assert get_decision_cache().misses == misses + 1
+
+        ctype = await get_content_type(product)
+        assert await get_decision_cache().get(make_decision_key(user, ctype, "edit")) is False
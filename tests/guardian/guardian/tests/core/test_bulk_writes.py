@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import pytest
+from permissions.models import Permission
+from sqlalchemy.exc import IntegrityError
+
+from edgy_guardian._internal import _through
+from edgy_guardian._internal._through import add_pairs, get_through_table
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.permissions.catalog import get_permission_catalog
+from edgy_guardian.shortcuts import (
+    assign_bulk_perm,
+    assign_perm,
+    has_user_perms,
+    remove_bulk_perm,
+    remove_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+def count_statements(monkeypatch, kind):
+    database = Permission.database
+    statements = []
+
+    for name in ("execute", "fetch_all"):
+        method = getattr(database, name)
+
+        async def counting(query, *args, method=method, **kwargs):
+            if getattr(query, kind, False) and query.table.name == "permissionusersthrough":
+                statements.append(query)
+            return await method(query, *args, **kwargs)
+
+        monkeypatch.setattr(database, name, counting)
+    return statements
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    return count_statements(monkeypatch, "is_insert")
+
+
+@pytest.fixture
+def deletes(monkeypatch):
+    return count_statements(monkeypatch, "is_delete")
+
+
+class TestMultiRowGrants:
+    async def test_one_insert_for_many_users(self, client, inserts):
+        users = [await UserFactory().build_and_save() for _ in range(25)]
+        item = await ItemFactory().build_and_save()
+
+        permission = await assign_perm(perm="view", users=users, obj=item)
+
+        assert len(inserts) == 1
+        assert await permission.users.count() == 25
+
+        # Existing relations are skipped by the insert itself
+        await assign_perm(perm="view", users=users[:5], obj=item)
+        assert len(inserts) == 2
+        assert await permission.users.count() == 25
+
+    async def test_bulk_grants_report_the_rows_inserted(self, client, inserts):
+        users = [await UserFactory().build_and_save() for _ in range(4)]
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=users[:1], obj=item)
+        inserts.clear()
+
+        added = await assign_bulk_perm(perms=["edit", "view"], users=users, objs=[item, product])
+
+        assert added == 4 * 4 - 1
+        assert len(inserts) == 1
+        assert await has_user_perms(users[3], [("edit", item), ("view", product)]) == [True, True]
+        assert await assign_bulk_perm(perms=["edit"], users=users, objs=[item]) == 0
+
+    async def test_pairs_inserted_concurrently_are_skipped(self, client, monkeypatch):
+        users = [await UserFactory().build_and_save() for _ in range(3)]
+        item = await ItemFactory().build_and_save()
+
+        permission = await assign_perm(perm="view", users=users[:1], obj=item)
+
+        # Another transaction inserted the first grant after it was looked up
+        database = Permission.database
+        fetch_all = database.fetch_all
+
+        async def fetch_all_missing_existing(query, *args, **kwargs):
+            if getattr(query, "is_select", False):
+                return []
+            return await fetch_all(query, *args, **kwargs)
+
+        monkeypatch.setattr(database, "fetch_all", fetch_all_missing_existing)
+        through = get_through_table(Permission, "users")
+        added = await add_pairs(through, [(permission.id, user.id) for user in users])
+        monkeypatch.setattr(database, "fetch_all", fetch_all)
+
+        assert added == [(permission.id, user.id) for user in users[1:]]
+        assert await permission.users.count() == 3
+
+    async def test_without_on_conflict_only_concurrent_pairs_are_skipped(
+        self, client, monkeypatch
+    ):
+        users = [await UserFactory().build_and_save() for _ in range(3)]
+        item = await ItemFactory().build_and_save()
+
+        permission = await assign_perm(perm="view", users=users[:1], obj=item)
+        monkeypatch.setattr(_through, "get_conflict_insert", lambda dialect: None)
+
+        # Another transaction inserted the first grant after it was looked up
+        database = Permission.database
+        fetch_all = database.fetch_all
+        reads = []
+
+        async def fetch_all_missing_existing_once(query, *args, **kwargs):
+            if getattr(query, "is_select", False):
+                reads.append(query)
+                if len(reads) == 1:
+                    return []
+            return await fetch_all(query, *args, **kwargs)
+
+        monkeypatch.setattr(database, "fetch_all", fetch_all_missing_existing_once)
+        through = get_through_table(Permission, "users")
+        added = await add_pairs(through, [(permission.id, user.id) for user in users])
+        monkeypatch.setattr(database, "fetch_all", fetch_all)
+
+        assert added == [(permission.id, user.id) for user in users[1:]]
+        assert len(reads) == 2
+        assert await permission.users.count() == 3
+
+        # Any other error is raised instead of being retried
+        with pytest.raises(IntegrityError):
+            await add_pairs(through, [(permission.id, users[-1].id + 1000)])
+        assert await permission.users.count() == 3
+
+
+class TestSetBasedRevokes:
+    async def test_one_delete_for_many_users(self, client, deletes):
+        users = [await UserFactory().build_and_save() for _ in range(25)]
+        item = await ItemFactory().build_and_save()
+
+        permission = await assign_perm(perm="view", users=users[:20], obj=item)
+
+        assert await remove_perm("view", users, item) == 20
+        assert len(deletes) == 1
+        assert await permission.users.count() == 0
+
+        # Nothing left to remove is not an error
+        assert await remove_perm("view", users[:1], item) == 0
+
+    async def test_bulk_revokes_report_the_rows_removed(self, client, deletes):
+        users = [await UserFactory().build_and_save() for _ in range(3)]
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_bulk_perm(perms=["edit", "view"], users=users, objs=[item, product])
+        await remove_perm("edit", users[:1], item)
+        deletes.clear()
+
+        assert await remove_bulk_perm(perms=["edit", "view"], users=users, objs=[item, product]) == 11
+        assert len(deletes) == 1
+        assert await has_user_perms(users[2], [("edit", item), ("view", product)]) == [False, False]
+
+
+class TestScopedBulkWrites:
+    async def grant_all(self, inserts, unrelated):
+        users = [await UserFactory().build_and_save() for _ in range(3)]
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        # Unrelated permissions, already held by another user
+        other = await UserFactory().build_and_save()
+        codenames = [f"unrelated_{index}" for index in range(unrelated)]
+        await get_permission_catalog().bulk_get_or_create([await get_content_type(product)], codenames)
+        if codenames:
+            await assign_bulk_perm(perms=codenames, users=[other], objs=[product])
+        inserts.clear()
+
+        added = await assign_bulk_perm(perms=["edit", "view"], users=users, objs=[item])
+        return users, item, other, product, codenames, added
+
+    @pytest.mark.parametrize("unrelated", [0, 200])
+    async def test_cost_does_not_grow_with_the_permission_table(self, client, inserts, unrelated):
+        users, item, other, product, codenames, added = await self.grant_all(inserts, unrelated)
+
+        assert await Permission.guardian.count() == unrelated + 2
+        assert added == 3 * 2
+        assert len(inserts) == 1
+        assert len(inserts[0]._multi_values[0]) == 3 * 2
+
+        for permission in await Permission.guardian.all():
+            expected = 3 if permission.codename in ("edit", "view") else 1
+            assert await permission.users.count() == expected
+
+        # The rows granted are exactly the ones of the users on the item
+        granted = {
+            (permission.id, user.id)
+            for permission in await Permission.guardian.filter(codename__in=["edit", "view"])
+            for user in users
+        }
+        through = get_through_table(Permission, "users")
+        rows = await Permission.database.fetch_all(
+            through.table.select().where(through.source.in_([id for id, _ in granted]))
+        )
+        pairs = {(row._mapping[through.source.key], row._mapping[through.target.key]) for row in rows}
+        assert pairs == granted
+        assert await has_user_perms(other, [("edit", item), ("view", item)]) == [False, False]
+
+    async def test_revokes_leave_the_other_permissions_alone(self, client, inserts):
+        users, item, other, product, codenames, _ = await self.grant_all(inserts, 50)
+
+        assert await remove_bulk_perm(perms=["edit"], users=users + [other], objs=[item, product]) == 3
+        assert await has_user_perms(users[0], [("edit", item), ("view", item)]) == [False, True]
+        assert all(await has_user_perms(other, [(codename, product) for codename in codenames]))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+from permissions.models import Permission
+
+from edgy_guardian._internal import _upsert
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.permissions import catalog as catalog_module
+from edgy_guardian.permissions.catalog import PermissionCatalog, get_permission_catalog
+from edgy_guardian.shortcuts import assign_bulk_perm, assign_perm, has_user_perm
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def count_get_or_insert(monkeypatch):
+    calls = []
+
+    async def get_or_insert(model, values, unique_fields):
+        calls.append(values)
+        return await _upsert.get_or_insert(model, values, unique_fields)
+
+    monkeypatch.setattr(catalog_module, "get_or_insert", get_or_insert)
+    return calls
+
+
+class TestPermissionCatalog:
+    async def test_assign_perm_only_creates_on_miss(self, client, count_get_or_insert):
+        user = await UserFactory().build_and_save()
+        user_two = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+        await assign_perm(perm="edit", users=[user_two], obj=item)
+        await assign_perm(perm="EDIT", users=[user_two], obj=item)
+
+        assert len(count_get_or_insert) == 1
+        assert await Permission.guardian.count() == 1
+        assert await has_user_perm(user, "edit", item) is True
+        assert await has_user_perm(user_two, "edit", item) is True
+
+    async def test_catalog_is_indexed_by_content_type_and_codename(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        ctype = await get_content_type(item)
+
+        permission = await assign_perm(perm="edit", users=[user], obj=item)
+        catalog = get_permission_catalog()
+
+        assert catalog.get(ctype, "edit") is permission
+        assert catalog.get(ctype.id, "Edit") is permission
+        assert catalog.get_for_id(permission.id) is permission
+
+    async def test_bulk_get_or_create_only_inserts_missing(self, client, monkeypatch):
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+        item_ctype = await get_content_type(item)
+        product_ctype = await get_content_type(product)
+
+        await Permission.guardian.create(content_type=item_ctype, codename="view", name="View")
+
+        catalog = PermissionCatalog()
+        permissions = await catalog.bulk_get_or_create(
+            [item_ctype, product_ctype, item_ctype], ["view", "EDIT"]
+        )
+
+        assert len(permissions) == 4
+        assert all(permission.id is not None for permission in permissions)
+        assert await Permission.guardian.count() == 4
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("The catalog should not query the database.")
+
+        monkeypatch.setattr(PermissionCatalog, "_get_or_insert", fail)
+
+        again = await catalog.bulk_get_or_create([product_ctype, item_ctype], ["edit", "view"])
+
+        assert {permission.id for permission in again} == {
+            permission.id for permission in permissions
+        }
+
+    async def test_assign_bulk_perm_uses_catalog(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_bulk_perm(perms=["view", "edit"], users=[user], objs=[item, product])
+
+        assert len(get_permission_catalog()) == 4
+        assert await has_user_perm(user, "view", product) is True
+
+    async def test_load(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+
+        catalog = PermissionCatalog()
+        await catalog.load()
+
+        assert len(catalog) == 1
+        assert catalog.get(await get_content_type(item), "edit") is not None
+
+    async def test_catalog_evicts_least_recently_used(self, client):
+        item = await ItemFactory().build_and_save()
+        ctype = await get_content_type(item)
+
+        catalog = PermissionCatalog(maxsize=2)
+        permissions = await catalog.bulk_get_or_create([ctype], ["view", "edit", "delete"])
+
+        assert [permission.codename for permission in permissions] == ["view", "edit", "delete"]
+        assert len(catalog) == 2
+        assert catalog.get(ctype, "view") is None
+
+        # Touch "edit" so "delete" becomes the least recently used
+        assert catalog.get(ctype, "edit") is not None
+        await catalog.get_or_create(ctype, "view")
+
+        assert catalog.get(ctype, "delete") is None
+        assert catalog.get_for_id(permissions[2].id) is None
+        assert catalog.get(ctype, "edit") is not None
+        assert await Permission.guardian.count() == 3
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from edgy.conf import settings as edgy_settings
+
+from edgy_guardian.permissions.coalescing import (
+    CheckBatcher,
+    get_group_check_batcher,
+    get_user_check_batcher,
+)
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    has_group_permission,
+    has_user_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def coalesce(monkeypatch):
+    monkeypatch.setattr(edgy_settings.edgy_guardian, "coalesce_checks", True)
+
+
+class TestCheckBatcher:
+    async def test_checks_of_the_same_tick_are_resolved_together(self):
+        calls = []
+
+        async def resolve(keys):
+            calls.append(keys)
+            return [key * 2 for key in keys]
+
+        batcher = CheckBatcher(resolve, max_batch_size=4)
+
+        assert await asyncio.gather(*(batcher.check(key) for key in range(10))) == [
+            key * 2 for key in range(10)
+        ]
+        assert calls == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        assert (batcher.batches, batcher.checks) == (3, 10)
+
+        # Sequential checks are not delayed behind each other
+        assert await batcher.check(1) == 2
+        assert calls[-1] == [1]
+
+    async def test_errors_reach_every_waiter(self):
+        async def resolve(keys):
+            raise ValueError("boom")
+
+        batcher = CheckBatcher(resolve)
+        results = await asyncio.gather(batcher.check(1), batcher.check(2), return_exceptions=True)
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert batcher.batches == 1
+
+    async def test_a_failing_batch_is_resolved_key_by_key(self):
+        calls = []
+
+        async def resolve(keys):
+            calls.append(keys)
+            if 2 in keys:
+                raise ValueError("boom")
+            return [key * 2 for key in keys]
+
+        batcher = CheckBatcher(resolve)
+        results = await asyncio.gather(
+            *(batcher.check(key) for key in range(4)), return_exceptions=True
+        )
+
+        assert results[:2] == [0, 2]
+        assert isinstance(results[2], ValueError)
+        assert results[3] == 6
+        assert calls == [[0, 1, 2, 3], [0], [1], [2], [3]]
+
+
+class TestCoalescedChecks:
+    async def test_concurrent_user_checks_share_a_query(self, client, coalesce):
+        user = await UserFactory().build_and_save()
+        user_two = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+        await assign_perm(perm="view", users=[user_two], obj=product)
+
+        checks = [
+            (check_user, perm, obj)
+            for check_user in (user, user_two)
+            for perm in ("edit", "VIEW")
+            for obj in (item, product)
+        ]
+
+        batcher = get_user_check_batcher()
+        batches = batcher.batches
+
+        decisions = await asyncio.gather(*(has_user_perm(*check) for check in checks))
+
+        assert batcher.batches == batches + 1
+        assert decisions == [True, False, False, False, False, False, False, True]
+
+    async def test_concurrent_group_checks_share_a_query(self, client, coalesce):
+        user = await UserFactory().build_and_save()
+        user_two = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        group = await assign_group_perm(perm="view", users=[user], obj=item, group="admin")
+
+        batcher = get_group_check_batcher()
+        batches = batcher.batches
+
+        decisions = await asyncio.gather(
+            has_group_permission(user=user, perm="view", group="admin"),
+            has_group_permission(user=user, perm="VIEW", group=group),
+            has_group_permission(user=user, perm="edit", group="admin"),
+            has_group_permission(user=user_two, perm="view", group="admin"),
+            has_group_permission(user=user, perm="view", group="staff"),
+        )
+
+        assert batcher.batches == batches + 1
+        assert decisions == [True, True, False, False, False]
@@ -555,13 +555,17 @@ class TestBulkPermission:
             objs=[item, product],
         )
 
-        has_permission = await has_user_perm(user=user, perm="create", obj=item)
+        has_permission = await has_user_perm(user=user, perm="delete", obj=item)
 
         assert has_permission is False
 
+        has_permission = await has_user_perm(user=user, perm="create", obj=item)
+
+        assert has_permission is True
+
         has_permission = await has_user_perm(user=user, perm="edit", obj=item)
 
-        assert has_permission is False
+        assert has_permission is True
 
 
 class TestBulkGroupPermission:
@@ -734,10 +738,14 @@ class TestBulkGroupPermission:
             revoke_users_permissions=True,
         )
 
-        has_permission = await has_user_perm(user=user, perm="create", obj=item)
+        has_permission = await has_user_perm(user=user, perm="delete", obj=item)
 
         assert has_permission is False
 
+        has_permission = await has_user_perm(user=user, perm="create", obj=item)
+
+        assert has_permission is True
+
         has_permission = await has_group_permission(user=user, perm="create", group="admin")
 
         assert has_permission is False
@@ -762,13 +770,10 @@ class TestBulkGroupPermission:
 
         assert has_permission is False
 
-        total_users_in_permission = await total_permissions[0].users.all()
-
-        assert len(total_users_in_permission) == 0
+        for permission in await Permission.guardian.all():
+            total_users_in_permission = await permission.users.all()
 
-        total_users_in_permission = await total_permissions[1].users.all()
-
-        assert len(total_users_in_permission) == 0
+            assert len(total_users_in_permission) == (0 if permission.codename == "delete" else 2)
 
     async def test_remove_bulk_group_perm_with_revoke_users_permissions_and_revoke_group_permissions(
         client,
@@ -824,10 +829,14 @@ class TestBulkGroupPermission:
             revoke_users_permissions=True,
         )
 
-        has_permission = await has_user_perm(user=user, perm="create", obj=item)
+        has_permission = await has_user_perm(user=user, perm="delete", obj=item)
 
         assert has_permission is False
 
+        has_permission = await has_user_perm(user=user, perm="create", obj=item)
+
+        assert has_permission is True
+
         has_permission = await has_group_permission(user=user, perm="create", group="admin")
 
         assert has_permission is False
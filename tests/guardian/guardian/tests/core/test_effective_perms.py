@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from permissions.models import Permission
+
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    get_obj_perms,
+    has_user_perm,
+    remove_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    database = Permission.database
+    statements = []
+
+    for name in ("fetch_all", "fetch_val"):
+        method = getattr(database, name)
+
+        async def counting(*args, method=method, **kwargs):
+            statements.append(args)
+            return await method(*args, **kwargs)
+
+        monkeypatch.setattr(database, name, counting)
+    return statements
+
+
+class TestEffectivePermissions:
+    async def test_has_user_perm_by_any_route(self, client, queries):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+        await assign_group_perm(perm="view", users=[user], obj=item, group="readers")
+        # Keep the group grant only
+        await remove_perm(perm="view", users=[user], obj=item)
+
+        assert await has_user_perm(user, "view", item) is False
+
+        queries.clear()
+        assert await has_user_perm(user, "VIEW", item, include_groups=True) is True
+        assert len(queries) == 1
+
+        assert await user.has_perm("edit", item, include_groups=True) is True
+        assert await has_user_perm(user, "delete", item, include_groups=True) is False
+        assert await has_user_perm(user, "view", product, include_groups=True) is False
+
+    async def test_get_obj_perms_lists_both_routes_once(self, client, queries):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+        await assign_group_perm(perm="edit", users=[user], obj=item, group="editors")
+        await assign_group_perm(perm="view", users=[user], obj=item, group="readers")
+        await remove_perm(perm="view", users=[user], obj=item)
+
+        assert [perm.codename for perm in await get_obj_perms(user, item)] == ["edit"]
+
+        queries.clear()
+        perms = await get_obj_perms(user, item, include_groups=True)
+        assert len(queries) == 1
+        assert sorted(perm.codename for perm in perms) == ["edit", "view"]
+
+        filtered = await user.obj_perms(item, include_groups=True, codename__iexact="VIEW")
+        assert [perm.codename for perm in filtered] == ["view"]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+from permissions.models import Permission
+
+from edgy_guardian.shortcuts import assign_group_perm, get_groups_with_perms
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestGetGroupsWithPerms:
+    async def test_groups_and_codenames_in_one_query(self, client, monkeypatch):
+        users = [await UserFactory().build_and_save() for _ in range(3)]
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_group_perm(perm="edit", users=users, obj=item, group="editors")
+        await assign_group_perm(perm="View", users=users[:1], obj=item, group="editors")
+        await assign_group_perm(perm="view", users=users[1:], obj=item, group="viewers")
+        await assign_group_perm(perm="view", users=users, obj=product, group="buyers")
+
+        database = Permission.database
+        fetch_all = database.fetch_all
+        statements = []
+
+        async def counting_fetch_all(*args, **kwargs):
+            statements.append(args)
+            return await fetch_all(*args, **kwargs)
+
+        monkeypatch.setattr(database, "fetch_all", counting_fetch_all)
+
+        groups = await get_groups_with_perms(item, with_member_count=True)
+
+        assert len(statements) == 1
+        assert [(group.name, group.member_count, codenames) for group, codenames in groups.items()] == [
+            ("editors", 3, {"edit", "view"}),
+            ("viewers", 2, {"view"}),
+        ]
+
+    async def test_without_member_count(self, client):
+        item = await ItemFactory().build_and_save()
+
+        assert len(await get_groups_with_perms(item)) == 0
+
+        user = await UserFactory().build_and_save()
+        await assign_group_perm(perm="edit", users=[user], obj=item, group="editors")
+
+        (group,) = await get_groups_with_perms(item)
+        assert group.name == "editors"
+        assert "member_count" not in group.__dict__
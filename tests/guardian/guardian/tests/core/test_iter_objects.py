@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+from items.models import Item
+from products.models import Product
+
+from edgy_guardian._internal._keyset import iter_keyset
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    iter_objects_for_user,
+    remove_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_iter_keyset_walks_the_primary_key(client):
+    items = [await ItemFactory().build_and_save() for _ in range(7)]
+
+    batches = [batch async for batch in iter_keyset(Item.query.all(), 3)]
+
+    assert [[item.id for item in batch] for batch in batches] == [
+        [item.id for item in items[:3]],
+        [item.id for item in items[3:6]],
+        [items[6].id],
+    ]
+    assert [batch async for batch in iter_keyset(Item.query.filter(id__lt=0), 3)] == []
+
+
+async def test_streams_the_objects_of_every_granted_model(client):
+    user = await UserFactory().build_and_save()
+    items = [await ItemFactory().build_and_save() for _ in range(5)]
+    products = [await ProductFactory().build_and_save() for _ in range(2)]
+
+    await assign_perm(perm="edit", users=[user], obj=items[0])
+    await assign_group_perm(perm="view", users=[user], obj=products[0], group="buyers")
+    # Keep the group grant only
+    await remove_perm(perm="view", users=[user], obj=products[0])
+
+    streamed: dict[type, list] = {}
+    async for ctype, batch in iter_objects_for_user(user, batch_size=2):
+        assert len(batch) <= 2
+        streamed.setdefault(ctype.model_class(), []).extend(obj.id for obj in batch)
+
+    assert streamed == {
+        Item: [item.id for item in items],
+        Product: [product.id for product in products],
+    }
+
+    direct = [ctype.model async for ctype, _ in iter_objects_for_user(user, include_groups=False)]
+    assert direct == ["items"]
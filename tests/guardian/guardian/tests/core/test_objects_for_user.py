@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from edgy import QuerySet
+from items.models import Item
+from permissions.models import Permission
+from products.models import Product
+
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    get_objects_for_user,
+    remove_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestGetObjectsForUser:
+    async def test_direct_and_group_grants(self, client):
+        user = await UserFactory().build_and_save()
+        user_two = await UserFactory().build_and_save()
+        items = [await ItemFactory().build_and_save() for _ in range(3)]
+        await ProductFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=items[0])
+        await assign_group_perm(perm="view", users=[user_two], obj=items[0], group="viewers")
+        # Keep the group grant only
+        await remove_perm(perm="view", users=[user_two], obj=items[0])
+
+        queryset = get_objects_for_user(user, "EDIT", Item)
+        assert isinstance(queryset, QuerySet)
+        assert {item.id for item in await queryset} == {item.id for item in items}
+
+        assert await get_objects_for_user(user, "view", Item).count() == 0
+        assert await get_objects_for_user(user, "edit", Product).count() == 0
+        assert await get_objects_for_user(user_two, "view", Item).count() == 3
+        assert await get_objects_for_user(user_two, "view", Item, include_groups=False).count() == 0
+
+    async def test_can_be_chained_and_runs_one_query(self, client, monkeypatch):
+        user = await UserFactory().build_and_save()
+        items = [await ItemFactory().build_and_save() for _ in range(5)]
+
+        await assign_perm(perm="edit", users=[user], obj=items[0])
+
+        queryset = user.objects_with_perm("edit", Item.query.exclude(id=items[0].id))
+
+        database = Permission.database
+        fetch_all = database.fetch_all
+        statements = []
+
+        async def counting_fetch_all(*args, **kwargs):
+            statements.append(args)
+            return await fetch_all(*args, **kwargs)
+
+        monkeypatch.setattr(database, "fetch_all", counting_fetch_all)
+
+        permitted = await queryset.filter(id__gte=items[1].id).order_by("-id").limit(2)
+
+        assert [item.id for item in permitted] == [items[4].id, items[3].id]
+        assert len(statements) == 1
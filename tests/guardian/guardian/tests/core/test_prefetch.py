@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+from permissions.models import Permission
+
+from edgy_guardian.shortcuts import (
+    assign_perm,
+    filter_permitted,
+    get_obj_perms,
+    prefetch_obj_perms,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    database = Permission.database
+    fetch_all = database.fetch_all
+    statements = []
+
+    async def counting_fetch_all(*args, **kwargs):
+        statements.append(args)
+        return await fetch_all(*args, **kwargs)
+
+    monkeypatch.setattr(database, "fetch_all", counting_fetch_all)
+    return statements
+
+
+class TestPrefetchObjPerms:
+    async def test_matches_get_obj_perms(self, client, queries):
+        user = await UserFactory().build_and_save()
+        items = [await ItemFactory().build_and_save() for _ in range(5)]
+        products = [await ProductFactory().build_and_save() for _ in range(3)]
+
+        await assign_perm(perm="edit", users=[user], obj=items[0])
+        await assign_perm(perm="Delete", users=[user], obj=items[0])
+        await assign_perm(perm="view", users=[user], obj=products[0])
+
+        objs = [*items, *products]
+        queries.clear()
+        perms = await user.prefetch_obj_perms(objs)
+
+        assert len(queries) == 1
+        assert len(perms) == len(objs)
+        assert list(perms) == objs
+        for obj in objs:
+            assert perms[obj] == {perm.codename for perm in await get_obj_perms(user, obj)}
+        assert perms[items[3]] == {"edit", "delete"}
+        assert perms[products[1]] == {"view"}
+
+    async def test_objects_are_looked_up_by_identity(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        perms = await prefetch_obj_perms(user, [item])
+
+        with pytest.raises(KeyError):
+            perms[ItemFactory().build()]
+        assert await prefetch_obj_perms(user, []) == {}
+
+
+class TestFilterPermitted:
+    async def test_keeps_the_permitted_objects_in_order(self, client, queries):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        item_two = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+
+        queries.clear()
+        permitted = await filter_permitted(user, "EDIT", [product, item, item_two, product])
+
+        assert permitted == [item, item_two]
+        assert len(queries) == 1
+        assert await user.filter_permitted("view", [item, product]) == []
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from edgy_guardian.shortcuts import assign_perm, get_obj_perms, get_permission_snapshot, has_user_perm
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+class TestPermissionSnapshot:
+    async def test_snapshot_matches_database_checks(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="create", users=[user], obj=item)
+        await assign_perm(perm="edit", users=[user], obj=item)
+        await assign_perm(perm="update", users=[user], obj=product)
+
+        snapshot = await user.permission_snapshot()
+
+        for perm in ("create", "edit", "EDIT", "update", "delete"):
+            for obj in (item, product):
+                assert snapshot.has_perm(perm, obj) is await has_user_perm(user, perm, obj)
+
+        assert {perm.id for perm in snapshot.perms_for(item)} == {
+            perm.id for perm in await get_obj_perms(user, item)
+        }
+        assert {perm.id for perm in snapshot.perms_for(product)} == {
+            perm.id for perm in await get_obj_perms(user, product)
+        }
+        assert len(snapshot) == 3
+
+    async def test_snapshot_only_contains_user_permissions(self, client):
+        user = await UserFactory().build_and_save()
+        user_two = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        await assign_perm(perm="edit", users=[user_two], obj=item)
+
+        snapshot = await get_permission_snapshot(user)
+
+        assert snapshot.has_perm("edit", item) is False
+        assert snapshot.perms_for(item) == []
+
+    async def test_snapshot_is_frozen(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+
+        snapshot = await user.permission_snapshot()
+
+        await assign_perm(perm="edit", users=[user], obj=item)
+
+        assert snapshot.has_perm("edit", item) is False
+
+        with pytest.raises(AttributeError):
+            snapshot.user_id = 2
+
+        with pytest.raises(TypeError):
+            snapshot.permissions["items"] = {}
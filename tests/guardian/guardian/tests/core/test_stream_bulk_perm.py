@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+from accounts.models import User
+from items.models import Item
+from permissions.models import Permission
+from products.models import Product
+
+from edgy_guardian.shortcuts import assign_perm, has_user_perms, stream_bulk_perm
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    database = Permission.database
+    statements = []
+
+    for name in ("execute", "fetch_all"):
+        method = getattr(database, name)
+
+        async def counting(query, *args, method=method, **kwargs):
+            if getattr(query, "is_insert", False) and query.table.name == "permissionusersthrough":
+                statements.append(query)
+            return await method(query, *args, **kwargs)
+
+        monkeypatch.setattr(database, name, counting)
+    return statements
+
+
+async def agen(iterable):
+    for item in iterable:
+        yield item
+
+
+class TestStreamBulkPerm:
+    async def test_product_of_async_iterables(self, client):
+        users = [await UserFactory().build_and_save() for _ in range(7)]
+        item = await ItemFactory().build_and_save()
+
+        await assign_perm(perm="view", users=users[:1], obj=item)
+
+        added = await stream_bulk_perm(
+            users=agen(users), perms=agen(["VIEW", "edit"]), objs=agen([item, Product]), chunk_size=5
+        )
+
+        assert added == 7 * 2 * 2 - 1
+        for user in users:
+            checks = [("view", item), ("edit", item), ("view", Product), ("edit", Product)]
+            assert await has_user_perms(user, checks) == [True] * 4
+
+    async def test_users_from_a_queryset(self, client):
+        users = [await UserFactory().build_and_save() for _ in range(3)]
+        item = await ItemFactory().build_and_save()
+
+        assert await stream_bulk_perm(users=User.query.all(), perms=["view"], objs=[Item]) == 3
+        assert all([await has_user_perms(user, [("view", item)]) == [True] for user in users])
+
+    async def test_explicit_triples(self, client):
+        user, user_two = [await UserFactory().build_and_save() for _ in range(2)]
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        triples = [(user, "view", item), (user_two, "Delete", product), (user, "view", item)]
+
+        assert await stream_bulk_perm(triples=agen(triples), chunk_size=2) == 2
+        assert await has_user_perms(user, [("view", item), ("delete", product)]) == [True, False]
+        assert await has_user_perms(user_two, [("view", item), ("delete", product)]) == [False, True]
+
+    async def test_one_insert_per_chunk(self, client, inserts):
+        users = [await UserFactory().build_and_save() for _ in range(10)]
+
+        # 2 permissions, so 2 users per chunk of 4 grants
+        await stream_bulk_perm(users=users, perms=["view", "edit"], objs=[Item], chunk_size=4)
+
+        assert [len(insert._multi_values[0]) for insert in inserts] == [4] * 5
+
+    async def test_a_failure_only_rolls_back_the_current_chunk(self, client, monkeypatch):
+        users = [await UserFactory().build_and_save() for _ in range(4)]
+        item = await ItemFactory().build_and_save()
+
+        assign_permission_pairs = Permission.assign_permission_pairs
+        chunks = []
+
+        # The second chunk is written, then fails before its transaction commits
+        async def fail_on_second_chunk(pairs):
+            chunks.append(pairs)
+            count = await assign_permission_pairs(pairs)
+            if len(chunks) == 2:
+                raise RuntimeError("The second chunk failed.")
+            return count
+
+        monkeypatch.setattr(Permission, "assign_permission_pairs", fail_on_second_chunk)
+
+        with pytest.raises(RuntimeError):
+            await stream_bulk_perm(users=users, perms=["view"], objs=[item], chunk_size=2)
+
+        assert len(chunks) == 2
+
+        assert await has_user_perms(users[0], [("view", item)]) == [True]
+        assert await has_user_perms(users[1], [("view", item)]) == [True]
+        assert await has_user_perms(users[2], [("view", item)]) == [False]
+        assert await has_user_perms(users[3], [("view", item)]) == [False]
+
+    async def test_arguments_are_exclusive(self, client):
+        with pytest.raises(ValueError):
+            await stream_bulk_perm(triples=[], users=[])
+
+        with pytest.raises(ValueError):
+            await stream_bulk_perm(users=[], perms=["view"])
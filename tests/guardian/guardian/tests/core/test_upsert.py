@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from permissions.models import Group, Permission
+from sqlalchemy.exc import IntegrityError
+
+from edgy_guardian._internal import _upsert
+from edgy_guardian.content_types.utils import get_content_type
+from edgy_guardian.permissions.catalog import PermissionCatalog
+from edgy_guardian.shortcuts import assign_bulk_group_perm, assign_group_perm, assign_perm, has_user_perm
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    database = Permission.database
+    fetch_all = database.fetch_all
+    queries = []
+
+    async def counting_fetch_all(query, *args, **kwargs):
+        queries.append(query)
+        return await fetch_all(query, *args, **kwargs)
+
+    monkeypatch.setattr(database, "fetch_all", counting_fetch_all)
+    return queries
+
+
+@pytest.fixture
+def without_conflict_insert(monkeypatch):
+    monkeypatch.setattr(_upsert, "get_conflict_insert", lambda dialect: None)
+
+
+class TestUpsert:
+    async def test_new_permission_in_a_single_statement(self, client, statements):
+        item = await ItemFactory().build_and_save()
+        statements.clear()
+
+        permission = await assign_perm(perm="edit", users=[], obj=item)
+
+        upserts = [query for query in statements if getattr(query, "table", None) is Permission.table]
+        assert len(upserts) == 1
+        assert upserts[0].is_insert
+        assert permission.id is not None
+        assert permission.codename == "edit"
+        assert (await Permission.guardian.get(id=permission.id)).name == "Edit"
+
+    async def test_concurrent_creations_do_not_conflict(self, client):
+        ctype = await get_content_type(await ItemFactory().build_and_save())
+
+        # Separate catalogs, so that every creation reaches the database
+        permissions = await asyncio.gather(
+            *(PermissionCatalog().get_or_create(ctype, "view") for _ in range(5))
+        )
+
+        assert len({permission.id for permission in permissions}) == 1
+        assert await Permission.guardian.count() == 1
+
+    async def test_groups_are_created_once(self, client):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_group_perm(perm="view", users=[user], obj=item, group="Editors")
+        await assign_bulk_group_perm(
+            perms=["view"], groups=["editors", "admins"], users=[user], objs=[item, product]
+        )
+
+        groups = await Group.guardian.all()
+        assert sorted(group.name for group in groups) == ["admins", "editors"]
+        assert [group.name for group in await Group.get_or_create_groups(["ADMINS", "editors"])] == [
+            "admins",
+            "editors",
+        ]
+
+    async def test_fallback_without_on_conflict(self, client, without_conflict_insert):
+        user = await UserFactory().build_and_save()
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await Group.guardian.create(name="editors")
+
+        groups = await Group.get_or_create_groups(["editors", "admins", "Admins"])
+        first = await assign_perm(perm="edit", users=[user], obj=item)
+        second = await assign_perm(perm="EDIT", users=[user], obj=product)
+
+        assert [group.name for group in groups] == ["editors", "admins", "admins"]
+        assert await Group.guardian.count() == 2
+        assert first.id != second.id
+        assert await Permission.guardian.count() == 2
+        assert await has_user_perm(user, "edit", item) is True
+
+    async def test_fallback_only_skips_rows_inserted_concurrently(
+        self, client, monkeypatch, without_conflict_insert
+    ):
+        await Group.guardian.create(name="editors")
+
+        # Another transaction inserted the group after it was looked up
+        database = Group.database
+        fetch_all = database.fetch_all
+        reads = []
+
+        async def fetch_all_missing_existing_once(query, *args, **kwargs):
+            reads.append(query)
+            if len(reads) == 1:
+                return []
+            return await fetch_all(query, *args, **kwargs)
+
+        monkeypatch.setattr(database, "fetch_all", fetch_all_missing_existing_once)
+        groups = await _upsert.get_or_insert(
+            Group, [{"name": "editors"}, {"name": "admins"}], unique_fields=["name"]
+        )
+        monkeypatch.setattr(database, "fetch_all", fetch_all)
+
+        assert sorted(group.name for group in groups) == ["admins", "editors"]
+        assert await Group.guardian.count() == 2
+
+        # Any other error is raised instead of being swallowed
+        with pytest.raises(IntegrityError):
+            await _upsert.get_or_insert(
+                Permission,
+                [{"content_type": 1_000_000, "codename": "edit", "name": "Edit"}],
+                unique_fields=["content_type", "codename"],
+            )
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+from items.models import Item
+
+from edgy_guardian.shortcuts import (
+    assign_group_perm,
+    assign_perm,
+    remove_perm,
+    users_with_perm,
+)
+from tests.factories import ItemFactory, ProductFactory, UserFactory
+
+pytestmark = pytest.mark.anyio
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestUsersWithPerm:
+    async def test_streams_direct_and_group_grants_once(self, client):
+        users = [await UserFactory().build_and_save() for _ in range(5)]
+        item = await ItemFactory().build_and_save()
+        product = await ProductFactory().build_and_save()
+
+        await assign_perm(perm="view", users=users[:3], obj=item)
+        await assign_group_perm(perm="view", users=users[2:4], obj=item, group="readers")
+        await remove_perm(perm="view", users=[users[3]], obj=item)
+        await assign_perm(perm="view", users=[users[4]], obj=product)
+
+        chunks = await collect(users_with_perm(item, "VIEW", chunk_size=3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+        assert sorted(sum(chunks, [])) == [user.id for user in users[:4]]
+
+        direct = await collect(users_with_perm(Item, "view", include_groups=False))
+        assert sorted(sum(direct, [])) == [user.id for user in users[:3]]
+        assert await collect(users_with_perm(item, "edit")) == []
+
+    async def test_intersects_with_the_given_ids(self, client):
+        users = [await UserFactory().build_and_save() for _ in range(6)]
+        item = await ItemFactory().build_and_save()
+
+        await assign_perm(perm="view", users=users[::2], obj=item)
+
+        subscribers = (user.id for user in users[1:])
+        chunks = await collect(users_with_perm(item, "view", user_ids=subscribers, chunk_size=2))
+
+        assert sorted(sum(chunks, [])) == [users[2].id, users[4].id]
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        assert await collect(users_with_perm(item, "view", user_ids=[])) == []